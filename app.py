@@ -31,6 +31,9 @@ from flask import Flask, render_template
 from flask_socketio import SocketIO
 from utils.db_handler import db, init_db
 from utils.socket_handlers import register_socket_events
+from utils.opening_book import load_books
+from utils.endgame_tablebase import load_tablebase
+from utils import move_cache
 from routes.auth_routes import auth_bp
 from routes.lobby_routes import lobby_bp
 from routes.game_routes import game_bp
@@ -67,6 +70,15 @@ def home():
 # register socket event handlers
 register_socket_events(socketio)
 
+# map opening books so the AI can answer book positions without searching
+load_books(app.config["OPENING_BOOK_DIR"])
+
+# map the endgame tablebase so the AI plays solved checkers endgames perfectly
+load_tablebase(app.config["ENDGAME_TABLEBASE_PATH"])
+
+# remember searched AI moves so positions seen before are answered right away
+move_cache.configure(app.config["AI_MOVE_CACHE_SIZE"], app.config["AI_MOVE_CACHE_PATH"] or None)
+
 
 with app.app_context():
     db.create_all()
@@ -12,4 +12,40 @@ class Config:
 
     # Use the correct, consistent path for SQLite
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(INSTANCE_DIR, 'app.db')}"
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Process pool size for the minimax AI's root search (1 = search inline)
+    AI_SEARCH_WORKERS = int(os.environ.get("AI_SEARCH_WORKERS", "1"))
+
+    # Process pool size for background AI move jobs (ai_async requests)
+    AI_JOB_WORKERS = int(os.environ.get("AI_JOB_WORKERS", "2"))
+
+    # Largest ai_time_ms and ai_max_nodes a request may ask for; bigger
+    # budgets are cut down to these
+    AI_MAX_TIME_MS = int(os.environ.get("AI_MAX_TIME_MS", "3000"))
+    AI_MAX_NODES = int(os.environ.get("AI_MAX_NODES", "200000"))
+
+    # Milliseconds the AI may keep searching the player's predicted reply
+    # after its move (0 = no pondering; ai_async moves never ponder)
+    AI_PONDER_MS = int(os.environ.get("AI_PONDER_MS", "0"))
+
+    # AI moves remembered per server process, least recently used dropped
+    # first (0 = no cache)
+    AI_MOVE_CACHE_SIZE = int(os.environ.get("AI_MOVE_CACHE_SIZE", "50000"))
+
+    # File the AI move cache is loaded from at startup and saved to at exit
+    # (empty = keep it in memory only)
+    AI_MOVE_CACHE_PATH = os.environ.get("AI_MOVE_CACHE_PATH", "")
+
+    # Process pool size for /game/analyze batches (0 = one per CPU)
+    AI_ANALYSIS_WORKERS = int(os.environ.get("AI_ANALYSIS_WORKERS", "0"))
+
+    # Most positions a single /game/analyze request may send
+    AI_ANALYSIS_MAX_POSITIONS = int(os.environ.get("AI_ANALYSIS_MAX_POSITIONS", "1000"))
+
+    # Opening books (<game_type>.bin) memory-mapped at startup
+    OPENING_BOOK_DIR = os.path.join(INSTANCE_DIR, "books")
+
+    # Checkers endgame tablebase memory-mapped at startup (built with
+    # python -m utils.endgame_tablebase build)
+    ENDGAME_TABLEBASE_PATH = os.path.join(INSTANCE_DIR, "tablebase", "checkers.bin")
@@ -5,10 +5,16 @@ Handles:
 - Board state retrieval
 - Player moves
 - Optional AI response moves
+- Batch position and whole-game analysis
 """
 
-from flask import Blueprint, jsonify, request, render_template, session
-from utils.game_logic import GameLogic
+import json
+import threading
+
+from flask import Blueprint, Response, current_app, jsonify, request, render_template, session
+from utils import ai_jobs, analysis, move_cache, search_stats
+from utils.game_logic import GameLogic, MAX_BUDGET_DEPTH
+from utils.socket_handlers import ai_game_room
 
 game_bp = Blueprint("game_bp", __name__)
 
@@ -18,6 +24,10 @@ games = {
     "chess": GameLogic("chess"),
 }
 
+# Held while a game type's game is changed or replaced, by request handlers
+# and by background AI jobs playing their move
+game_locks = {game_type: threading.RLock() for game_type in games}
+
 
 def _parse_int(raw_value, default=0):
     try:
@@ -25,6 +35,55 @@ def _parse_int(raw_value, default=0):
     except (TypeError, ValueError):
         return default
 
+def _parse_ai_options(data, game_type):
+    """
+        Read the AI settings shared by /move and /timeout-turn:
+        - ai_difficulty: "hard", "minimax", "greedy" or "random"
+        - ai_depth: search depth (the deepest iteration when a budget is set)
+        - ai_time_ms / ai_max_nodes: optional search budget for minimax,
+          capped at the AI_MAX_TIME_MS / AI_MAX_NODES settings
+        - ai_stats: include the search statistics in the ai_move payload
+    """
+    options = {"difficulty": str(data.get("ai_difficulty", "minimax")).lower()}
+    time_ms = _parse_int(data.get("ai_time_ms"), None)
+    max_nodes = _parse_int(data.get("ai_max_nodes"), None)
+    options["time_ms"] = min(time_ms, current_app.config["AI_MAX_TIME_MS"]) if time_ms and time_ms > 0 else None
+    options["max_nodes"] = (
+        min(max_nodes, current_app.config["AI_MAX_NODES"]) if max_nodes and max_nodes > 0 else None
+    )
+
+    if options["time_ms"] is None and options["max_nodes"] is None and options["difficulty"] != "hard":
+        default_depth = 2
+    else:
+        # with a budget (the hard AI always has one), keep deepening until it
+        # runs out unless capped
+        default_depth = MAX_BUDGET_DEPTH.get(game_type, 2)
+    options["depth"] = _parse_int(data.get("ai_depth", default_depth), default_depth)
+    options["stats"] = bool(data.get("ai_stats"))
+    # server-side settings, not something the client gets to pick
+    options["workers"] = current_app.config.get("AI_SEARCH_WORKERS", 1)
+    options["ponder_ms"] = current_app.config.get("AI_PONDER_MS") or None
+    return options
+
+def _queue_ai_move(game, game_type, ai_options):
+    """Start a background AI move and push the result to the game's room."""
+    socketio = current_app.extensions.get("socketio")
+
+    def notify(job):
+        if socketio is not None:
+            socketio.emit("ai_move", job, to=ai_game_room(game_type))
+
+    job_id = ai_jobs.submit_ai_job(
+        game,
+        game_type,
+        ai_options,
+        workers=current_app.config.get("AI_JOB_WORKERS", 2),
+        notify=notify,
+        is_current=lambda: games.get(game_type) is game,
+        lock=game_locks[game_type],
+    )
+    return {"job_id": job_id, "status": "pending"}
+
 # A function to format duration in seconds into a MM:SS string for display on the results page
 def _format_duration(seconds):
     """"
@@ -50,7 +109,9 @@ def ai_game():
     if game_type not in ["checkers", "chess"]:
         game_type = "checkers"
     # Start each AI page load with a fresh in-memory game state.
-    games[game_type] = GameLogic(game_type)
+    with game_locks[game_type]:
+        games[game_type].stop_pondering()
+        games[game_type] = GameLogic(game_type)
     return render_template("game_ai.html", username=username, game_type=game_type)
 
 
@@ -62,7 +123,9 @@ def pvp_game():
     if game_type not in ["checkers", "chess"]:
         game_type = "checkers"
     # Start each PvP page load with a fresh in-memory game state.
-    games[game_type] = GameLogic(game_type)
+    with game_locks[game_type]:
+        games[game_type].stop_pondering()
+        games[game_type] = GameLogic(game_type)
     return render_template("game_pvp.html", username=username, game_type=game_type)
 
 
@@ -142,13 +205,14 @@ def get_board():
     if game_type not in games:
         return jsonify({"error": "Invalid game type. Use 'chess' or 'checkers'."}), 400
 
-    game = games[game_type]
-    return jsonify({
-        "game_type": game_type,
-        "board": game.board,
-        "turn": game.turn,
-        "winner": game.winner
-    })
+    with game_locks[game_type]:
+        game = games[game_type]
+        return jsonify({
+            "game_type": game_type,
+            "board": game.board,
+            "turn": game.turn,
+            "winner": game.winner
+        })
 
 # Route to handle player moves in both AI and PVP modes.
 @game_bp.route("/move", methods=["POST"])
@@ -160,19 +224,23 @@ def move_piece():
         - start: [row, col]
         - end: [row, col]
         - ai (optional): true to enable AI response in PvE mode
-        - ai_difficulty (optional): "minimax" or "random" for AI move
+        - ai_difficulty (optional): "hard", "minimax" or "random" for AI move
         - ai_depth (optional): integer depth for minimax AI
+        - ai_time_ms / ai_max_nodes (optional): search budget for minimax AI;
+          the AI deepens iteratively and plays the last completed depth
+        - ai_async (optional): true to return right away with an ai_job id;
+          the AI move is then delivered by GET /ai-job/<job_id> and an
+          "ai_move" Socket.IO event in the game's room
+        - ai_stats (optional): true to add ai_move["search"] with the nodes,
+          depth reached, elapsed ms, cutoffs, cache hits and principal
+          variation of the AI search
+
 
     """
     data = request.get_json() or {}
     game_type = data.get("game_type", "checkers").lower()
     ai_enabled = bool(data.get("ai"))
-    ai_difficulty = str(data.get("ai_difficulty", "minimax")).lower()
-    ai_depth_raw = data.get("ai_depth", 2)
-    try:
-        ai_depth = int(ai_depth_raw)
-    except (TypeError, ValueError):
-        ai_depth = 2
+    ai_options = _parse_ai_options(data, game_type)
 
     if game_type not in games:
         return jsonify({"error": "Invalid game type."}), 400
@@ -183,27 +251,30 @@ def move_piece():
     start = tuple(data.get("start"))
     end = tuple(data.get("end"))
 
-    game = games[game_type]
-    result = game.move_piece(start, end)
-    if "error" in result:
-        return jsonify(result), 400
+    with game_locks[game_type]:
+        game = games[game_type]
+        result = game.move_piece(start, end)
+        if "error" in result:
+            return jsonify(result), 400
 
-    response = {
-        "player_move": result,
-        "board": game.board,
-        "turn": game.turn,
-        "winner": game.winner
-    }
+        response = {
+            "player_move": result,
+            "board": game.board,
+            "turn": game.turn,
+            "winner": game.winner
+        }
 
-    if ai_enabled and not game.winner:
-        ai_result = game.make_ai_move(difficulty=ai_difficulty, depth=ai_depth)
-        response["ai_move"] = ai_result
-        response["ai_difficulty"] = ai_result.get("ai_difficulty", ai_difficulty)
-        response["board"] = game.board
-        response["turn"] = game.turn
-        response["winner"] = game.winner
+        if ai_enabled and not game.winner and data.get("ai_async"):
+            response["ai_job"] = _queue_ai_move(game, game_type, ai_options)
+        elif ai_enabled and not game.winner:
+            ai_result = game.make_ai_move(**ai_options)
+            response["ai_move"] = ai_result
+            response["ai_difficulty"] = ai_result.get("ai_difficulty", ai_options["difficulty"])
+            response["board"] = game.board
+            response["turn"] = game.turn
+            response["winner"] = game.winner
 
-    return jsonify(response)
+        return jsonify(response)
 
 
 @game_bp.route("/timeout-turn", methods=["POST"])
@@ -212,35 +283,126 @@ def timeout_turn():
     data = request.get_json() or {}
     game_type = data.get("game_type", "checkers").lower()
     ai_enabled = bool(data.get("ai"))
-    ai_difficulty = str(data.get("ai_difficulty", "minimax")).lower()
-    ai_depth_raw = data.get("ai_depth", 2)
-    try:
-        ai_depth = int(ai_depth_raw)
-    except (TypeError, ValueError):
-        ai_depth = 2
+    ai_options = _parse_ai_options(data, game_type)
 
     if game_type not in games:
         return jsonify({"error": "Invalid game type."}), 400
 
-    game = games[game_type]
-    timeout_result = game.timeout_turn()
-    if "error" in timeout_result:
-        return jsonify(timeout_result), 400
-
-    response = {
-        "timeout_move": timeout_result,
-        "board": game.board,
-        "turn": game.turn,
-        "winner": game.winner
-    }
-
-    # In PvE mode, if timeout hands turn to black (AI), let AI respond immediately.
-    if ai_enabled and game.turn == "black" and not game.winner:
-        ai_result = game.make_ai_move(difficulty=ai_difficulty, depth=ai_depth)
-        response["ai_move"] = ai_result
-        response["ai_difficulty"] = ai_result.get("ai_difficulty", ai_difficulty)
-        response["board"] = game.board
-        response["turn"] = game.turn
-        response["winner"] = game.winner
-
-    return jsonify(response)
+    with game_locks[game_type]:
+        game = games[game_type]
+        timeout_result = game.timeout_turn()
+        if "error" in timeout_result:
+            return jsonify(timeout_result), 400
+
+        response = {
+            "timeout_move": timeout_result,
+            "board": game.board,
+            "turn": game.turn,
+            "winner": game.winner
+        }
+
+        # In PvE mode, if timeout hands turn to black (AI), let AI respond immediately.
+        if ai_enabled and game.turn == "black" and not game.winner and data.get("ai_async"):
+            response["ai_job"] = _queue_ai_move(game, game_type, ai_options)
+        elif ai_enabled and game.turn == "black" and not game.winner:
+            ai_result = game.make_ai_move(**ai_options)
+            response["ai_move"] = ai_result
+            response["ai_difficulty"] = ai_result.get("ai_difficulty", ai_options["difficulty"])
+            response["board"] = game.board
+            response["turn"] = game.turn
+            response["winner"] = game.winner
+
+        return jsonify(response)
+
+
+@game_bp.route("/ai-job/<job_id>", methods=["GET"])
+def ai_job_status(job_id):
+    """Poll a background AI move started with ai_async."""
+    job = ai_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown AI job."}), 404
+    return jsonify(job)
+
+
+@game_bp.route("/ai-stats", methods=["GET"])
+def ai_stats():
+    """
+        Aggregate AI search counters for this server process, with the AI
+        move cache's under "move_cache" (?reset=1 clears the counters).
+    """
+    totals = search_stats.snapshot()
+    totals["move_cache"] = move_cache.stats()
+    if request.args.get("reset") in ("1", "true"):
+        search_stats.reset()
+        move_cache.reset_stats()
+    return jsonify(totals)
+
+
+@game_bp.route("/analyze", methods=["POST"])
+def analyze():
+    """
+        Analyze a batch of positions in the analysis process pool and stream
+        the results back as NDJSON, one line per position as it finishes.
+        Expects JSON body with:
+        - positions: list of {"game_type", "board", "turn", "id" (optional)},
+          each optionally with its own difficulty, depth, time_ms or max_nodes
+        - difficulty, depth, time_ms, max_nodes (optional): defaults for
+          the batch ("minimax" to depth 4 otherwise)
+        Each line has the position's index and id with its best move, score
+        (for the side to move), depth, nodes and principal variation, or an
+        "error" for a position that could not be analyzed.
+    """
+    data = request.get_json(silent=True) or {}
+    positions = data.get("positions")
+    if not isinstance(positions, list) or not positions:
+        return jsonify({"error": "positions must be a non-empty list."}), 400
+    max_positions = current_app.config.get("AI_ANALYSIS_MAX_POSITIONS", 1000)
+    if len(positions) > max_positions:
+        return jsonify({"error": f"At most {max_positions} positions per request."}), 400
+
+    defaults = {name: data[name] for name in analysis.DEFAULT_OPTIONS if name in data}
+    results = analysis.analyze_positions(
+        positions, workers=current_app.config.get("AI_ANALYSIS_WORKERS") or None, defaults=defaults
+    )
+    return Response((json.dumps(result) + "\n" for result in results), mimetype="application/x-ndjson")
+
+
+@game_bp.route("/analyze-game", methods=["POST"])
+def analyze_game():
+    """
+        Replay a game and stream one NDJSON line per ply, in order, as the
+        positions around it are analyzed.
+        Expects JSON body with:
+        - game_type: "chess" or "checkers"
+        - moves: [[[r1, c1], [r2, c2]], ...] from the start position
+        - difficulty, depth, time_ms, max_nodes (optional): search settings
+          (a shallow per-game-type depth otherwise)
+        - blunder_threshold (optional): loss in piece points that marks a
+          blunder
+        Each line has the move, the best move, the mover's eval before and
+        after it, the loss and a blunder flag; an illegal move ends the
+        stream with an "error" line.
+    """
+    data = request.get_json(silent=True) or {}
+    game_type = str(data.get("game_type", "checkers")).lower()
+    moves = data.get("moves")
+    if game_type not in games:
+        return jsonify({"error": "Invalid game type."}), 400
+    if not isinstance(moves, list):
+        return jsonify({"error": "moves must be a list."}), 400
+    max_positions = current_app.config.get("AI_ANALYSIS_MAX_POSITIONS", 1000)
+    if len(moves) >= max_positions:
+        return jsonify({"error": f"At most {max_positions - 1} moves per request."}), 400
+    threshold = data.get("blunder_threshold")
+    if threshold is not None and (not isinstance(threshold, (int, float)) or isinstance(threshold, bool)):
+        return jsonify({"error": "blunder_threshold must be a number."}), 400
+
+    defaults = {name: data[name] for name in analysis.DEFAULT_OPTIONS if name in data}
+    try:
+        plies = analysis.analyze_game(
+            game_type, moves, workers=current_app.config.get("AI_ANALYSIS_WORKERS") or None,
+            defaults=defaults, blunder_threshold=threshold
+        )
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return Response((json.dumps(ply) + "\n" for ply in plies), mimetype="application/x-ndjson")
@@ -183,6 +183,11 @@
         clearSelection();
         resetTimer();
 
+        if (state.winner === "draw") {
+            // stalemate: the game is over, but the win page has no draws
+            setStatus("Draw by stalemate.");
+            return;
+        }
         if (state.winner) {
             setStatus(`${state.winner[0].toUpperCase()}${state.winner.slice(1)} wins.`);
             window.setTimeout(() => {
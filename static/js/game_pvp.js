@@ -182,6 +182,11 @@
         clearSelection();
         resetTimer();
 
+        if (state.winner === "draw") {
+            // stalemate: the game is over, but the win page has no draws
+            setStatus("Draw by stalemate.");
+            return;
+        }
         if (state.winner) {
             setStatus(`${colorLabel(state.winner)} wins.`);
             window.setTimeout(() => {
@@ -0,0 +1,54 @@
+"""
+    Unit tests for the AI search benchmark.
+    tests include:
+        - the seeded corpus and report being reproducible
+        - comparing reports for node, move and time changes
+"""
+import copy
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import ai_benchmark
+
+
+def _small_report():
+    return ai_benchmark.run_benchmark(
+        game_types=("checkers", "chess"), positions=2, depths={"checkers": (1, 2), "chess": (1,)}
+    )
+
+
+def test_corpus_is_seeded():
+    assert ai_benchmark.build_corpus("chess", 3) == ai_benchmark.build_corpus("chess", 3)
+    assert ai_benchmark.build_corpus("checkers", 3, seed=1) != ai_benchmark.build_corpus("checkers", 3, seed=2)
+
+def test_report_is_reproducible():
+    first = _small_report()
+    second = _small_report()
+    assert set(first["totals"]) == {
+        "checkers/random/-", "checkers/greedy/-", "checkers/minimax/1", "checkers/minimax/2",
+        "checkers/hard/1", "checkers/hard/2",
+        "chess/random/-", "chess/greedy/-", "chess/minimax/1", "chess/hard/1",
+    }
+    assert first["totals"]["checkers/minimax/2"]["nodes"] > 0
+    assert first["totals"]["checkers/hard/2"]["nodes"] > 0
+    strip = lambda report: [(row["move"], row["nodes"]) for row in report["results"]]
+    assert strip(first) == strip(second)
+    assert ai_benchmark.compare_reports(first, second, threshold=float("inf")) == []
+
+def test_compare_flags_regressions():
+    old = _small_report()
+    new = copy.deepcopy(old)
+    new["totals"]["checkers/minimax/2"]["nodes"] += 10
+    new["totals"]["chess/minimax/1"]["elapsed_ms"] = old["totals"]["chess/minimax/1"]["elapsed_ms"] * 3 + 10
+    new["results"][-1]["move"] = None
+    findings = {key: regression for key, _, regression in ai_benchmark.compare_reports(old, new)}
+    assert findings["checkers/minimax/2"] is True
+    assert findings["chess/minimax/1"] is True
+    assert findings["moves"] is False
+
+
+if __name__ == '__main__':
+    test_corpus_is_seeded()
+    test_report_is_reproducible()
+    test_compare_flags_regressions()
+    print("all tests passed!")
@@ -0,0 +1,184 @@
+"""
+    Unit tests for batch position analysis.
+    tests include:
+        - results matching a direct search, inline and in the process pool
+        - positions with no moves (checkmate, stalemate, checkers loss)
+        - invalid positions reported without stopping the batch
+        - replaying a game: blunders, checkmate, the last piece taken and
+          illegal moves, the same inline and in the process pool; a slower
+          win is not a blunder
+"""
+import os
+import random
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import analysis
+from utils.game_logic import INF, GameLogic
+
+# 1.e4 d5 2.Qg4?? Bxg4
+QUEEN_BLUNDER = [[[6, 4], [4, 4]], [[1, 3], [3, 3]], [[7, 3], [4, 6]], [[0, 2], [4, 6]]]
+# 1.f3 e5 2.g4 Qh4#
+FOOLS_MATE = [[[6, 5], [5, 5]], [[1, 4], [3, 4]], [[6, 6], [4, 6]], [[0, 3], [4, 7]]]
+
+
+def _board(pieces):
+    board = [["" for _ in range(8)] for _ in range(8)]
+    for (row, col), piece in pieces.items():
+        board[row][col] = piece
+    return board
+
+
+def _positions():
+    checkers = GameLogic("checkers")
+    chess = GameLogic("chess")
+    chess.move_piece((6, 4), (4, 4))
+    return [
+        {"id": "checkers-start", "game_type": "checkers", "board": checkers.board, "turn": "white"},
+        {"id": "chess-e4", "game_type": "chess", "board": chess.board, "turn": "black", "depth": 2},
+    ]
+
+
+def test_analysis_matches_direct_search():
+    positions = _positions()
+    inline = list(analysis.analyze_positions(positions, workers=1, defaults={"depth": 3}))
+    try:
+        pooled = list(analysis.analyze_positions(positions, workers=2, defaults={"depth": 3}))
+    finally:
+        analysis.shutdown()
+
+    assert [result["index"] for result in inline] == [0, 1]
+    pooled.sort(key=lambda result: result["index"])
+    # ties between best moves are broken at random, so compare the rest
+    skipped = ("elapsed_ms", "best_move", "pv")
+    strip = lambda result: {key: value for key, value in result.items() if key not in skipped}
+    assert [strip(result) for result in pooled] == [strip(result) for result in inline]
+
+    for position, result in zip(positions, inline):
+        game = GameLogic.from_state(position)
+        depth = position.get("depth", 3)
+        game._select_ai_move(difficulty="minimax", depth=depth, use_book=False)
+        assert result["id"] == position["id"]
+        assert result["depth"] == depth
+        assert result["score"] == game.last_search["score"]
+        assert result["nodes"] == game.last_search["nodes"]
+        assert result["best_move"] == result["pv"][0]
+        assert result["legal_moves"] == len(game.get_legal_moves())
+        assert result["winner"] is None
+
+def test_positions_without_moves():
+    mate = _board({(0, 0): "BK", (1, 1): "WQ", (2, 2): "WK"})
+    stalemate = _board({(0, 0): "BK", (2, 1): "WQ", (7, 7): "WK"})
+    no_pieces = _board({(4, 3): "B"})
+    results = list(analysis.analyze_positions([
+        {"game_type": "chess", "board": mate, "turn": "black"},
+        {"game_type": "chess", "board": stalemate, "turn": "black"},
+        {"game_type": "checkers", "board": no_pieces, "turn": "white"},
+    ], workers=1))
+    assert [result["winner"] for result in results] == ["white", "draw", "black"]
+    assert all(result["best_move"] is None and result["legal_moves"] == 0 for result in results)
+
+def test_invalid_positions_are_reported():
+    start = GameLogic("checkers").board
+    results = list(analysis.analyze_positions([
+        {"id": 1, "game_type": "go", "board": start},
+        {"id": 2, "game_type": "checkers", "board": start[:7]},
+        {"id": 3, "game_type": "chess", "board": start},
+        {"id": 4, "game_type": "chess", "board": _board({(0, 0): "BK"})},
+        {"id": 5, "game_type": "checkers", "board": start, "difficulty": "random"},
+        {"id": 6, "game_type": "checkers", "board": start, "depth": 1},
+    ], workers=1))
+    errors = {result["id"]: result.get("error") for result in results}
+    assert all(errors[position_id] for position_id in (1, 2, 3, 4, 5))
+    assert errors[6] is None
+    assert [result["id"] for result in results] == [1, 2, 3, 4, 5, 6]
+
+def test_game_replay_flags_blunders():
+    plies = list(analysis.analyze_game("chess", QUEEN_BLUNDER, workers=1))
+    assert [ply["ply"] for ply in plies] == [1, 2, 3, 4]
+    assert [ply["color"] for ply in plies] == ["white", "black", "white", "black"]
+    assert [ply["blunder"] for ply in plies] == [False, False, True, False]
+    assert plies[2]["loss"] >= 9 and plies[3]["loss"] == 0
+    assert plies[3]["eval_white"] <= -9
+    assert all(ply["depth"] == analysis.REPLAY_DEPTH["chess"] for ply in plies)
+
+    # every position is searched once: one ply's "after" is the next one's "before"
+    for ply, following in zip(plies, plies[1:]):
+        assert ply["score_after"] == -following["eval"]
+
+    try:
+        pooled = list(analysis.analyze_game("chess", QUEEN_BLUNDER, workers=2))
+    finally:
+        analysis.shutdown()
+    judge = lambda ply: {key: ply[key] for key in ("ply", "move", "eval", "score_after", "loss", "blunder")}
+    assert [judge(ply) for ply in pooled] == [judge(ply) for ply in plies]
+
+def test_slower_win_is_not_a_blunder():
+    searched = {"winner": None, "best_move": [[0, 0], [0, 1]], "depth": 4, "nodes": 1}
+    before = dict(searched, turn="white", score=INF - 1)
+    # the move played mates two plies later than the best one
+    after = dict(searched, turn="black", score=-(INF - 2))
+    record = analysis._ply_record(1, [[0, 0], [1, 1]], before, after, 1)
+    assert record["eval"] == INF - 1 and record["score_after"] == INF - 2
+    assert record["loss"] == 0 and not record["blunder"]
+
+def test_game_replay_ends_in_mate_or_at_an_illegal_move():
+    plies = list(analysis.analyze_game("chess", FOOLS_MATE, workers=1))
+    assert plies[-1]["winner"] == "black" and plies[-1]["score_after"] == INF
+    assert not plies[-1]["blunder"]
+
+    plies = list(analysis.analyze_game("checkers", [[[5, 0], [4, 1]], [[5, 2], [4, 3]]], workers=1))
+    assert plies[0]["ply"] == 1 and "error" not in plies[0]
+    assert plies[1] == {"ply": 2, "move": [[5, 2], [4, 3]], "error": "Illegal move."}
+
+def test_game_replay_serial_and_pooled_agree():
+    checkers = GameLogic("checkers")
+    checkers_moves = []
+    random.seed(1)
+    while not checkers.winner:
+        result = checkers.make_ai_move(difficulty="greedy")
+        checkers_moves.append([result["start"], result["end"]])
+    # one move too many after each game has ended
+    games = (
+        ("chess", FOOLS_MATE + [[[6, 4], [5, 4]]]),
+        ("checkers", checkers_moves + [checkers_moves[-2]]),
+    )
+    judge = lambda ply: {key: ply.get(key) for key in ("ply", "move", "eval", "score_after", "loss", "winner", "error")}
+    for game_type, moves in games:
+        serial = list(analysis.analyze_game(game_type, moves, workers=1, defaults={"depth": 1}))
+        try:
+            pooled = list(analysis.analyze_game(game_type, moves, workers=2, defaults={"depth": 1}))
+        finally:
+            analysis.shutdown()
+        assert [judge(ply) for ply in pooled] == [judge(ply) for ply in serial]
+        assert serial[-1] == {"ply": len(moves), "move": moves[-1], "error": "Move after the game ended."}
+
+def test_game_replay_ends_by_capturing_the_last_piece():
+    random.seed(0)
+    game = GameLogic("checkers")
+    moves = []
+    while not game.winner:
+        result = game.make_ai_move(difficulty="greedy")
+        moves.append([result["start"], result["end"]])
+    loser = "black" if game.winner == "white" else "white"
+    assert game.piece_counts[loser] == 0
+
+    for workers in (1, 2):
+        try:
+            last = list(analysis.analyze_game("checkers", moves, workers=workers))[-1]
+        finally:
+            analysis.shutdown()
+        assert last["color"] == game.winner and last["winner"] == game.winner
+        assert last["score_after"] == INF and last["loss"] == 0 and not last["blunder"]
+        assert last["eval_white"] == (INF if game.winner == "white" else -INF)
+
+
+if __name__ == '__main__':
+    test_analysis_matches_direct_search()
+    test_positions_without_moves()
+    test_invalid_positions_are_reported()
+    test_game_replay_flags_blunders()
+    test_slower_win_is_not_a_blunder()
+    test_game_replay_ends_in_mate_or_at_an_illegal_move()
+    test_game_replay_serial_and_pooled_agree()
+    test_game_replay_ends_by_capturing_the_last_piece()
+    print("all tests passed!")
@@ -0,0 +1,77 @@
+"""
+    Unit tests for the batch evaluator.
+    tests include:
+        - material scores matching GameLogic._evaluate_board
+        - the pure Python fallback matching the NumPy path
+        - piece-square tables mirroring between colors
+        - root move ordering keeping the transposition table move first
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import batch_eval
+from utils.ai_benchmark import build_corpus
+from utils.game_logic import GameLogic
+from utils.moves import decode_move
+
+
+def _corpus_boards(game_type, count=12):
+    return [state["board"] for state in build_corpus(game_type, count, seed=5)]
+
+
+def _swap_colors(board):
+    swap = {"W": "B", "B": "W"}
+    return [[swap[piece[0]] + piece[1:] if piece else "" for piece in row] for row in reversed(board)]
+
+
+def test_material_matches_evaluate_board():
+    for game_type in ("checkers", "chess"):
+        game = GameLogic(game_type)
+        boards = _corpus_boards(game_type)
+        for perspective in ("white", "black"):
+            expected = [game._evaluate_board(board, perspective) * batch_eval.MATERIAL_SCALE for board in boards]
+            assert batch_eval.evaluate_boards(boards, game_type, perspective, pst=False) == expected
+
+def test_python_fallback_matches_numpy(monkeypatch):
+    for game_type in ("checkers", "chess"):
+        boards = _corpus_boards(game_type)
+        fast = batch_eval.evaluate_boards(boards, game_type, "black")
+        monkeypatch.setattr(batch_eval, "HAS_NUMPY", False)
+        monkeypatch.setattr(batch_eval, "_tables", {})
+        assert batch_eval.evaluate_boards(boards, game_type, "black") == fast
+        monkeypatch.undo()
+
+def test_piece_square_tables_mirror_colors():
+    for game_type in ("checkers", "chess"):
+        boards = _corpus_boards(game_type)
+        swapped = [_swap_colors(board) for board in boards]
+        assert batch_eval.evaluate_boards(boards, game_type, "white") == \
+            batch_eval.evaluate_boards(swapped, game_type, "black")
+    # an advanced checkers man is worth more than one on its home row
+    board = [["" for _ in range(8)] for _ in range(8)]
+    board[2][1] = "W"
+    advanced = batch_eval.evaluate_boards([board], "checkers")[0]
+    board[2][1], board[7][0] = "", "W"
+    assert advanced > batch_eval.evaluate_boards([board], "checkers")[0]
+    assert batch_eval.evaluate_batch([], "chess") == []
+
+def test_root_ordering_keeps_tt_move_first():
+    game = GameLogic("chess")
+    moves = game._generate_moves(game.turn)
+    ordered = game._order_root_moves(moves, moves[-1])
+    assert ordered[0] == moves[-1]
+    assert sorted(ordered) == sorted(moves)
+    # the rest come best one-ply score first
+    scores = []
+    for move in ordered[1:]:
+        child = GameLogic("chess")
+        child.move_piece(*decode_move(move))
+        scores.append(batch_eval.evaluate_boards([child.board], "chess", "white")[0])
+    assert scores == sorted(scores, reverse=True)
+
+
+if __name__ == '__main__':
+    test_material_matches_evaluate_board()
+    test_piece_square_tables_mirror_colors()
+    test_root_ordering_keeps_tt_move_first()
+    print("all tests passed!")
@@ -0,0 +1,79 @@
+"""
+    Unit tests for the checkers endgame tablebase.
+    tests include:
+        - hashing bitboard positions like GameLogic does
+        - building a table file and probing known results
+        - the minimax AI playing solved endgames perfectly
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import endgame_tablebase
+from utils.checkers_bitboard import from_board
+from utils.game_logic import TB_WIN, GameLogic
+
+
+def _endgame(pieces, turn="white"):
+    game = GameLogic("checkers")
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    for (r, c), piece in pieces.items():
+        game.board[r][c] = piece
+    game.turn = turn
+    game.check_winner()
+    return game
+
+
+def test_hash_position_matches_game_hash():
+    game = _endgame({(5, 0): "W", (2, 3): "BK", (4, 5): "WK"}, turn="black")
+    white, black, kings = from_board(game.board)
+    assert endgame_tablebase.hash_position(white, black, kings, "black") == game.hash_key
+
+
+def test_build_and_probe_tablebase(tmp_path):
+    path = str(tmp_path / "checkers.bin")
+    written = endgame_tablebase.write_tablebase(path, max_pieces=2)
+    table = endgame_tablebase.EndgameTablebase(path)
+    try:
+        assert len(table) == written
+        assert table.max_pieces == 2
+        # white man can jump the last black man
+        result = table.probe(_endgame({(5, 2): "W", (4, 3): "B"}).hash_key)
+        assert endgame_tablebase.distance(result) == 1 and result > 0
+        # positions with one color missing are already decided, not in the table
+        assert table.probe(_endgame({(7, 0): "W", (6, 1): "W"}, turn="black").hash_key) is None
+        result = table.probe(_endgame({(5, 0): "W", (0, 1): "B"}).hash_key)
+        assert endgame_tablebase.distance(result) == 5 and result > 0
+        # two kings that can shuffle forever
+        assert table.probe(_endgame({(0, 1): "WK", (0, 5): "BK"}).hash_key) == 0
+    finally:
+        table.close()
+
+
+def test_ai_plays_tablebase_endgame(tmp_path):
+    path = str(tmp_path / "checkers.bin")
+    endgame_tablebase.write_tablebase(path, max_pieces=2)
+    try:
+        assert endgame_tablebase.load_tablebase(path) is not None
+        game = _endgame({(5, 0): "W", (0, 1): "B"})
+        first = None
+        # both sides play from the table: the win takes exactly 5 plies
+        for _ in range(5):
+            assert game.winner is None
+            mover = game.turn
+            result = game.make_ai_move(difficulty="minimax", depth=1, stats=True)
+            first = first or result
+            assert "error" not in result
+            # the move is scored from the table, white winning and black losing
+            search = result["search"]
+            assert search["source"] == "tablebase" and search["depth"] == 1
+            assert (search["score"] > 0) == (mover == "white")
+        # the first move was scored a win five plies away
+        assert first["search"]["score"] == TB_WIN - 5
+        assert game.winner == "white"
+    finally:
+        endgame_tablebase.close_tablebase()
+
+
+def test_missing_tablebase_is_skipped(tmp_path):
+    assert endgame_tablebase.load_tablebase(str(tmp_path / "missing.bin")) is None
+    assert endgame_tablebase.get_tablebase() is None
@@ -5,8 +5,12 @@
 """
 import os
 import sys
+import random
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.game_logic import GameLogic
+from utils.game_logic import GameLogic, INF, KNIGHT_TARGETS, PAWN_PUSHES, SLIDER_RAYS
+from utils import game_logic, search_stats
+from utils.moves import CAPTURE, PROMOTION, decode_move, encode_move
+from utils.transposition import EXACT, LOWER, TranspositionTable, hash_board
 
 
 def test_checkers_initialization():
@@ -68,6 +72,20 @@ def test_timeout_turn_switches_turn():
     assert result["skipped_color"] == "white"
     assert game.turn == "black"
 
+def test_chess_timeout_in_check_loses():
+    # 1.e4 f6 2.Qh5+: black's time runs out in check, so Qxe8 never happens
+    game = GameLogic("chess")
+    for start, end in (((6, 4), (4, 4)), ((1, 5), (2, 5)), ((7, 3), (3, 7))):
+        assert game.move_piece(start, end)["message"] == "Move successful"
+    result = game.timeout_turn()
+    assert result["skipped_color"] == "black" and result["winner"] == "white"
+    assert game.winner == "white" and game.turn == "black"
+    assert game.move_piece((3, 7), (0, 4)) == {"error": "Game already over"}
+
+    # a skip that leaves the other side without a legal move ends the game
+    game = _position({(0, 0): "BK", (2, 1): "WQ", (7, 7): "WK"})
+    assert game.timeout_turn()["winner"] == "draw"
+
 def test_check_winner():
     game = GameLogic("checkers")
     # Simulate all white pieces gone
@@ -75,8 +93,433 @@ def test_check_winner():
         for c in range(8):
             if "W" in game.board[r][c]:
                 game.board[r][c] = ""
+    # the board was edited in place rather than replaced
+    game._sync_state()
     assert game.check_winner() == "black"
 
+def test_board_resynced_only_when_replaced(monkeypatch):
+    game = GameLogic("checkers")
+    sync_state = game._sync_state
+    calls = []
+    monkeypatch.setattr(game, "_sync_state", lambda: calls.append(1) or sync_state())
+    game.move_piece((5, 0), (4, 1))
+    game.get_legal_moves()
+    game.check_winner()
+    assert calls == []
+
+    game.board = [row[:] for row in game.board]
+    game.get_legal_moves()
+    game.get_legal_moves()
+    assert calls == [1]
+
+def test_checkers_defaults_to_bitboard_backend():
+    assert GameLogic("checkers").backend == "bitboard"
+    assert GameLogic("chess").backend == "list"
+    try:
+        GameLogic("chess", backend="bitboard")
+    except ValueError:
+        pass
+    else:
+        assert False, "chess should reject the bitboard backend"
+
+def test_bitboard_backend_matches_list_backend():
+    rng = random.Random(7)
+    for _ in range(20):
+        reference = GameLogic("checkers", backend="list")
+        game = GameLogic("checkers", backend="bitboard")
+        for _ in range(80):
+            for color in ("white", "black"):
+                assert sorted(game.get_legal_moves(color)) == sorted(reference.get_legal_moves(color))
+            moves = reference.get_legal_moves()
+            if reference.winner or not moves:
+                break
+            start, end = rng.choice(moves)
+            assert game.move_piece(start, end) == reference.move_piece(start, end)
+            assert game.board == reference.board
+
+def test_make_unmake_restores_position():
+    rng = random.Random(3)
+    for game_type in ("checkers", "chess"):
+        game = GameLogic(game_type)
+        history = []
+        for _ in range(60):
+            moves = game.get_legal_moves()
+            if game.winner or not moves:
+                break
+            snapshot = ([row[:] for row in game.board], game.turn, game.winner)
+            history.append((snapshot, game.make_move(*rng.choice(moves))))
+        while history:
+            snapshot, undo = history.pop()
+            game.unmake_move(undo)
+            assert ([row[:] for row in game.board], game.turn, game.winner) == snapshot
+        assert game.board == GameLogic(game_type).board
+
+def test_make_move_records_capture_and_promotion():
+    game = GameLogic("checkers")
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    game.board[2][3] = "W"
+    game.board[1][4] = "B"
+    game.board[6][1] = "B"
+    game.turn = "white"
+    game._sync_state()
+
+    undo = game.make_move((2, 3), (0, 5))
+    assert undo.captured_piece == "B"
+    assert undo.captured_at == (1, 4)
+    assert undo.promoted is True
+    assert game.board[0][5] == "WK"
+    assert game.turn == "black"
+
+    game.unmake_move(undo)
+    assert game.board[2][3] == "W"
+    assert game.board[1][4] == "B"
+    assert game.turn == "white"
+    bitboards = (game._white, game._black, game._kings)
+    game._sync_state()
+    assert bitboards == (game._white, game._black, game._kings)
+
+def test_zobrist_hash_tracks_moves():
+    rng = random.Random(5)
+    for game_type in ("checkers", "chess"):
+        game = GameLogic(game_type)
+        assert game.hash_key == hash_board(game.board, game.turn)
+        for _ in range(40):
+            moves = game.get_legal_moves()
+            if game.winner or not moves:
+                break
+            game.make_move(*rng.choice(moves))
+            assert game.hash_key == hash_board(game.board, game.turn)
+        game.timeout_turn()
+        assert game.hash_key == hash_board(game.board, game.turn)
+
+def test_transposition_table_replacement():
+    table = TranspositionTable(size=4)
+    table.store(1, 3, EXACT, 10, None)
+    # a shallower result for a different position does not evict a deeper one
+    table.store(5, 1, LOWER, 2, None)
+    assert table.probe(1)[1] == 3
+    assert table.probe(5) is None
+    # once the entry is from an older search it can be replaced
+    table.new_search()
+    table.store(5, 1, LOWER, 2, None)
+    assert table.probe(5)[3] == 2
+    assert table.probe(1) is None
+
+def test_ai_move_respects_node_budget():
+    game = GameLogic("checkers")
+    result = game.make_ai_move(difficulty="minimax", depth=12, max_nodes=500)
+    assert result["message"] == "Move successful"
+    # the search stops on the first node past the budget
+    assert game._nodes <= 501
+
+def test_ai_move_with_time_budget():
+    game = GameLogic("chess")
+    result = game.make_ai_move(difficulty="minimax", depth=6, time_ms=50)
+    assert result["message"] == "Move successful"
+    assert game.turn == "black"
+
+def test_move_ordering_puts_best_captures_first():
+    game = GameLogic("chess")
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    # king off the e-file so the rook is not pinned by the queen
+    game.board[7][7] = "WK"
+    game.board[0][4] = "BK"
+    game.board[4][4] = "WR"
+    game.board[4][0] = "BP"
+    game.board[2][4] = "BQ"
+    game.board[6][3] = "WP"
+    game._sync_state()
+
+    moves = game._order_moves(game._generate_moves("white"), None, 1)
+    # rook takes queen before rook takes pawn, quiet moves after both
+    assert decode_move(moves[0]) == ((4, 4), (2, 4))
+    assert decode_move(moves[1]) == ((4, 4), (4, 0))
+
+    killer = encode_move((6, 3), (5, 3))
+    game._record_cutoff(killer, 2, 1)
+    moves = game._order_moves(moves, None, 1)
+    assert moves[2] == killer
+
+def test_staged_moves_match_ordered_moves():
+    rng = random.Random(13)
+    for game_type in ("checkers", "chess"):
+        game = GameLogic(game_type)
+        for _ in range(40):
+            moves = game._generate_moves(game.turn)
+            if game.winner or not moves:
+                break
+            # give the killer and history tables something to order by
+            game._record_cutoff(rng.choice(moves), 3, 1)
+            tt_move = rng.choice(moves)
+            assert list(game._staged_moves(tt_move, 1)) == game._order_moves(moves, tt_move, 1)
+            game.make_move(*decode_move(rng.choice(moves)))
+        # a move from another position is not tried
+        assert game._legal_move(encode_move((3, 3), (0, 0)), game.turn) is None
+
+def test_quiescence_sees_recapture():
+    game = GameLogic("chess")
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    game.board[7][4] = "WK"
+    game.board[0][4] = "BK"
+    game.board[4][3] = "WQ"
+    game.board[2][3] = "BP"
+    game.board[1][2] = "BP"
+    game._sync_state()
+
+    # at depth 1 the pawn grab looks free, but the capture search sees bxc6
+    for _ in range(5):
+        move = game._select_ai_move(difficulty="minimax", depth=1)
+        assert move != ((4, 3), (2, 3))
+
+def test_incremental_material_and_piece_lists():
+    rng = random.Random(9)
+    for game_type in ("checkers", "chess"):
+        game = GameLogic(game_type)
+        undos = []
+        for _ in range(80):
+            moves = game.get_legal_moves()
+            if game.winner or not moves:
+                break
+            undos.append(game.make_move(*rng.choice(moves)))
+            tracked = (dict(game.piece_counts), dict(game.material), {k: set(v) for k, v in game.piece_squares.items()})
+            game._sync_state()
+            assert tracked == (game.piece_counts, game.material, game.piece_squares)
+            assert game._evaluate("white") == game._evaluate_board(game.board, "white")
+        for undo in reversed(undos):
+            game.unmake_move(undo)
+        assert game.piece_counts == GameLogic(game_type).piece_counts
+        assert game.material == GameLogic(game_type).material
+
+def test_chess_move_tables():
+    assert KNIGHT_TARGETS[0] == ((1, 2), (2, 1))
+    assert PAWN_PUSHES["W"][6 * 8 + 4] == ((5, 4), (4, 4))
+    assert PAWN_PUSHES["B"][2 * 8 + 4] == ((3, 4),)
+    # a rook in the corner has two rays of seven squares each
+    assert [len(ray) for ray in SLIDER_RAYS["R"][0]] == [7, 7]
+
+def test_chess_rook_stops_at_blockers():
+    game = GameLogic("chess")
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    game.board[4][4] = "WR"
+    game.board[4][6] = "BP"
+    game.board[2][4] = "WP"
+    game._sync_state()
+    targets = {end for _, end in game._chess_moves_for_piece((4, 4), "WR")}
+    assert (4, 6) in targets and (4, 7) not in targets
+    assert (3, 4) in targets and (2, 4) not in targets
+    assert len(targets) == 1 + 3 + 4 + 2
+
+def test_parallel_root_search_matches_serial():
+    from utils import parallel_search
+    rng = random.Random(4)
+    try:
+        for game_type, depth in (("checkers", 4), ("chess", 2)):
+            game = GameLogic(game_type)
+            for _ in range(6):
+                game.make_move(*rng.choice(game.get_legal_moves()))
+            state = game.to_state()
+
+            random.seed(1)
+            serial = GameLogic.from_state(state)._select_ai_move("minimax", depth)
+            random.seed(1)
+            parallel = GameLogic.from_state(state)._select_ai_move("minimax", depth, workers=2)
+            assert serial == parallel
+    finally:
+        parallel_search.shutdown_pools()
+
+def test_ai_move_reports_search_stats():
+    search_stats.reset()
+    game = GameLogic("chess")
+    result = game.make_ai_move(difficulty="minimax", depth=3, stats=True)
+    search = result["search"]
+    assert search["source"] == "search"
+    assert search["depth"] == 3
+    assert search["nodes"] == game._nodes > 0
+    assert search["cutoffs"] > 0 and search["tt_hits"] >= 0
+    assert search["pv"][0] == [list(result["start"]), list(result["end"])]
+    assert 1 <= len(search["pv"]) <= 3
+
+    # the principal variation is a playable line from the old position
+    replay = GameLogic("chess")
+    for start, end in search["pv"]:
+        assert "error" not in replay.move_piece(tuple(start), tuple(end))
+
+    assert "search" not in game.make_ai_move(difficulty="greedy")
+    totals = search_stats.snapshot()
+    assert totals["chess"]["moves"] == 2
+    assert totals["chess"]["sources"] == {"search": 1, "greedy": 1}
+    assert totals["all"]["nodes"] == search["nodes"]
+
+def test_pondering_on_predicted_reply():
+    game = GameLogic("chess")
+    result = game.make_ai_move(difficulty="minimax", depth=3, use_book=False, stats=True, ponder_ms=5000)
+    game._ponder._thread.join()
+    predicted = [tuple(square) for square in result["search"]["pv"][1]]
+    game.move_piece(*predicted)
+    fresh = GameLogic.from_state(game.to_state())
+    fresh._prepare_search()
+    best_moves = fresh._search_root(fresh._generate_moves(fresh.turn), 3)[1]
+
+    # the predicted reply was played: answer with the pondered move
+    reply = game.make_ai_move(difficulty="minimax", depth=3, use_book=False, stats=True)
+    assert reply["search"]["source"] == "ponder"
+    assert encode_move(reply["start"], reply["end"]) in best_moves
+    assert game._ponder is None
+
+    # any other reply is a miss: the task is stopped and the AI searches
+    game = GameLogic("checkers")
+    result = game.make_ai_move(difficulty="minimax", depth=4, use_book=False, stats=True, ponder_ms=5000)
+    task = game._ponder
+    predicted = tuple(tuple(square) for square in result["search"]["pv"][1])
+    game.move_piece(*next(move for move in game.get_legal_moves() if move != predicted))
+    reply = game.make_ai_move(difficulty="minimax", depth=4, use_book=False, stats=True)
+    assert reply["search"]["source"] == "search"
+    assert not task._thread.is_alive()
+
+def test_encoded_moves():
+    move = encode_move((2, 1), (0, 3), CAPTURE | PROMOTION)
+    assert decode_move(move) == ((2, 1), (0, 3))
+    assert move & CAPTURE and move & PROMOTION
+
+    # both checkers backends encode the same moves with the same flags
+    game = GameLogic("checkers")
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    game.board[2][1] = "W"
+    game.board[1][2] = "B"
+    game.board[1][0] = "B"
+    game.board[5][4] = "WK"
+    game._sync_state()
+    moves = game._generate_moves("white")
+    lists = GameLogic("checkers", backend="list")
+    lists.board = [row[:] for row in game.board]
+    lists._sync_state()
+    assert sorted(moves) == sorted(lists._generate_moves("white"))
+    assert encode_move((2, 1), (0, 3), CAPTURE | PROMOTION) in moves
+    assert encode_move((5, 4), (6, 5)) in moves
+    assert game.get_legal_moves() == [decode_move(move) for move in moves]
+
+    # move_piece checks legality against the cached set of move keys
+    assert game.move_piece((2, 1), (0, 1)) == {"error": "Illegal move"}
+    assert game.move_piece((2, 1), (0, 3))["promoted"]
+
+def _position(pieces, turn="white", game_type="chess"):
+    game = GameLogic(game_type)
+    game.board = [["" for _ in range(8)] for _ in range(8)]
+    for (r, c), piece in pieces.items():
+        game.board[r][c] = piece
+    game.turn = turn
+    game._sync_state()
+    return game
+
+def test_chess_legal_moves_respect_pins_and_checks():
+    # the rook is pinned to its king and may only slide along the file
+    game = _position({(7, 4): "WK", (5, 4): "WR", (1, 4): "BR", (0, 0): "BK"})
+    rook_targets = {end for start, end in game.get_legal_moves() if start == (5, 4)}
+    assert rook_targets == {(6, 4), (4, 4), (3, 4), (2, 4), (1, 4)}
+    assert game.move_piece((5, 4), (5, 0)) == {"error": "Illegal move"}
+
+    # in check: take the checker, block it, or step off its line
+    game = _position({(7, 4): "WK", (6, 3): "WB", (5, 5): "WN", (3, 4): "BR", (0, 0): "BK"})
+    moves = set(game.get_legal_moves())
+    assert ((5, 5), (3, 4)) in moves and ((6, 3), (5, 4)) in moves
+    assert ((7, 4), (6, 4)) not in moves and ((7, 4), (7, 3)) in moves
+    assert all(end in ((3, 4), (5, 4)) for start, end in moves if start != (7, 4))
+
+    # legal moves are the pseudo-legal ones that do not leave the king attacked
+    rng = random.Random(11)
+    game = GameLogic("chess")
+    for _ in range(80):
+        if game.winner:
+            break
+        expected = set()
+        for square in list(game.piece_squares[game.turn]):
+            for move in game._chess_moves_for_piece(square, game.board[square[0]][square[1]]):
+                undo = game.make_move(*move)
+                if not game._in_check(undo.turn):
+                    expected.add(move)
+                game.unmake_move(undo)
+        moves = game.get_legal_moves()
+        assert set(moves) == expected
+        game.move_piece(*rng.choice(moves))
+
+def test_chess_checkmate_and_stalemate():
+    # back rank mate
+    game = _position({
+        (7, 7): "WK", (7, 0): "WR", (0, 7): "BK", (1, 5): "BP", (1, 6): "BP", (1, 7): "BP",
+    })
+    result = game.make_ai_move(difficulty="minimax", depth=2, use_book=False)
+    assert (result["start"], result["end"]) == ((7, 0), (0, 0))
+    assert result["winner"] == "white"
+
+    # the queen move leaves the black king without a move but not in check
+    game = _position({(7, 7): "WK", (2, 2): "WQ", (0, 0): "BK"})
+    assert game.move_piece((2, 2), (2, 1))["winner"] == "draw"
+
+    game = _position({(7, 7): "WK", (2, 1): "WQ", (0, 0): "BK"}, turn="black")
+    assert game.check_winner() == "draw"
+    assert game._no_moves_score("white", 1) == 0
+
+def test_faster_wins_score_higher():
+    # four queen moves mate at once; the rest mate later, so they score lower
+    mates = {((1, 7), (0, 6)), ((1, 7), (0, 7)), ((1, 7), (1, 1)), ((1, 7), (1, 0))}
+    for depth in (4, 5):
+        game = _position({(0, 0): "BK", (2, 1): "WK", (1, 7): "WQ"})
+        game._prepare_search()
+        score, best_moves = game._search_root(game._generate_moves(game.turn), depth)
+        assert score == INF - 1
+        assert {decode_move(move) for move in best_moves} == mates
+
+        pvs = _position({(0, 0): "BK", (2, 1): "WK", (1, 7): "WQ"})
+        pvs._prepare_search()
+        score, move = pvs._pvs_root(pvs._generate_moves(pvs.turn), depth, -INF - 1, INF + 1)
+        assert score == INF - 1 and decode_move(move) in mates
+
+def test_pvs_matches_minimax_without_pruning(monkeypatch):
+    # with null moves and reductions off, PVS is exact alpha-beta
+    monkeypatch.setattr(game_logic, "NULL_MOVE_MIN_DEPTH", 99)
+    monkeypatch.setattr(game_logic, "LMR_MIN_DEPTH", 99)
+    for game_type, depth in (("checkers", 5), ("chess", 3)):
+        game = GameLogic(game_type)
+        game._prepare_search()
+        minimax_score = game._search_root(game._generate_moves(game.turn), depth)[0]
+        pvs = GameLogic(game_type)
+        pvs._prepare_search()
+        assert pvs._pvs_root(pvs._generate_moves(pvs.turn), depth, -INF - 1, INF + 1)[0] == minimax_score
+
+def test_hard_ai_searches_deeper():
+    for game_type in ("checkers", "chess"):
+        minimax = GameLogic(game_type)
+        minimax.make_ai_move(difficulty="minimax", depth=12, max_nodes=3000, use_book=False)
+        hard = GameLogic(game_type)
+        result = hard.make_ai_move(difficulty="hard", depth=12, max_nodes=3000, use_book=False, stats=True)
+        assert result["message"] == "Move successful"
+        assert result["search"]["depth"] > minimax.last_search["depth"]
+        # the null move passes were all taken back
+        assert hard.hash_key == hash_board(hard.board, hard.turn)
+
+    # back rank mate
+    game = _position({
+        (7, 7): "WK", (7, 0): "WR", (0, 7): "BK", (1, 5): "BP", (1, 6): "BP", (1, 7): "BP",
+    })
+    result = game.make_ai_move(difficulty="hard", depth=4, time_ms=2000, use_book=False)
+    assert (result["start"], result["end"]) == ((7, 0), (0, 0))
+
+def test_hard_ai_captures_the_last_piece():
+    # the jump takes black's last piece and wins at once
+    for depth in range(1, 5):
+        game = _position({(5, 2): "W", (7, 0): "W", (4, 3): "B"}, game_type="checkers")
+        result = game.make_ai_move(difficulty="hard", depth=depth, time_ms=2000, use_book=False, stats=True)
+        assert (result["start"], result["end"]) == ((5, 2), (3, 4))
+        assert result["winner"] == "white" and result["search"]["score"] == INF - 1
+
+    # every black move lets white take its last piece
+    for depth in range(2, 5):
+        game = _position({(6, 1): "W", (6, 5): "W", (4, 3): "B"}, "black", "checkers")
+        result = game.make_ai_move(difficulty="hard", depth=depth, time_ms=2000, use_book=False, stats=True)
+        # white wins on the second ply
+        assert result["search"]["score"] == -INF + 2
+
+
 if __name__ == '__main__':
     test_checkers_initialization()
     test_move_piece()
@@ -86,5 +529,29 @@ if __name__ == '__main__':
     test_checkers_ai_minimax_makes_move()
     test_chess_ai_minimax_makes_move()
     test_timeout_turn_switches_turn()
+    test_chess_timeout_in_check_loses()
     test_check_winner()
+    test_checkers_defaults_to_bitboard_backend()
+    test_bitboard_backend_matches_list_backend()
+    test_make_unmake_restores_position()
+    test_make_move_records_capture_and_promotion()
+    test_zobrist_hash_tracks_moves()
+    test_transposition_table_replacement()
+    test_ai_move_respects_node_budget()
+    test_ai_move_with_time_budget()
+    test_move_ordering_puts_best_captures_first()
+    test_staged_moves_match_ordered_moves()
+    test_quiescence_sees_recapture()
+    test_incremental_material_and_piece_lists()
+    test_chess_move_tables()
+    test_chess_rook_stops_at_blockers()
+    test_parallel_root_search_matches_serial()
+    test_ai_move_reports_search_stats()
+    test_pondering_on_predicted_reply()
+    test_encoded_moves()
+    test_chess_legal_moves_respect_pins_and_checks()
+    test_chess_checkmate_and_stalemate()
+    test_faster_wins_score_higher()
+    test_hard_ai_searches_deeper()
+    test_hard_ai_captures_the_last_piece()
     print("all tests passed!")
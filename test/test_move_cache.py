@@ -0,0 +1,103 @@
+"""
+    Unit tests for the AI move cache.
+    tests include:
+        - least recently used eviction and the hit/miss counters
+        - make_ai_move answering a repeated position from the cache, with
+          the book setting part of the key
+        - saving and loading the cache file
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import move_cache
+from utils.game_logic import GameLogic
+
+OPTIONS = {"difficulty": "minimax", "depth": 3, "time_ms": None, "max_nodes": None, "use_book": False}
+PV = [[[2, 1], [3, 0]]]
+
+
+def test_lru_eviction_and_counters():
+    move_cache.clear()
+    move_cache.configure(2)
+    try:
+        keys = [move_cache.cache_key("checkers", position, OPTIONS) for position in (1, 2, 3)]
+        assert move_cache.cache_key("checkers", 1, dict(OPTIONS, difficulty="random")) is None
+        move_cache.store(keys[0], PV, 10, 3)
+        move_cache.store(keys[1], PV, 20, 3)
+        assert move_cache.lookup(keys[0]) == (PV, 10, 3)
+        # keys[1] is now the least recently used
+        move_cache.store(keys[2], PV, 30, 3)
+        assert move_cache.lookup(keys[1]) is None
+        assert move_cache.lookup(keys[2]) == (PV, 30, 3)
+
+        stats = move_cache.stats()
+        assert stats["size"] == 2 and stats["max_entries"] == 2
+        assert (stats["hits"], stats["misses"], stats["stores"], stats["evictions"]) == (2, 1, 3, 1)
+        assert stats["hit_rate"] == 0.667
+    finally:
+        move_cache.configure(0)
+        move_cache.clear()
+
+def test_ai_moves_come_from_the_cache():
+    move_cache.clear()
+    move_cache.configure(100)
+    try:
+        game = GameLogic("checkers")
+        first = game.make_ai_move(difficulty="minimax", depth=3, use_book=False, stats=True)
+        assert first["search"]["source"] == "search"
+
+        game = GameLogic("checkers")
+        second = game.make_ai_move(difficulty="minimax", depth=3, use_book=False, stats=True)
+        assert second["search"]["source"] == "cache" and second["search"]["nodes"] == 0
+        assert (second["start"], second["end"]) == (first["start"], first["end"])
+        assert second["search"]["pv"] == first["search"]["pv"]
+
+        # the book setting is part of the key: with the book on, the move
+        # cached without it is not used, and the new search is kept apart
+        game = GameLogic("checkers")
+        assert game.make_ai_move(difficulty="minimax", depth=3, stats=True)["search"]["source"] == "search"
+        game = GameLogic("checkers")
+        assert game.make_ai_move(difficulty="minimax", depth=3, stats=True)["search"]["source"] == "cache"
+
+        # other settings, or use_cache=False, search again
+        game = GameLogic("checkers")
+        assert game.make_ai_move(difficulty="minimax", depth=2, use_book=False, stats=True)["search"]["source"] == "search"
+        game = GameLogic("checkers")
+        assert game.make_ai_move(difficulty="minimax", depth=3, use_book=False, stats=True,
+                                 use_cache=False)["search"]["source"] == "search"
+
+        # an entry whose move is illegal here (a hash collision) is dropped
+        game = GameLogic("checkers")
+        key = move_cache.cache_key("checkers", game.hash_key, dict(OPTIONS, depth=1))
+        move_cache.store(key, [[[5, 0], [3, 2]]], 0, 1)
+        assert game.make_ai_move(difficulty="minimax", depth=1, use_book=False, stats=True)["search"]["source"] == "search"
+    finally:
+        move_cache.configure(0)
+        move_cache.clear()
+
+def test_cache_file_round_trip(tmp_path):
+    path = str(tmp_path / "moves.json")
+    move_cache.clear()
+    move_cache.configure(10)
+    try:
+        key = move_cache.cache_key("chess", 12345, OPTIONS)
+        move_cache.store(key, PV, -40, 3)
+        assert move_cache.save(path) == 1
+        move_cache.clear()
+        assert move_cache.lookup(key) is None
+        assert move_cache.load(path) == 1
+        assert move_cache.lookup(key) == (PV, -40, 3)
+
+        with open(path, "w") as handle:
+            handle.write('{"version": 0, "entries": []}')
+        move_cache.clear()
+        assert move_cache.load(path) == 0
+    finally:
+        move_cache.configure(0)
+        move_cache.clear()
+
+
+if __name__ == '__main__':
+    test_lru_eviction_and_counters()
+    test_ai_moves_come_from_the_cache()
+    print("all tests passed!")
@@ -0,0 +1,48 @@
+"""
+    Unit tests for the opening book.
+    tests include:
+        - building a book file from a game collection
+        - looking up book moves and playing them from make_ai_move
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import opening_book
+from utils.game_logic import GameLogic
+
+
+GAMES = [
+    [[[5, 0], [4, 1]], [[2, 1], [3, 0]]],
+    [[[5, 0], [4, 1]], [[2, 3], [3, 2]]],
+    [[[5, 2], [4, 3]]],
+]
+
+
+def test_build_and_probe_book(tmp_path):
+    counts = opening_book.collect_book_moves("checkers", GAMES)
+    path = str(tmp_path / "checkers.bin")
+    assert opening_book.write_book(path, "checkers", counts) == 4
+
+    book = opening_book.OpeningBook(path)
+    start = GameLogic("checkers")
+    assert sorted(book.moves(start.hash_key)) == [(((5, 0), (4, 1)), 2), (((5, 2), (4, 3)), 1)]
+    start.move_piece((5, 0), (4, 1))
+    assert len(book.moves(start.hash_key)) == 2
+    assert book.moves(12345) == []
+    book.close()
+
+def test_ai_plays_book_moves(tmp_path):
+    counts = opening_book.collect_book_moves("checkers", GAMES[2:])
+    opening_book.write_book(str(tmp_path / "checkers.bin"), "checkers", counts)
+    try:
+        assert "checkers" in opening_book.load_books(str(tmp_path))
+        game = GameLogic("checkers")
+        result = game.make_ai_move(difficulty="minimax", depth=4)
+        assert (tuple(result["start"]), tuple(result["end"])) == ((5, 2), (4, 3))
+        assert game._nodes == 0
+    finally:
+        opening_book.close_books()
+
+def test_illegal_collection_moves_end_the_game():
+    counts = opening_book.collect_book_moves("checkers", [[[[5, 0], [3, 2]], [[2, 1], [3, 0]]]])
+    assert counts == {}
@@ -0,0 +1,65 @@
+"""
+    Perft tests: leaf counts of the move tree from reference positions.
+    tests include:
+        - make/unmake walk against the stored counts
+        - get_legal_moves/move_piece walk against the same counts
+        - list and bitboard checkers backends agreeing
+        - make/unmake leaving the position untouched
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.game_logic import GameLogic
+from utils.perft import PERFT_POSITIONS, divide, perft, perft_public, position_game
+
+# keep the suite quick: deeper counts are checked with python -m utils.perft --all
+MAX_TEST_NODES = 250000
+MAX_PUBLIC_NODES = 10000
+
+
+def test_perft_matches_expected_counts():
+    for name, position in PERFT_POSITIONS.items():
+        for depth, expected in sorted(position["expected"].items()):
+            if expected > MAX_TEST_NODES:
+                continue
+            assert perft(position_game(name), depth) == expected, (name, depth)
+
+def test_public_move_api_matches_perft():
+    for name, position in PERFT_POSITIONS.items():
+        for depth, expected in sorted(position["expected"].items()):
+            if expected > MAX_PUBLIC_NODES:
+                continue
+            assert perft_public(position_game(name), depth) == expected, (name, depth)
+
+def test_checkers_backends_agree():
+    for name, position in PERFT_POSITIONS.items():
+        if position["game_type"] != "checkers":
+            continue
+        state = position_game(name).to_state()
+        state["backend"] = "list"
+        assert perft(GameLogic.from_state(state), 4) == position["expected"][4]
+
+def test_perft_leaves_position_unchanged():
+    for name in PERFT_POSITIONS:
+        game = position_game(name)
+        board = [row[:] for row in game.board]
+        key = game.hash_key
+        perft(game, 3)
+        assert game.board == board
+        assert game.hash_key == key
+        assert game.turn == PERFT_POSITIONS[name]["turn"]
+
+def test_divide_sums_to_perft():
+    game = position_game("chess-middlegame")
+    counts = divide(game, 2)
+    assert len(counts) == PERFT_POSITIONS["chess-middlegame"]["expected"][1]
+    assert sum(counts.values()) == PERFT_POSITIONS["chess-middlegame"]["expected"][2]
+
+
+if __name__ == '__main__':
+    test_perft_matches_expected_counts()
+    test_public_move_api_matches_perft()
+    test_checkers_backends_agree()
+    test_perft_leaves_position_unchanged()
+    test_divide_sums_to_perft()
+    print("all tests passed!")
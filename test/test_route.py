@@ -4,14 +4,25 @@ tests:
     - GET /game and /pvp pages
     - POST /move (valid and invalid, PvP turn alternation)
     - AI response payload shape
+    - client AI budgets capped at the server's limits
+    - background AI jobs, and cancelling them when the game is reset
+    - stopping the job pool while a job waits for its game
+    - AI search statistics and the /ai-stats counters
+    - AI move cache hits for a position seen before
+    - POST /analyze streaming NDJSON results
+    - POST /analyze-game streaming per-ply replay analysis
 """
 
+import json
 import os
 import sys
+import threading
+import time
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import app
-from routes.game_routes import games
+from routes.game_routes import game_locks, games
+from utils import ai_jobs, move_cache
 from utils.game_logic import GameLogic
 
 
@@ -108,6 +119,38 @@ assert "timeout_move" in response.json
 assert "ai_move" in response.json
 assert response.json["turn"] == "white"
 
+# ✅ POST /game/move caps the client's AI budget at the server's limits
+reset_games()
+limits = app.config["AI_MAX_TIME_MS"], app.config["AI_MAX_NODES"]
+app.config["AI_MAX_TIME_MS"], app.config["AI_MAX_NODES"] = 50, 500
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_difficulty": "minimax",
+    "ai_max_nodes": 10**9,
+    "ai_stats": True
+})
+print("POST /game/move + huge node budget", response.status_code, response.json)
+assert response.status_code == 200
+assert response.json["ai_move"]["search"]["nodes"] <= 501
+
+reset_games()
+response = client.post("/game/move", json={
+    "game_type": "chess",
+    "start": [6, 4],
+    "end": [4, 4],
+    "ai": True,
+    "ai_difficulty": "hard",
+    "ai_time_ms": 10**9,
+    "ai_stats": True
+})
+print("POST /game/move + huge time budget", response.status_code, response.json)
+assert response.status_code == 200
+assert response.json["ai_move"]["search"]["elapsed_ms"] < 1000
+app.config["AI_MAX_TIME_MS"], app.config["AI_MAX_NODES"] = limits
+
 # ✅ POST /game/move with AI
 reset_games()
 response = client.post("/game/move", json={
@@ -121,4 +164,188 @@ print("POST /game/move + ai", response.status_code, response.json)
 assert response.status_code == 200
 assert "ai_move" in response.json
 
+# ✅ POST /game/move with a time-budgeted minimax AI
+reset_games()
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_difficulty": "minimax",
+    "ai_time_ms": 50
+})
+print("POST /game/move + ai budget", response.status_code, response.json)
+assert response.status_code == 200
+assert response.json["ai_move"]["message"] == "Move successful"
+assert response.json["turn"] == "white"
+
+# ✅ POST /game/move with a background AI job, then poll for the result
+reset_games()
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_async": True,
+    "ai_difficulty": "minimax",
+    "ai_depth": 2
+})
+print("POST /game/move + ai job", response.status_code, response.json)
+assert response.status_code == 200
+assert response.json["turn"] == "black"
+job_id = response.json["ai_job"]["job_id"]
+
+for _ in range(100):
+    response = client.get(f"/game/ai-job/{job_id}")
+    if response.json["status"] != "pending":
+        break
+    time.sleep(0.05)
+print("GET /game/ai-job", response.status_code, response.json)
+assert response.status_code == 200
+assert response.json["status"] == "done"
+assert response.json["ai_move"]["message"] == "Move successful"
+assert response.json["turn"] == "white"
+
+response = client.get("/game/ai-job/missing")
+assert response.status_code == 404
+
+# ✅ a job whose game is reset while it searches is cancelled, not played
+reset_games()
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_async": True,
+    "ai_difficulty": "minimax",
+    "ai_time_ms": 500
+})
+job_id = response.json["ai_job"]["job_id"]
+assert client.get("/game/ai?game=checkers").status_code == 200
+for _ in range(100):
+    response = client.get(f"/game/ai-job/{job_id}")
+    if response.json["status"] != "pending":
+        break
+    time.sleep(0.05)
+print("GET /game/ai-job after reset", response.status_code, response.json)
+assert response.json["status"] == "cancelled"
+response = client.get("/game/game?type=checkers")
+assert response.json["board"] == GameLogic("checkers").board
+assert response.json["turn"] == "white"
+
+# ✅ shutting the job pool down with a job pending, while the game is locked
+reset_games()
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_async": True,
+    "ai_difficulty": "minimax",
+    "ai_time_ms": 300
+})
+job_id = response.json["ai_job"]["job_id"]
+with game_locks["checkers"]:
+    stopper = threading.Thread(target=ai_jobs.shutdown, daemon=True)
+    stopper.start()
+    stopper.join(timeout=10)
+    assert not stopper.is_alive()
+    # the search is done, but its move waits for the game lock
+    assert client.get(f"/game/ai-job/{job_id}").json["status"] == "pending"
+for _ in range(100):
+    response = client.get(f"/game/ai-job/{job_id}")
+    if response.json["status"] != "pending":
+        break
+    time.sleep(0.05)
+print("GET /game/ai-job after shutdown", response.status_code, response.json)
+assert response.json["status"] == "done"
+assert games["checkers"].turn == "white"
+
+# ✅ POST /game/move with search statistics, then the aggregate counters
+reset_games()
+move_cache.clear()
+client.get("/game/ai-stats?reset=1")
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_difficulty": "minimax",
+    "ai_depth": 3,
+    "ai_stats": True
+})
+print("POST /game/move + ai stats", response.status_code, response.json)
+assert response.status_code == 200
+search = response.json["ai_move"]["search"]
+assert search["source"] == "search"
+assert search["depth"] == 3 and search["nodes"] > 0
+assert search["pv"][0] == [list(response.json["ai_move"]["start"]), list(response.json["ai_move"]["end"])]
+
+response = client.get("/game/ai-stats")
+print("GET /game/ai-stats", response.status_code, response.json)
+assert response.status_code == 200
+assert response.json["checkers"]["moves"] == 1
+assert response.json["checkers"]["nodes"] == search["nodes"]
+assert response.json["move_cache"]["misses"] == 1 and response.json["move_cache"]["stores"] == 1
+
+# ✅ the same position and settings again come from the AI move cache
+reset_games()
+response = client.post("/game/move", json={
+    "game_type": "checkers",
+    "start": [5, 0],
+    "end": [4, 1],
+    "ai": True,
+    "ai_difficulty": "minimax",
+    "ai_depth": 3,
+    "ai_stats": True
+})
+print("POST /game/move + cached ai move", response.status_code, response.json)
+assert response.status_code == 200
+cached = response.json["ai_move"]["search"]
+assert cached["source"] == "cache" and cached["nodes"] == 0
+assert cached["pv"][0] == search["pv"][0]
+response = client.get("/game/ai-stats")
+assert response.json["move_cache"]["hits"] == 1
+assert response.json["checkers"]["sources"]["cache"] == 1
+
+# leave the cache off for the test modules run after this one
+move_cache.configure(0)
+move_cache.clear()
+
+# ✅ POST /game/analyze streams one NDJSON line per position
+response = client.post("/game/analyze", json={
+    "depth": 2,
+    "positions": [
+        {"id": "a", "game_type": "checkers", "board": GameLogic("checkers").board, "turn": "white"},
+        {"id": "b", "game_type": "chess", "board": GameLogic("chess").board, "turn": "white"},
+        {"id": "c", "game_type": "chess", "board": [[]]},
+    ]
+})
+print("POST /game/analyze", response.status_code, response.data)
+assert response.status_code == 200
+assert response.mimetype == "application/x-ndjson"
+lines = {line["id"]: line for line in map(json.loads, response.data.decode().splitlines())}
+assert sorted(lines) == ["a", "b", "c"]
+assert lines["a"]["depth"] == lines["b"]["depth"] == 2
+assert lines["b"]["legal_moves"] == 20 and lines["b"]["best_move"]
+assert "error" in lines["c"]
+
+response = client.post("/game/analyze", json={"positions": []})
+assert response.status_code == 400
+
+# ✅ POST /game/analyze-game streams one NDJSON line per ply, in order
+response = client.post("/game/analyze-game", json={
+    "game_type": "chess",
+    "moves": [[[6, 5], [5, 5]], [[1, 4], [3, 4]], [[6, 6], [4, 6]], [[0, 3], [4, 7]]],
+})
+print("POST /game/analyze-game", response.status_code, response.data)
+assert response.status_code == 200
+assert response.mimetype == "application/x-ndjson"
+plies = [json.loads(line) for line in response.data.decode().splitlines()]
+assert [ply["ply"] for ply in plies] == [1, 2, 3, 4]
+assert plies[2]["blunder"] and plies[-1]["winner"] == "black"
+
+response = client.post("/game/analyze-game", json={"game_type": "chess", "moves": [], "difficulty": "random"})
+assert response.status_code == 400
+
 print("all route tests passed!")
@@ -0,0 +1,70 @@
+"""
+    Unit tests for the AI self-play tournament.
+    tests include:
+        - parsing configurations and building the schedule
+        - seeded games replaying the same in and out of the pool
+        - adjudication and Elo standings
+"""
+import os
+import sys
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import tournament
+from utils.ranking_system import DEFAULT_RATING
+
+
+def test_parse_config_and_schedule():
+    assert tournament.parse_config("greedy", "chess") == {"difficulty": "greedy"}
+    assert tournament.parse_config("minimax:3", "checkers") == {"difficulty": "minimax", "depth": 3}
+    assert tournament.parse_config("minimax:t50", "chess")["time_ms"] == 50
+    assert tournament.parse_config("hard:t50", "chess") == {"difficulty": "hard", "depth": 6, "time_ms": 50}
+    with pytest.raises(ValueError):
+        tournament.parse_config("minimax:deep", "chess")
+
+    pairings = tournament.schedule(["a", "b", "c"], 2)
+    assert len(pairings) == 6
+    assert pairings[:2] == [("a", "b"), ("b", "a")]
+
+def test_games_replay_from_their_seed():
+    task = ("checkers", "greedy", "minimax:1", 42, 60)
+    first = tournament.play_game(task)
+    second = tournament.play_game(task)
+    strip = lambda game: {key: value for key, value in game.items() if key != "usage"}
+    assert strip(first) == strip(second)
+    assert first["result"] in ("white", "black", "draw")
+    assert first["usage"]["black"]["nodes"] > 0
+
+def test_overlong_games_are_adjudicated():
+    game = tournament.play_game(("chess", "random", "random", 7, 4))
+    assert game["ending"] == "adjudicated"
+    assert game["plies"] == 4
+
+def test_tournament_standings():
+    configs = ["random", "minimax:2"]
+    report = tournament.run_tournament("checkers", configs, 4, workers=1, seed=3, max_plies=120)
+    pooled = tournament.run_tournament("checkers", configs, 4, workers=2, seed=3, max_plies=120)
+    assert [game["result"] for game in report["games"]] == [game["result"] for game in pooled["games"]]
+
+    standings = {row["config"]: row for row in report["standings"]}
+    assert standings["minimax:2"]["games"] == standings["random"]["games"] == 4
+    assert standings["minimax:2"]["wins"] == standings["random"]["losses"]
+    assert standings["minimax:2"]["rating"] > DEFAULT_RATING > standings["random"]["rating"]
+    assert report["standings"][0]["config"] == "minimax:2"
+    assert standings["minimax:2"]["avg_nodes_per_move"] > 0
+
+def test_elo_is_rated_in_order():
+    results = [
+        {"white": "a", "black": "b", "result": "white"},
+        {"white": "b", "black": "a", "result": "draw"},
+    ]
+    ratings = tournament.rate_results(["a", "b"], results)
+    assert ratings["a"] > DEFAULT_RATING > ratings["b"]
+
+
+if __name__ == '__main__':
+    test_parse_config_and_schedule()
+    test_games_replay_from_their_seed()
+    test_overlong_games_are_adjudicated()
+    test_tournament_standings()
+    test_elo_is_rated_in_order()
+    print("all tests passed!")
@@ -0,0 +1,203 @@
+"""
+Benchmark for the GameLogic AI search.
+
+Runs _select_ai_move over a fixed corpus of positions for each game type,
+difficulty and depth, and writes a JSON report with the chosen move, nodes
+searched, time to finish the depth and nodes per second. The corpus and the
+random tie breaks are seeded, so two runs of the same engine choose the same
+moves and search the same number of nodes; only the timings move. Reports
+from two commits can be compared to catch regressions:
+
+    python -m utils.ai_benchmark run --out before.json
+    python -m utils.ai_benchmark run --out after.json
+    python -m utils.ai_benchmark compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+
+from utils.game_logic import MAX_AI_DEPTH, GameLogic
+
+DEFAULT_SEED = 20251210
+DEFAULT_POSITIONS = 6
+DEFAULT_DEPTHS = {game_type: tuple(range(1, cap + 1)) for game_type, cap in MAX_AI_DEPTH.items()}
+DIFFICULTIES = ("random", "greedy", "minimax", "hard")
+# Difficulties that search, run once per depth (the hard AI without its
+# usual clock, so it finishes each depth like minimax)
+SEARCH_DIFFICULTIES = ("minimax", "hard")
+
+# Plies of random play used to spread the corpus out from the start position
+CORPUS_PLIES = (0, 4, 8, 12, 16, 20)
+
+
+def build_corpus(game_type, count=DEFAULT_POSITIONS, seed=DEFAULT_SEED):
+    """
+        Return count position snapshots (GameLogic.to_state()) reached by
+        seeded random play from the start position. Games that end early
+        are replayed with the next seed.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    while len(corpus) < count:
+        plies = CORPUS_PLIES[len(corpus) % len(CORPUS_PLIES)]
+        game = GameLogic(game_type)
+        for _ in range(plies):
+            moves = game.get_legal_moves()
+            if not moves or game.winner:
+                break
+            game.move_piece(*rng.choice(moves))
+        if game.winner or not game.get_legal_moves():
+            continue
+        corpus.append(game.to_state())
+    return corpus
+
+
+def _measure(state, difficulty, depth, seed):
+    """Search one position once and return its result row."""
+    game = GameLogic.from_state(state)
+    random.seed(seed)
+    started = time.perf_counter()
+    move = game._select_ai_move(difficulty, depth=depth, use_book=False)
+    elapsed = time.perf_counter() - started
+    nodes = game._nodes
+    return {
+        "move": [list(move[0]), list(move[1])] if move else None,
+        "nodes": nodes,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "nodes_per_sec": round(nodes / elapsed) if elapsed > 0 else 0,
+    }
+
+
+def run_benchmark(game_types=("checkers", "chess"), positions=DEFAULT_POSITIONS, depths=None,
+                  difficulties=DIFFICULTIES, seed=DEFAULT_SEED):
+    """
+        Benchmark every (game type, difficulty, depth) over the corpus and
+        return the report dict. random and greedy do not search, so they
+        run once per position with depth null.
+    """
+    depths = depths or DEFAULT_DEPTHS
+    results = []
+    totals = {}
+    for game_type in game_types:
+        corpus = build_corpus(game_type, positions, seed)
+        for difficulty in difficulties:
+            levels = depths[game_type] if difficulty in SEARCH_DIFFICULTIES else (None,)
+            for depth in levels:
+                total = {"nodes": 0, "elapsed_ms": 0.0}
+                for index, state in enumerate(corpus):
+                    row = _measure(state, difficulty, depth or 1, seed + index)
+                    results.append(dict(
+                        game_type=game_type, position=index, difficulty=difficulty, depth=depth, **row
+                    ))
+                    total["nodes"] += row["nodes"]
+                    total["elapsed_ms"] += row["elapsed_ms"]
+                total["elapsed_ms"] = round(total["elapsed_ms"], 3)
+                total["nodes_per_sec"] = (
+                    round(total["nodes"] * 1000 / total["elapsed_ms"]) if total["elapsed_ms"] else 0
+                )
+                totals[_total_key(game_type, difficulty, depth)] = total
+
+    return {
+        "meta": {
+            "seed": seed,
+            "positions": positions,
+            "python": platform.python_version(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "totals": totals,
+        "results": results,
+    }
+
+
+def _total_key(game_type, difficulty, depth):
+    return f"{game_type}/{difficulty}/{depth if depth is not None else '-'}"
+
+
+def compare_reports(old, new, threshold=0.10, min_ms=5.0):
+    """
+        Compare two reports and return a list of (key, message, is_regression).
+        - nodes or chosen moves changing means the search itself changed
+        - time growing by more than threshold (and by at least min_ms, so
+          sub-millisecond noise is ignored) is a speed regression
+    """
+    findings = []
+    for key, before in old["totals"].items():
+        after = new["totals"].get(key)
+        if after is None:
+            findings.append((key, "missing from the new report", False))
+            continue
+        if before["nodes"] != after["nodes"]:
+            findings.append((key, f"nodes {before['nodes']} -> {after['nodes']}", after["nodes"] > before["nodes"]))
+        if before["elapsed_ms"]:
+            change = (after["elapsed_ms"] - before["elapsed_ms"]) / before["elapsed_ms"]
+            if abs(change) > threshold and abs(after["elapsed_ms"] - before["elapsed_ms"]) >= min_ms:
+                findings.append((
+                    key,
+                    f"time {before['elapsed_ms']:.1f}ms -> {after['elapsed_ms']:.1f}ms ({change:+.0%})",
+                    change > 0,
+                ))
+
+    old_moves = {_row_key(row): row["move"] for row in old["results"]}
+    changed = sum(
+        1 for row in new["results"]
+        if _row_key(row) in old_moves and old_moves[_row_key(row)] != row["move"]
+    )
+    if changed:
+        findings.append(("moves", f"{changed} chosen moves changed", False))
+    return findings
+
+
+def _row_key(row):
+    return (row["game_type"], row["position"], row["difficulty"], row["depth"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AI search and compare reports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="benchmark the current engine")
+    run.add_argument("--out", required=True, help="JSON report path")
+    run.add_argument("--game", choices=("checkers", "chess"), action="append",
+                     help="game type to run (default: both)")
+    run.add_argument("--positions", type=int, default=DEFAULT_POSITIONS)
+    run.add_argument("--max-depth", type=int, help="cap the minimax and hard depths")
+    run.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    compare = commands.add_parser("compare", help="diff two reports")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="relative slowdown reported as a regression")
+    compare.add_argument("--min-ms", type=float, default=5.0,
+                         help="ignore time changes smaller than this")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        with open(args.old) as handle:
+            old = json.load(handle)
+        with open(args.new) as handle:
+            new = json.load(handle)
+        findings = compare_reports(old, new, args.threshold, args.min_ms)
+        for key, message, regression in findings:
+            print(f"{'REGRESSION' if regression else 'changed':>10}  {key}: {message}")
+        if not findings:
+            print("no differences")
+        return 1 if any(regression for _, _, regression in findings) else 0
+
+    depths = {
+        game_type: tuple(d for d in levels if args.max_depth is None or d <= args.max_depth)
+        for game_type, levels in DEFAULT_DEPTHS.items()
+    }
+    report = run_benchmark(tuple(args.game or ("checkers", "chess")), args.positions, depths, seed=args.seed)
+    with open(args.out, "w") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+    for key, total in report["totals"].items():
+        print(f"{key}: {total['nodes']} nodes in {total['elapsed_ms']:.1f}ms ({total['nodes_per_sec']:,} nodes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""
+Background AI move jobs.
+
+Instead of running make_ai_move inside the HTTP request, the route submits a
+job: the position is snapshotted with GameLogic.to_state(), the search runs in
+a process pool, and when it finishes the chosen move is played on the live
+game. Results are kept for polling, and an optional notify callback (the
+routes use it for a Socket.IO push) is called with the finished job. A job
+whose game was replaced (a reset) or has moved on meanwhile is cancelled
+instead of played.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from utils import move_cache, parallel_search, search_stats
+from utils.game_logic import GameLogic
+
+# Finished jobs kept around for polling before the oldest are dropped
+MAX_JOBS = 1000
+
+# Job fields only _finish uses, kept out of the public view
+_PRIVATE_FIELDS = ("game", "expected", "stats", "cache_key", "notify", "is_current", "lock")
+
+# make_ai_move arguments that decide which move the search picks
+SEARCH_OPTIONS = ("difficulty", "depth", "time_ms", "max_nodes", "use_book")
+
+# Name of the job pool in parallel_search, which also stops it at exit
+POOL_NAME = "ai_jobs"
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def shutdown():
+    """Stop the job pool, letting pending jobs finish."""
+    parallel_search.shutdown_task_pool(POOL_NAME)
+
+
+def _run_search(state, options):
+    """Worker task: search the snapshot and return the AI result dict."""
+    game = GameLogic.from_state(state)
+    # the job already runs in a pool worker, so search inline; the stats are
+    # always sent back so the parent process can count them, and the worker's
+    # copy of the game is thrown away, so there is nothing to ponder for
+    options = dict(options, workers=1, stats=True, ponder_ms=None)
+    return game.make_ai_move(**options)
+
+
+def _job_view(job):
+    view = {
+        "job_id": job["job_id"],
+        "game_type": job["game_type"],
+        "status": job["status"],
+    }
+    if job["status"] != "pending":
+        view.update(job["response"])
+    return view
+
+
+def _apply(job, future):
+    """Play a finished search on the job's game; returns (status, response)."""
+    game = job["game"]
+    expected_hash, expected_turn = job["expected"]
+    try:
+        ai_result = future.result()
+    except Exception as exc:  # worker crashed, surface it to the poller
+        return "error", {"error": str(exc)}
+    is_current = job["is_current"]
+    if ((is_current is not None and not is_current())
+            or game.hash_key != expected_hash or game.turn != expected_turn or game.winner):
+        # the game moved on (reset or timeout) while the AI was thinking
+        return "cancelled", {"error": "Game changed before the AI move finished"}
+
+    if "error" in ai_result:
+        if ai_result.get("winner"):
+            game.winner = ai_result["winner"]
+        applied = ai_result
+    else:
+        if ai_result["search"]["source"] == "search":
+            # the worker's cache is its own, so remember the move here
+            search = ai_result["search"]
+            move_cache.store(job["cache_key"], search["pv"], search["score"], search["depth"])
+        applied = game.move_piece(tuple(ai_result["start"]), tuple(ai_result["end"]))
+        applied["ai_difficulty"] = ai_result.get("ai_difficulty")
+        search_stats.record(job["game_type"], ai_result["search"])
+        if job["stats"]:
+            applied["search"] = ai_result["search"]
+    return "done", {
+        "ai_move": applied,
+        "board": [row[:] for row in game.board],
+        "turn": game.turn,
+        "winner": game.winner,
+    }
+
+
+def _finish(job_id, future):
+    """
+        Done callback, run on the pool's management thread. Playing the
+        result waits for the game lock, which a slow request can hold for
+        a while, so that happens on a thread of its own.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        private = {name: job.pop(name) for name in _PRIVATE_FIELDS}
+        private["game_type"] = job["game_type"]
+    threading.Thread(target=_complete, args=(job, private, future), daemon=True).start()
+
+
+def _complete(job, private, future):
+    # take the game lock without holding _jobs_lock: request handlers hold
+    # the game lock while they submit jobs
+    with private["lock"] or nullcontext():
+        status, response = _apply(private, future)
+
+    with _jobs_lock:
+        job["status"] = status
+        job["response"] = response
+        job["finished_at"] = time.time()
+        view = _job_view(job)
+
+    if private["notify"] is not None:
+        private["notify"](view)
+
+
+def submit_ai_job(game, game_type, options, workers=2, notify=None, is_current=None, lock=None):
+    """
+        Queue an AI move for game and return the job id right away.
+        - options: keyword arguments for make_ai_move
+        - workers: size of the job process pool
+        - notify: optional callback receiving the finished job view
+        - is_current: optional callable, False once game has been replaced
+          (a reset), which cancels the job
+        - lock: optional lock the caller holds while changing game; the
+          result is checked and played under it
+    """
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "game_type": game_type,
+        "status": "pending",
+        "game": game,
+        "expected": (game.hash_key, game.turn),
+        "stats": bool(options.get("stats")),
+        "cache_key": move_cache.cache_key(game_type, game.hash_key, game._ai_options(
+            **{name: options[name] for name in SEARCH_OPTIONS if name in options}
+        )) if options.get("use_cache", True) else None,
+        "notify": notify,
+        "is_current": is_current,
+        "lock": lock,
+        "created_at": time.time(),
+    }
+    with _jobs_lock:
+        _jobs[job_id] = job
+        while len(_jobs) > MAX_JOBS:
+            oldest_id = next(iter(_jobs))
+            if _jobs[oldest_id]["status"] == "pending":
+                break
+            _jobs.popitem(last=False)
+        future = parallel_search.get_task_pool(POOL_NAME, workers).submit(_run_search, game.to_state(), options)
+    future.add_done_callback(lambda done: _finish(job_id, done))
+    return job_id
+
+
+def get_job(job_id):
+    """Return the public view of a job, or None if it is unknown."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return _job_view(job) if job is not None else None
@@ -0,0 +1,369 @@
+"""
+Batch position analysis.
+
+analyze_positions() searches many positions at once: each one is rebuilt
+with GameLogic.from_state() in a process pool worker and searched with the
+AI (no opening book, no move cache), and the results are yielded as each
+search finishes, so a batch uses every core instead of one request thread.
+The /game/analyze route streams them as NDJSON.
+
+A position is a dict:
+    {"game_type": "chess", "board": [[...] * 8] * 8, "turn": "white", "id": ...}
+with optional difficulty ("minimax" or "hard"), depth, time_ms and
+max_nodes overriding the batch defaults. Each result carries the position's
+index in the batch (results arrive out of order) and its id:
+    {"index", "id", "game_type", "turn", "best_move", "score", "depth",
+     "nodes", "elapsed_ms", "pv", "legal_moves", "winner"}
+score is from the side to move's point of view; best_move is None (and
+winner set) when the side to move has no move. Invalid positions come back
+as {"index", "id", "error"}.
+
+analyze_game() replays a finished game's move list on a single GameLogic
+and yields a record per ply, in order: the best move and score before the
+move, the score the played move kept, the loss between them and whether
+that loss makes it a blunder. Each position is searched once and serves
+as both the "after" of one ply and the "before" of the next. The
+/game/analyze-game route streams them as NDJSON.
+
+Analyze a JSON lines file of positions, or a game, from the command line:
+    python -m utils.analysis --positions positions.jsonl --depth 4 --workers 4 > results.ndjson
+    python -m utils.analysis --game chess --moves game.json > plies.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import as_completed
+
+from utils import parallel_search
+from utils.batch_eval import PIECE_CODES
+from utils.moves import encode_move
+
+ANALYSIS_DIFFICULTIES = ("minimax", "hard")
+
+DEFAULT_OPTIONS = {"difficulty": "minimax", "depth": 4, "time_ms": None, "max_nodes": None}
+
+# Loss (in PIECE_WEIGHTS points) that marks a replayed move as a blunder:
+# a man in checkers, a minor piece in chess
+BLUNDER_THRESHOLD = {"checkers": 1, "chess": 3}
+
+# Default search depth for replayed games, shallow enough to analyze every
+# game: about 5 ms per checkers ply and 25 ms per chess ply on one core
+REPLAY_DEPTH = {"checkers": 4, "chess": 2}
+
+# Name of the analysis pool in parallel_search, which also stops it at exit
+POOL_NAME = "analysis"
+
+
+def shutdown():
+    """Stop the analysis pool, letting queued searches finish."""
+    parallel_search.shutdown_task_pool(POOL_NAME)
+
+
+def _positive_int(value):
+    return value if isinstance(value, int) and not isinstance(value, bool) and value > 0 else None
+
+
+def search_options(defaults=None, overrides=None):
+    """
+        The search settings for a position: DEFAULT_OPTIONS, then defaults,
+        then overrides. Returns (options, None) or (None, error message).
+    """
+    options = dict(DEFAULT_OPTIONS)
+    for settings in (defaults or {}, overrides or {}):
+        options.update({name: settings[name] for name in DEFAULT_OPTIONS if name in settings})
+    if options["difficulty"] not in ANALYSIS_DIFFICULTIES:
+        return None, f"Difficulty must be one of {', '.join(ANALYSIS_DIFFICULTIES)}."
+    options["depth"] = _positive_int(options["depth"]) or DEFAULT_OPTIONS["depth"]
+    options["time_ms"] = _positive_int(options["time_ms"])
+    options["max_nodes"] = _positive_int(options["max_nodes"])
+    return options, None
+
+
+def prepare_position(position, defaults=None):
+    """
+        Check a position and merge it with the batch defaults.
+        Returns (task, None) with a picklable task for the workers, or
+        (None, error message).
+    """
+    if not isinstance(position, dict):
+        return None, "Position must be an object."
+    game_type = str(position.get("game_type", "")).lower()
+    if game_type not in PIECE_CODES:
+        return None, "Invalid game type."
+    board = position.get("board")
+    if (not isinstance(board, list) or len(board) != 8
+            or any(not isinstance(row, list) or len(row) != 8 for row in board)):
+        return None, "Board must be 8 rows of 8 squares."
+    pieces = PIECE_CODES[game_type]
+    if any(piece and piece not in pieces for row in board for piece in row):
+        return None, f"Unknown {game_type} piece on the board."
+    if game_type == "chess" and any(sum(row.count(king) for row in board) != 1 for king in ("WK", "BK")):
+        return None, "Each side needs exactly one king."
+    turn = position.get("turn", "white")
+    if turn not in ("white", "black"):
+        return None, "Turn must be white or black."
+
+    options, error = search_options(defaults, position)
+    if error:
+        return None, error
+
+    state = {"game_type": game_type, "board": [[piece or "" for piece in row] for row in board], "turn": turn}
+    return {"state": state, "options": options}, None
+
+
+def analyze_task(task):
+    """Worker task: search one prepared position and return its result dict."""
+    from utils.game_logic import GameLogic
+
+    return _analyze(GameLogic.from_state(task["state"]), task["options"])
+
+
+def _analyze(game, options):
+    """Search game's current position in place; it is left as it was."""
+    result = {
+        "game_type": game.game_type,
+        "turn": game.turn,
+        "best_move": None,
+        "score": None,
+        "depth": 0,
+        "nodes": 0,
+        "elapsed_ms": 0.0,
+        "pv": [],
+        "legal_moves": 0,
+        "winner": game.winner,
+    }
+    if game.winner:
+        # the last piece was taken; the turn stays with the winner, so there is nothing to search
+        return result
+    result["legal_moves"] = len(game._generate_moves(game.turn))
+    if not result["legal_moves"]:
+        # checkmate or stalemate in chess; in checkers, no move loses
+        if game.game_type == "chess" and not game._in_check(game.turn):
+            result["winner"] = "draw"
+        else:
+            result["winner"] = game._opponent(game.turn)
+        return result
+
+    start, end = game._select_ai_move(workers=1, **game._ai_options(use_book=False, **options))
+    search = game.last_search
+    result["best_move"] = [list(start), list(end)]
+    for name in ("score", "depth", "nodes", "elapsed_ms", "pv"):
+        result[name] = search[name]
+    return result
+
+
+def analyze_positions(positions, workers=None, defaults=None):
+    """
+        Search every position and yield its result as soon as it is ready.
+        - workers: size of the process pool (default: one per CPU);
+          1 searches inline, in batch order
+        - defaults: difficulty, depth, time_ms and max_nodes for positions
+          that do not set their own
+        Closing the generator early cancels the searches not yet started.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks, errors = [], []
+    for index, position in enumerate(positions):
+        task, error = prepare_position(position, defaults)
+        position_id = position.get("id") if isinstance(position, dict) else None
+        if error:
+            errors.append({"index": index, "id": position_id, "error": error})
+        else:
+            tasks.append((index, position_id, task))
+
+    if workers == 1:
+        yield from errors
+        for index, position_id, task in tasks:
+            yield dict(analyze_task(task), index=index, id=position_id)
+        return
+
+    executor = parallel_search.get_task_pool(POOL_NAME, workers)
+    futures = {executor.submit(analyze_task, task): (index, position_id) for index, position_id, task in tasks}
+    try:
+        yield from errors
+        for future in as_completed(futures):
+            index, position_id = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:  # a worker crashed, report it for this position only
+                result = {"error": str(exc)}
+            yield dict(result, index=index, id=position_id)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _position_score(result, color):
+    """An analyzed position's score for color: the search's, or the result of a finished game."""
+    from utils.game_logic import INF
+
+    winner = result["winner"]
+    if winner is not None:
+        return 0 if winner == "draw" else INF if winner == color else -INF
+    return result["score"] if result["turn"] == color else -result["score"]
+
+
+def _ply_record(ply, move, before, after, threshold):
+    """
+        Judge the move played at ply (1-based) from the searches of the
+        positions before and after it. Scores are the mover's: "eval" is the
+        best score available, "score_after" what the move kept, and "loss"
+        the difference; a loss of threshold or more is a blunder. A move
+        that keeps a forced win loses nothing, however much slower the win.
+    """
+    from utils.game_logic import WIN_SCORE
+
+    color = before.get("turn")
+    record = {"ply": ply, "color": color, "move": move}
+    if "error" in before or "error" in after:
+        record["error"] = before.get("error") or after.get("error")
+        return record
+    best = _position_score(before, color)
+    kept = _position_score(after, color)
+    loss = 0 if kept > WIN_SCORE else max(0, best - kept)
+    record.update({
+        "best_move": before["best_move"],
+        "eval": best,
+        "score_after": kept,
+        "eval_white": kept if color == "white" else -kept,
+        "loss": loss,
+        "blunder": loss >= threshold,
+        "depth": before["depth"],
+        "nodes": before["nodes"],
+        "winner": after["winner"],
+    })
+    return record
+
+
+def _parse_move(move):
+    """((r1, c1), (r2, c2)) from [[r1, c1], [r2, c2]], or None if it is not a move on the board."""
+    try:
+        (r1, c1), (r2, c2) = move
+        squares = tuple(int(value) for value in (r1, c1, r2, c2))
+    except (TypeError, ValueError):
+        return None
+    if not all(0 <= value < 8 for value in squares):
+        return None
+    return squares[:2], squares[2:]
+
+
+def analyze_game(game_type, moves, workers=None, defaults=None, blunder_threshold=None):
+    """
+        Replay a game from the start position and return a generator of one
+        record per ply, in order, each ready once the positions before and
+        after it are searched:
+            {"ply", "color", "move", "best_move", "eval", "score_after",
+             "eval_white", "loss", "blunder", "depth", "nodes", "winner"}
+        - moves: [[[r1, c1], [r2, c2]], ...] as played
+        - workers: 1 searches every position on the replaying GameLogic
+          itself; more (default: one per CPU) sends the positions to the
+          analysis pool while the replay carries on
+        - defaults: difficulty, depth (REPLAY_DEPTH for the game type by
+          default), time_ms and max_nodes
+        - blunder_threshold: the loss, in PIECE_WEIGHTS points, that makes a
+          blunder (BLUNDER_THRESHOLD for the game type by default)
+        The replay is one GameLogic walked forward with make_move, never
+        rebuilt per ply. It stops at the first illegal move, which is
+        reported as {"ply", "move", "error"}. Bad settings raise ValueError
+        right away.
+    """
+    if game_type not in PIECE_CODES:
+        raise ValueError("Invalid game type.")
+    options, error = search_options(dict({"depth": REPLAY_DEPTH[game_type]}, **(defaults or {})))
+    if error:
+        raise ValueError(error)
+    threshold = blunder_threshold if blunder_threshold is not None else BLUNDER_THRESHOLD[game_type]
+    # checked here, the replay itself only starts when the records are read
+    return _replay_game(game_type, list(moves), workers or os.cpu_count() or 1, options, threshold)
+
+
+def _replay_game(game_type, moves, workers, options, threshold):
+    from utils.game_logic import GameLogic
+
+    game = GameLogic(game_type)
+    executor = parallel_search.get_task_pool(POOL_NAME, workers) if workers > 1 else None
+    # searched positions (or pool futures), position 0 being the start
+    results = []
+    futures = {}
+    played = []
+    stop_error = None
+    try:
+        for raw_move in moves + [None]:
+            if executor is None:
+                results.append(_analyze(game, options))
+                if played:
+                    yield _ply_record(len(played), played[-1], results[-2], results[-1], threshold)
+            else:
+                task = {"state": game.to_state(), "options": options}
+                futures[executor.submit(analyze_task, task)] = len(futures)
+            if raw_move is None:
+                break
+            move = _parse_move(raw_move)
+            # the game ends with the last piece taken or without a legal move
+            legal_keys = () if game.winner else game._legal_move_keys(game.turn)
+            if not legal_keys:
+                stop_error = "Move after the game ended."
+            elif move is None or encode_move(*move) not in legal_keys:
+                stop_error = "Illegal move."
+            if stop_error:
+                break
+            played.append([list(move[0]), list(move[1])])
+            game.make_move(*move)
+
+        if executor is not None:
+            # results arrive in any order; plies go out in order
+            results = [None] * len(futures)
+            ply = 1
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as exc:  # a worker crashed, report the plies that needed it
+                    result = {"error": str(exc)}
+                results[futures[future]] = result
+                while ply < len(results) and results[ply - 1] is not None and results[ply] is not None:
+                    yield _ply_record(ply, played[ply - 1], results[ply - 1], results[ply], threshold)
+                    ply += 1
+    finally:
+        for future in futures:
+            future.cancel()
+
+    if stop_error:
+        yield {"ply": len(played) + 1, "move": moves[len(played)], "error": stop_error}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze positions, or every ply of a game.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--positions", help="JSON lines file, one position per line")
+    source.add_argument("--moves", help="JSON file with one game's move list, replayed from the start")
+    parser.add_argument("--game", choices=sorted(PIECE_CODES), default="checkers", help="game type for --moves")
+    parser.add_argument("--difficulty", choices=ANALYSIS_DIFFICULTIES, default=DEFAULT_OPTIONS["difficulty"])
+    parser.add_argument("--depth", type=int, help=f"default: {DEFAULT_OPTIONS['depth']}, or REPLAY_DEPTH for --moves")
+    parser.add_argument("--time-ms", type=int, help="search budget per position")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    args = parser.parse_args(argv)
+
+    defaults = {"difficulty": args.difficulty, "time_ms": args.time_ms}
+    if args.depth is not None:
+        defaults["depth"] = args.depth
+    if args.moves:
+        with open(args.moves) as handle:
+            moves = json.load(handle)
+        results = analyze_game(args.game, moves, args.workers, defaults)
+    else:
+        with open(args.positions) as handle:
+            positions = [json.loads(line) for line in handle if line.strip()]
+        results = analyze_positions(positions, args.workers, defaults)
+    try:
+        for result in results:
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
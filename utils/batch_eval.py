@@ -0,0 +1,138 @@
+"""
+Vectorized evaluation of many boards at once.
+
+Boards are encoded as 64 signed int8 piece codes (row * 8 + col), positive
+for white and negative for black, so a batch is an (N, 64) array and one
+NumPy expression scores all of it:
+    score = MATERIAL_SCALE * material + piece-square bonus
+from the perspective side's point of view. Piece-square tables are written
+for white; black pieces read them mirrored top to bottom.
+
+NumPy is optional: without it the same scores are computed board by board.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is not a hard dependency of the app
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Material counts this much per point of PIECE_WEIGHTS, leaving room for the
+# smaller piece-square bonuses
+MATERIAL_SCALE = 100
+
+PIECE_CODES = {
+    "checkers": {"W": 1, "WK": 2, "B": -1, "BK": -2},
+    "chess": {
+        "WP": 1, "WN": 2, "WB": 3, "WR": 4, "WQ": 5, "WK": 6,
+        "BP": -1, "BN": -2, "BB": -3, "BR": -4, "BQ": -5, "BK": -6,
+    },
+}
+
+# Square a black piece reads in the white piece-square table
+MIRROR = tuple((7 - sq // 8) * 8 + sq % 8 for sq in range(64))
+
+
+def _centrality(sq):
+    """0 on the edge up to 3 on the four center squares."""
+    r, c = divmod(sq, 8)
+    return 3 - int(max(abs(r - 3.5), abs(c - 3.5)))
+
+
+def _build_pst(game_type):
+    """Piece-square bonuses for white pieces, indexed [piece code][square]."""
+    if game_type == "checkers":
+        # men want to advance toward promotion, kings want the center
+        man = [(7 - sq // 8) * 4 for sq in range(64)]
+        king = [_centrality(sq) * 5 for sq in range(64)]
+        return [[0] * 64, man, king]
+
+    pawn = [(6 - sq // 8) * 6 + (8 if 2 <= sq % 8 <= 5 and 3 <= sq // 8 <= 4 else 0) for sq in range(64)]
+    for sq in range(56, 64):
+        pawn[sq] = 0
+    knight = [_centrality(sq) * 10 - 15 for sq in range(64)]
+    bishop = [_centrality(sq) * 5 - 5 for sq in range(64)]
+    rook = [10 if sq // 8 == 1 else 0 for sq in range(64)]
+    queen = [_centrality(sq) * 2 for sq in range(64)]
+    # the king is safest away from the middle of the board
+    king = [-_centrality(sq) * 10 for sq in range(64)]
+    return [[0] * 64, pawn, knight, bishop, rook, queen, king]
+
+
+def _material_table(game_type):
+    from utils.game_logic import PIECE_WEIGHTS
+
+    weights = PIECE_WEIGHTS[game_type]
+    if game_type == "checkers":
+        return [0, weights["P"], weights["K"]]
+    return [0] + [weights[kind] for kind in ("P", "N", "B", "R", "Q", "K")]
+
+
+_tables = {}
+
+
+def _get_tables(game_type):
+    """Material and piece-square tables, built once per game type."""
+    if game_type not in _tables:
+        material = _material_table(game_type)
+        pst = _build_pst(game_type)
+        if HAS_NUMPY:
+            material = np.array(material, dtype=np.int32)
+            pst = np.array(pst, dtype=np.int32)
+        _tables[game_type] = (material, pst)
+    return _tables[game_type]
+
+
+def encode_board(board, game_type):
+    """Encode an 8x8 list board as a list of 64 piece codes."""
+    codes = PIECE_CODES[game_type]
+    return [codes.get(piece, 0) for row in board for piece in row]
+
+
+def encode_boards(boards, game_type):
+    """Encode many boards as an (N, 64) int8 array (a list of lists without NumPy)."""
+    encoded = [encode_board(board, game_type) for board in boards]
+    if HAS_NUMPY:
+        return np.array(encoded, dtype=np.int8).reshape(len(encoded), 64)
+    return encoded
+
+
+def evaluate_batch(encoded, game_type, perspective="white", pst=True):
+    """
+        Score every encoded board for perspective and return a list of ints.
+        With pst=False the score is MATERIAL_SCALE times the plain material
+        difference GameLogic._evaluate_board returns.
+    """
+    material, table = _get_tables(game_type)
+    sign = 1 if perspective == "white" else -1
+    if not len(encoded):
+        return []
+    if not HAS_NUMPY:
+        return [sign * _evaluate_codes(codes, material, table, pst) for codes in encoded]
+
+    codes = np.asarray(encoded, dtype=np.int8).astype(np.int32)
+    kinds = np.abs(codes)
+    sides = np.sign(codes)
+    scores = (material[kinds] * sides).sum(axis=1) * MATERIAL_SCALE
+    if pst:
+        squares = np.where(codes > 0, np.arange(64), np.array(MIRROR))
+        scores += (table[kinds, squares] * sides).sum(axis=1)
+    return (scores * sign).tolist()
+
+
+def _evaluate_codes(codes, material, table, pst):
+    score = 0
+    for sq, code in enumerate(codes):
+        if not code:
+            continue
+        if code > 0:
+            score += material[code] * MATERIAL_SCALE + (table[code][sq] if pst else 0)
+        else:
+            score -= material[-code] * MATERIAL_SCALE + (table[-code][MIRROR[sq]] if pst else 0)
+    return score
+
+
+def evaluate_boards(boards, game_type, perspective="white", pst=True):
+    """Encode and score a list of 8x8 boards in one call."""
+    return evaluate_batch(encode_boards(boards, game_type), game_type, perspective, pst)
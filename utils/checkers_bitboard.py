@@ -0,0 +1,180 @@
+"""
+Bitboard helpers for the checkers engine.
+
+Only the 32 dark squares of a checkers board are playable, so a position fits
+in three 32-bit integers:
+    - white: every white piece (men and kings)
+    - black: every black piece (men and kings)
+    - kings: every king of either color
+
+Square numbering runs left to right, top to bottom over the playable squares:
+square = row * 4 + col // 2. Moves are generated with shift-and-mask over the
+whole bitboard instead of scanning the 64 board cells one at a time.
+"""
+
+from utils.moves import CAPTURE, GEN_ALL, GEN_CAPTURES, GEN_QUIETS, PROMOTION, TO_SHIFT, decode_move
+
+FULL = (1 << 32) - 1
+
+# (row delta, col delta) for the four diagonal directions
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = 0, 1, 2, 3
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+UP = (UP_LEFT, UP_RIGHT)
+DOWN = (DOWN_LEFT, DOWN_RIGHT)
+ALL = UP + DOWN
+
+SQUARE_TO_RC = tuple((sq // 4, (sq % 4) * 2 + (1 - (sq // 4) % 2)) for sq in range(32))
+RC_TO_SQUARE = {rc: sq for sq, rc in enumerate(SQUARE_TO_RC)}
+# 32-square index to the 64-square index (row * 8 + col) used by encoded moves
+SQUARE_TO_64 = tuple(r * 8 + c for r, c in SQUARE_TO_RC)
+
+# Row masks used for promotion checks
+TOP_ROW = sum(1 << sq for sq in range(0, 4))
+BOTTOM_ROW = sum(1 << sq for sq in range(28, 32))
+
+
+def _build_neighbors():
+    neighbors = []
+    for dr, dc in DIRECTIONS:
+        row = []
+        for r, c in SQUARE_TO_RC:
+            row.append(RC_TO_SQUARE.get((r + dr, c + dc), -1))
+        neighbors.append(tuple(row))
+    return tuple(neighbors)
+
+
+NEIGHBORS = _build_neighbors()
+
+
+def _build_step_shifts():
+    """
+        Group the squares of each direction by the index delta of their
+        neighbor. Even and odd rows shift by different amounts, so every
+        direction ends up with two (source mask, delta) pairs.
+    """
+    shifts = []
+    for direction in range(4):
+        groups = {}
+        for sq, target in enumerate(NEIGHBORS[direction]):
+            if target < 0:
+                continue
+            delta = target - sq
+            groups[delta] = groups.get(delta, 0) | (1 << sq)
+        shifts.append(tuple((mask, delta) for delta, mask in sorted(groups.items())))
+    return tuple(shifts)
+
+
+STEP_SHIFTS = _build_step_shifts()
+
+
+def _shift(bb, delta):
+    if delta > 0:
+        return (bb << delta) & FULL
+    return bb >> -delta
+
+
+def from_board(board):
+    """Build (white, black, kings) bitboards from an 8x8 list board."""
+    white = black = kings = 0
+    for sq, (r, c) in enumerate(SQUARE_TO_RC):
+        piece = board[r][c]
+        if not piece:
+            continue
+        bit = 1 << sq
+        if piece[0] == "W":
+            white |= bit
+        elif piece[0] == "B":
+            black |= bit
+        if len(piece) > 1 and piece[1] == "K":
+            kings |= bit
+    return white, black, kings
+
+
+def generate_moves(white, black, kings, color):
+    """
+        Return legal moves for color as ((r1, c1), (r2, c2)) tuples.
+        - men move and jump forward only (white up, black down)
+        - kings move and jump in all four directions
+        - jumps are single captures, matching the list backend rules
+    """
+    return [decode_move(move) for move in generate_encoded_moves(white, black, kings, color, [])]
+
+
+def generate_encoded_moves(white, black, kings, color, moves, stages=GEN_ALL):
+    """
+        Append the legal moves for color to moves as encoded ints (see
+        utils.moves), flagging jumps as captures and men reaching the far
+        row as promotions. stages picks jumps (GEN_CAPTURES), simple moves
+        (GEN_QUIETS) or both.
+    """
+    if color == "white":
+        own, opp, forward, far_row = white, black, UP, TOP_ROW
+    else:
+        own, opp, forward, far_row = black, white, DOWN, BOTTOM_ROW
+    empty = ~(white | black) & FULL
+    own_kings = own & kings
+    to_64 = SQUARE_TO_64
+    append = moves.append
+    quiets = stages & GEN_QUIETS
+    captures = stages & GEN_CAPTURES
+
+    for direction in ALL:
+        movers = own if direction in forward else own_kings
+        if not movers:
+            continue
+        steps = STEP_SHIFTS[direction]
+        for mask, delta in steps:
+            targets = _shift(movers & mask, delta) & empty if quiets else 0
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                to_sq = bit.bit_length() - 1
+                from_sq = to_sq - delta
+                flags = PROMOTION if bit & far_row and not own_kings >> from_sq & 1 else 0
+                append(to_64[from_sq] | to_64[to_sq] << TO_SHIFT | flags)
+
+            middles = _shift(movers & mask, delta) & opp if captures else 0
+            if not middles:
+                continue
+            for mask2, delta2 in steps:
+                landings = _shift(middles & mask2, delta2) & empty
+                while landings:
+                    bit = landings & -landings
+                    landings ^= bit
+                    to_sq = bit.bit_length() - 1
+                    from_sq = to_sq - delta2 - delta
+                    flags = CAPTURE
+                    if bit & far_row and not own_kings >> from_sq & 1:
+                        flags |= PROMOTION
+                    append(to_64[from_sq] | to_64[to_sq] << TO_SHIFT | flags)
+    return moves
+
+
+def apply_move(white, black, kings, from_sq, to_sq):
+    """
+        Play a move given as square indexes and return the new
+        (white, black, kings). Handles jumps and promotion; the move is
+        assumed to come from generate_moves.
+    """
+    from_bit = 1 << from_sq
+    to_bit = 1 << to_sq
+    from_row = from_sq // 4
+    to_row = to_sq // 4
+    if abs(to_row - from_row) == 2:
+        r1, c1 = SQUARE_TO_RC[from_sq]
+        r2, c2 = SQUARE_TO_RC[to_sq]
+        clear = ~(1 << RC_TO_SQUARE[((r1 + r2) // 2, (c1 + c2) // 2)])
+        white &= clear
+        black &= clear
+        kings &= clear
+    if white & from_bit:
+        white ^= from_bit | to_bit
+        promotes = to_bit & TOP_ROW
+    else:
+        black ^= from_bit | to_bit
+        promotes = to_bit & BOTTOM_ROW
+    if kings & from_bit:
+        kings ^= from_bit | to_bit
+    elif promotes:
+        kings |= to_bit
+    return white, black, kings
@@ -0,0 +1,273 @@
+"""
+Checkers endgame tablebase for the minimax AI.
+
+Every checkers position with at most max_pieces pieces (both sides still on
+the board) is solved offline by retrograde analysis under this app's rules:
+a side with no legal moves loses, and capturing the last enemy piece wins.
+The result for the side to move is stored as a single signed value:
+    value > 0: win in TABLEBASE_MAX - value plies
+    value < 0: loss in TABLEBASE_MAX + value plies
+    value == 0: draw (neither side can force a win)
+
+Files reuse the opening book layout: a small header followed by fixed-size
+records sorted by the Zobrist hash of the position (GameLogic.hash_key):
+    header: magic, version, max pieces, black-to-move key, record count
+    record: position hash (u64), value (i16)
+
+Build a table (three pieces takes a few seconds):
+    python -m utils.endgame_tablebase build --max-pieces 3 --out instance/tablebase/checkers.bin
+"""
+
+import argparse
+import itertools
+import os
+import struct
+from array import array
+
+from utils.checkers_bitboard import (
+    BOTTOM_ROW, RC_TO_SQUARE, SQUARE_TO_RC, TOP_ROW, apply_move, generate_moves
+)
+from utils.opening_book import MappedRecords
+from utils.transposition import ZOBRIST_BLACK_TO_MOVE, ZOBRIST_PIECES
+
+TABLEBASE_MAGIC = b"OCTB"
+TABLEBASE_VERSION = 1
+TABLEBASE_MAX = 1000
+DEFAULT_MAX_PIECES = 3
+
+TABLEBASE_HEADER = struct.Struct("<4sHHQI")
+TABLEBASE_RECORD = struct.Struct("<Qh")
+
+# Piece kinds a square can hold in a generated position
+_KINDS = ("W", "WK", "B", "BK")
+
+# Tablebase loaded at startup
+_tablebase = None
+
+
+def hash_position(white, black, kings, turn):
+    """Zobrist hash of a bitboard position, equal to hash_board on the same board."""
+    key = ZOBRIST_BLACK_TO_MOVE if turn == "black" else 0
+    for bits, man, king in ((white, "W", "WK"), (black, "B", "BK")):
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            r, c = SQUARE_TO_RC[bit.bit_length() - 1]
+            key ^= ZOBRIST_PIECES[king if kings & bit else man][r * 8 + c]
+    return key
+
+
+def enumerate_positions(max_pieces):
+    """
+        Yield (white, black, kings) for every placement of 2..max_pieces
+        pieces with both colors present. Men never stand on the row they
+        would have promoted on.
+    """
+    for count in range(2, max_pieces + 1):
+        for squares in itertools.combinations(range(32), count):
+            for kinds in itertools.product(_KINDS, repeat=count):
+                white = black = kings = 0
+                for sq, kind in zip(squares, kinds):
+                    bit = 1 << sq
+                    if kind == "W" and bit & TOP_ROW or kind == "B" and bit & BOTTOM_ROW:
+                        break
+                    if kind[0] == "W":
+                        white |= bit
+                    else:
+                        black |= bit
+                    if len(kind) > 1:
+                        kings |= bit
+                else:
+                    if white and black:
+                        yield white, black, kings
+
+
+def solve(max_pieces=DEFAULT_MAX_PIECES):
+    """
+        Solve every position up to max_pieces and return
+        [(white, black, kings, turn, value), ...].
+
+        Retrograde analysis, level by level in plies to mate:
+            level 0: side to move has no legal moves (loss)
+            level 1: side to move can capture the last enemy piece (win)
+            level n + 1:
+                - a predecessor of a loss in n is a win in n + 1
+                - a position whose successors are all wins is a loss
+                  in 1 + the longest of them
+            anything never reached is a draw
+    """
+    placements = list(enumerate_positions(max_pieces))
+    index = {placement: i for i, placement in enumerate(placements)}
+    total = len(placements) * 2  # node = placement * 2 + (1 if black to move)
+
+    # forward edges, flattened: successors of node n are succ[offsets[n]:offsets[n + 1]]
+    offsets = array("l", [0])
+    succ = array("l")
+    value = array("h", [0]) * total
+    resolved = bytearray(total)
+    levels = [[], []]
+    for i, (white, black, kings) in enumerate(placements):
+        for turn_bit, color in ((0, "white"), (1, "black")):
+            node = i * 2 + turn_bit
+            moves = generate_moves(white, black, kings, color)
+            if not moves:
+                value[node] = -TABLEBASE_MAX
+                resolved[node] = 1
+                levels[0].append(node)
+            for start, end in moves:
+                w2, b2, k2 = apply_move(white, black, kings, RC_TO_SQUARE[start], RC_TO_SQUARE[end])
+                if not (b2 if turn_bit == 0 else w2):
+                    if not resolved[node]:
+                        value[node] = TABLEBASE_MAX - 1
+                        resolved[node] = 1
+                        levels[1].append(node)
+                    continue
+                succ.append(index[(w2, b2, k2)] * 2 + 1 - turn_bit)
+            offsets.append(len(succ))
+
+    # reverse edges, built the same way with a counting pass
+    pred_offsets = array("l", [0]) * (total + 1)
+    for target in succ:
+        pred_offsets[target + 1] += 1
+    for node in range(total):
+        pred_offsets[node + 1] += pred_offsets[node]
+    fill = array("l", pred_offsets)
+    pred = array("l", [0]) * len(succ)
+    for node in range(total):
+        for k in range(offsets[node], offsets[node + 1]):
+            target = succ[k]
+            pred[fill[target]] = node
+            fill[target] += 1
+    remaining = array("l", (offsets[n + 1] - offsets[n] for n in range(total)))
+
+    level = 0
+    while level < len(levels):
+        for node in levels[level]:
+            is_loss = value[node] < 0
+            for k in range(pred_offsets[node], pred_offsets[node + 1]):
+                parent = pred[k]
+                if resolved[parent]:
+                    continue
+                if is_loss:
+                    value[parent] = TABLEBASE_MAX - (level + 1)
+                else:
+                    remaining[parent] -= 1
+                    if remaining[parent]:
+                        continue
+                    value[parent] = -(TABLEBASE_MAX - (level + 1))
+                resolved[parent] = 1
+                if len(levels) == level + 1:
+                    levels.append([])
+                levels[level + 1].append(parent)
+        level += 1
+
+    return [
+        (white, black, kings, color, value[i * 2 + turn_bit])
+        for i, (white, black, kings) in enumerate(placements)
+        for turn_bit, color in ((0, "white"), (1, "black"))
+    ]
+
+
+def write_tablebase(path, max_pieces=DEFAULT_MAX_PIECES):
+    """Solve up to max_pieces and write the table to path; returns the record count."""
+    records = sorted(
+        (hash_position(white, black, kings, turn), result)
+        for white, black, kings, turn, result in solve(max_pieces)
+    )
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(TABLEBASE_HEADER.pack(
+            TABLEBASE_MAGIC, TABLEBASE_VERSION, max_pieces, ZOBRIST_BLACK_TO_MOVE, len(records)
+        ))
+        for record in records:
+            handle.write(TABLEBASE_RECORD.pack(*record))
+    return len(records)
+
+
+class EndgameTablebase:
+    """A memory-mapped tablebase file."""
+
+    def __init__(self, path):
+        self._records = MappedRecords(path, TABLEBASE_HEADER, TABLEBASE_RECORD)
+        magic, version, max_pieces, zobrist_check, _ = self._records.header
+        if magic != TABLEBASE_MAGIC or version != TABLEBASE_VERSION:
+            self._records.close()
+            raise ValueError(f"{path} is not an endgame tablebase")
+        if zobrist_check != ZOBRIST_BLACK_TO_MOVE:
+            self._records.close()
+            raise ValueError(f"{path} was built with different Zobrist keys")
+        self.max_pieces = max_pieces
+
+    def __len__(self):
+        return self._records.count
+
+    def probe(self, position_hash):
+        """Return the stored value for a position hash, or None if it is not in the table."""
+        records = self._records.find(position_hash)
+        return records[0][1] if records else None
+
+    def close(self):
+        self._records.close()
+
+
+def distance(result):
+    """Plies to the end of the game for a win or loss value (None for a draw)."""
+    if result == 0:
+        return None
+    return TABLEBASE_MAX - abs(result)
+
+
+def load_tablebase(path):
+    """Map the tablebase at path for the AI search, or return None if it is missing or invalid."""
+    global _tablebase
+    close_tablebase()
+    if not os.path.exists(path):
+        return None
+    try:
+        _tablebase = EndgameTablebase(path)
+    except (OSError, ValueError, struct.error) as exc:
+        print(f"Skipping endgame tablebase {path}: {exc}")
+    return _tablebase
+
+
+def get_tablebase():
+    return _tablebase
+
+
+def close_tablebase():
+    global _tablebase
+    if _tablebase is not None:
+        _tablebase.close()
+    _tablebase = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the checkers endgame tablebase.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="solve endgames and write a table")
+    build.add_argument("--out", required=True)
+    build.add_argument("--max-pieces", type=int, default=DEFAULT_MAX_PIECES,
+                       help="largest total piece count to solve")
+
+    info = commands.add_parser("info", help="print a table's summary")
+    info.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.command == "info":
+        table = EndgameTablebase(args.path)
+        print(f"{args.path}: up to {table.max_pieces} pieces, {len(table)} positions")
+        table.close()
+        return 0
+
+    if args.max_pieces < 2:
+        parser.error("--max-pieces must be at least 2")
+    written = write_tablebase(args.out, args.max_pieces)
+    print(f"Wrote {written} positions to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
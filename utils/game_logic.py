@@ -8,6 +8,180 @@ Handles the core game logic for Chess and Checkers.
 """
 
 import random
+import time
+from collections import namedtuple
+
+from utils import (
+    batch_eval, checkers_bitboard, endgame_tablebase, move_cache, opening_book, parallel_search, ponder,
+    search_stats
+)
+from utils.moves import (
+    CAPTURE, GEN_ALL, GEN_CAPTURES, GEN_QUIETS, KEY_MASK, PROMOTION, SQUARE_MASK, SQUARE_RC, TO_SHIFT,
+    decode_move, encode_move, new_move_list
+)
+from utils.transposition import (
+    EXACT, LOWER, UPPER, TranspositionTable, ZOBRIST_BLACK_TO_MOVE, ZOBRIST_PIECES, hash_board
+)
+
+
+# Checkers defaults to the bitboard backend; "list" keeps the original
+# per-square implementation around as a reference.
+BACKENDS = ("list", "bitboard")
+DEFAULT_CHECKERS_BACKEND = "bitboard"
+
+# Everything unmake_move needs to take a move back: the moved piece, what it
+# captured and where, whether it promoted, and the turn/winner before the move.
+MoveUndo = namedtuple(
+    "MoveUndo",
+    [
+        "start", "end", "piece", "captured_at", "captured_piece", "promoted",
+        "turn", "winner", "bitboards", "hash_key",
+    ],
+)
+
+# Score for a won position, from the winner's point of view
+INF = 10**9
+
+# Score for a tablebase win
+TB_WIN = INF // 2
+
+# Scores beyond WIN_SCORE are decided games: INF or TB_WIN less the plies
+# from the root to the end of the game, so the search prefers faster wins
+# and slower losses. The transposition table keeps them counted from the
+# entry's own position instead, since it can be reached at any ply.
+WIN_SCORE = TB_WIN // 2
+
+# Hard depth caps for make_ai_move, for fixed-depth searches and for
+# iterative deepening under a time/node budget
+MAX_AI_DEPTH = {"checkers": 6, "chess": 4}
+MAX_BUDGET_DEPTH = {"checkers": 12, "chess": 6}
+
+# The "hard" AI always deepens against a clock; this is its budget when the
+# caller gives none
+HARD_TIME_MS = {"checkers": 1000, "chess": 1000}
+
+# Principal variation search settings for the "hard" AI:
+# - root window half-width around the last iteration's score
+# - null-move depth reduction and the shallowest depth it is tried at
+# - late move reductions start at this depth and move index
+ASPIRATION_WINDOW = {"checkers": 1, "chess": 1}
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+LMR_MIN_DEPTH = 3
+LMR_MIN_INDEX = 3
+# Checkers endgames are decided by zugzwang, so a side needs this many
+# pieces before it may pass in a null-move search
+NULL_MOVE_MIN_CHECKERS_PIECES = 6
+
+# Deepest ply that keeps killer moves
+MAX_PLY = 64
+
+# Material weights used by the AI evaluation
+PIECE_WEIGHTS = {
+    "checkers": {"P": 1, "K": 2},
+    "chess": {"P": 1, "N": 3, "B": 3, "R": 5, "Q": 9, "K": 200},
+}
+
+# Most a single capture can swing the evaluation beyond the victim's value
+# (a checkers man promoting as it jumps); used for delta pruning
+DELTA_MARGIN = {"checkers": PIECE_WEIGHTS["checkers"]["K"] - PIECE_WEIGHTS["checkers"]["P"], "chess": 0}
+
+
+# Precomputed chess move tables, indexed by square = row * 8 + col.
+# Target lists keep the order the old per-delta loops produced.
+def _in_board(row, col):
+    return 0 <= row < 8 and 0 <= col < 8
+
+
+def _build_target_table(deltas):
+    table = []
+    for square in range(64):
+        r, c = divmod(square, 8)
+        table.append(tuple((r + dr, c + dc) for dr, dc in deltas if _in_board(r + dr, c + dc)))
+    return tuple(table)
+
+
+def _build_ray_table(deltas):
+    """For each square, one tuple of squares per direction, nearest first."""
+    table = []
+    for square in range(64):
+        r, c = divmod(square, 8)
+        rays = []
+        for dr, dc in deltas:
+            ray = []
+            r1, c1 = r + dr, c + dc
+            while _in_board(r1, c1):
+                ray.append((r1, c1))
+                r1 += dr
+                c1 += dc
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+
+def _build_pawn_tables(side):
+    direction = -1 if side == "W" else 1
+    start_row = 6 if side == "W" else 1
+    pushes, captures = [], []
+    for square in range(64):
+        r, c = divmod(square, 8)
+        push = []
+        if _in_board(r + direction, c):
+            push.append((r + direction, c))
+            if r == start_row:
+                push.append((r + 2 * direction, c))
+        pushes.append(tuple(push))
+        captures.append(tuple(
+            (r + direction, c + dc) for dc in (-1, 1) if _in_board(r + direction, c + dc)
+        ))
+    return tuple(pushes), tuple(captures)
+
+
+DIAGONALS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+ORTHOGONALS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+KNIGHT_TARGETS = _build_target_table(
+    ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+)
+KING_TARGETS = _build_target_table(
+    tuple((dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+)
+SLIDER_RAYS = {
+    "B": _build_ray_table(DIAGONALS),
+    "R": _build_ray_table(ORTHOGONALS),
+    "Q": _build_ray_table(DIAGONALS + ORTHOGONALS),
+}
+PAWN_PUSHES, PAWN_CAPTURES = {}, {}
+for _side in ("W", "B"):
+    PAWN_PUSHES[_side], PAWN_CAPTURES[_side] = _build_pawn_tables(_side)
+
+
+def _piece_type(piece):
+    # checkers men have no type letter, so treat them like pawns
+    return piece[1] if len(piece) > 1 else "P"
+
+
+def _score_to_tt(score, ply):
+    """A score searched at ply, counted from that node for the transposition table."""
+    if score > WIN_SCORE:
+        return score + ply
+    if score < -WIN_SCORE:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    """A transposition table score, counted from the root again for a node at ply."""
+    if score > WIN_SCORE:
+        return score - ply
+    if score < -WIN_SCORE:
+        return score + ply
+    return score
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when its time or node budget is used up."""
 
 
 class GameLogic:
@@ -22,15 +196,79 @@ class GameLogic:
     
     """
     # Function to initialize the game logic with a specified game type
-    def __init__(self, game_type="checkers"):
+    def __init__(self, game_type="checkers", backend=None):
         # store the game type (checkers or chess)
         self.game_type = game_type
+        # pick the move generation backend (bitboards are checkers only)
+        self.backend = self._resolve_backend(backend)
         # initialize the board based on the game type and set the turn to white
         # and black and winner to none
         self.board = self.initialize_board()
         self.turn = "white" # white starts first 
         self.winner = None
-        
+        self._tt = None
+        self._killers = [[None, None] for _ in range(MAX_PLY)]
+        self._history = {}
+        self._nodes = 0
+        self._cutoffs = 0
+        self._tt_hits = 0
+        self._tablebase_hits = 0
+        self._depth_reached = 0
+        self._root_score = None
+        self._limits = None
+        self._search_started = 0.0
+        self._tablebase = None
+        # statistics of the last AI move (see _select_ai_move)
+        self.last_search = None
+        # (hash_key, color, legal move keys) of the last legality check
+        self._legal_cache = None
+        # set from another thread to end a budgeted search early
+        self._stop_requested = False
+        # background search of the opponent's predicted reply (utils.ponder)
+        self._ponder = None
+        self._sync_state()
+
+    def _resolve_backend(self, backend):
+        if backend is None:
+            return DEFAULT_CHECKERS_BACKEND if self.game_type == "checkers" else "list"
+        if backend not in BACKENDS:
+            raise ValueError("invalid backend")
+        if backend == "bitboard" and self.game_type != "checkers":
+            raise ValueError("bitboard backend only supports checkers")
+        return backend
+
+    def _sync_state(self):
+        """
+            Rebuild derived engine state from self.board.
+            The board list stays the source of truth for the routes and for
+            callers that set up a position by assigning a new board, which
+            public entry points pick up through _sync_if_replaced. A caller
+            that edits the current board list in place calls this itself.
+        """
+        self._synced_board = self.board
+        if self.backend == "bitboard":
+            self._white, self._black, self._kings = checkers_bitboard.from_board(self.board)
+        self.hash_key = hash_board(self.board, self.turn)
+
+        # running piece counts, material and piece lists per color
+        weights = self._weights = PIECE_WEIGHTS[self.game_type]
+        self.piece_counts = {"white": 0, "black": 0}
+        self.material = {"white": 0, "black": 0}
+        self.piece_squares = {"white": set(), "black": set()}
+        for r, row in enumerate(self.board):
+            for c, piece in enumerate(row):
+                color = self._piece_color(piece)
+                if color is None:
+                    continue
+                self.piece_counts[color] += 1
+                self.material[color] += weights[_piece_type(piece)]
+                self.piece_squares[color].add((r, c))
+
+    def _sync_if_replaced(self):
+        """Rebuild the derived state only if self.board was assigned a new list since the last sync."""
+        if self.board is not self._synced_board:
+            self._sync_state()
+
     # function to initialize the board based on the game type
     def initialize_board(self):
         if self.game_type == "checkers":
@@ -92,27 +330,14 @@ class GameLogic:
         # return the opposite color
         return "black" if color == "white" else "white"
 
-    def _clone(self):
-        """" 
-            psudo code:
-                - Create a new GameLogic instance with the same game type
-                - Deep copy the board state to the new instance
-                - Copy the current turn and winner status to the new instance
-                - Return the new instance as a clone of the current game state
-        """
-        clone = GameLogic(self.game_type)
-        clone.board = [row[:] for row in self.board]
-        clone.turn = self.turn
-        clone.winner = self.winner
-        return clone
-
-    def _checkers_moves_for_piece(self, start, piece):
+    def _add_checkers_moves(self, start, piece, moves, stages=GEN_ALL):
         """ 
             - Get legal moves for a checkers piece at a given position.
             - Handles normal moves and captures.
             - For kings, allows backward moves and forward moves
             - for regular pieces, only allows forward moves based on color
-            - Returns a list of legal moves in the format 
+            - Appends the moves to moves as encoded ints (see utils.moves)
+            - stages picks captures (GEN_CAPTURES), normal moves (GEN_QUIETS) or both
         """
         # Get the row and column from the start position
         r, c = start
@@ -126,150 +351,247 @@ class GameLogic:
             directions = (-1, 1)
         else:
             directions = (-1,) if color == "white" else (1,)
-        moves = [] # set up an empty list to store legal moves
+        # men landing on this row promote
+        far_row = -1 if is_king else (0 if color == "white" else 7)
+        origin = r * 8 + c
         # nested loop through possible move directions
         for dr in directions:
             for dc in (-1, 1):
                 # Calculate the target position for a normal move
                 r1, c1 = r + dr, c + dc
-                if self._in_bounds(r1, c1) and not self.board[r1][c1]:
-                    moves.append((start, (r1, c1)))
+                if stages & GEN_QUIETS and self._in_bounds(r1, c1) and not self.board[r1][c1]:
+                    flags = PROMOTION if r1 == far_row else 0
+                    moves.append(origin | (r1 * 8 + c1) << TO_SHIFT | flags)
 
                 r2, c2 = r + (2 * dr), c + (2 * dc)
-                if not self._in_bounds(r2, c2):
+                if not stages & GEN_CAPTURES or not self._in_bounds(r2, c2):
                     continue
                 middle = self.board[r + dr][c + dc]
                 if middle and self._piece_color(middle) == self._opponent(color) and not self.board[r2][c2]:
-                    moves.append((start, (r2, c2)))
+                    flags = CAPTURE | (PROMOTION if r2 == far_row else 0)
+                    moves.append(origin | (r2 * 8 + c2) << TO_SHIFT | flags)
 
         return moves
 
-    def _add_slide_moves(self, start, color, deltas, moves):
-        r, c = start
-        for dr, dc in deltas:
-            r1, c1 = r + dr, c + dc
-            while self._in_bounds(r1, c1):
-                target = self.board[r1][c1]
-                if not target:
-                    moves.append((start, (r1, c1)))
-                else:
-                    if self._piece_color(target) != color:
-                        moves.append((start, (r1, c1)))
-                    break
-                r1 += dr
-                c1 += dc
-
     def _chess_moves_for_piece(self, start, piece):
+        """Pseudo-legal moves for a chess piece as ((r1, c1), (r2, c2)) tuples."""
+        return [decode_move(move) for move in self._add_chess_moves(start, piece, new_move_list())]
+
+    def _add_chess_moves(self, start, piece, moves, stages=GEN_ALL):
+        """
+            Append pseudo-legal chess moves for one piece to moves as encoded
+            ints, read straight from the precomputed target and ray tables
+            (indexed by row * 8 + col). stages picks captures (GEN_CAPTURES),
+            quiet moves (GEN_QUIETS) or both.
+        """
         r, c = start
-        color = self._piece_color(piece)
+        square = r * 8 + c
+        board = self.board
+        side = piece[0]
         piece_type = piece[1]
-        moves = []
+        append = moves.append
+        quiets = stages & GEN_QUIETS
+        captures = stages & GEN_CAPTURES
 
         if piece_type == "P":
-            direction = -1 if color == "white" else 1
-            start_row = 6 if color == "white" else 1
-            r1 = r + direction
-            if self._in_bounds(r1, c) and not self.board[r1][c]:
-                moves.append((start, (r1, c)))
-                r2 = r + (2 * direction)
-                if r == start_row and self._in_bounds(r2, c) and not self.board[r2][c]:
-                    moves.append((start, (r2, c)))
-            for dc in (-1, 1):
-                rc, cc = r + direction, c + dc
-                if not self._in_bounds(rc, cc):
-                    continue
-                target = self.board[rc][cc]
-                if target and self._piece_color(target) == self._opponent(color):
-                    moves.append((start, (rc, cc)))
-
-        elif piece_type == "N":
-            jumps = [
-                (-2, -1), (-2, 1),
-                (-1, -2), (-1, 2),
-                (1, -2), (1, 2),
-                (2, -1), (2, 1),
-            ]
-            for dr, dc in jumps:
-                r1, c1 = r + dr, c + dc
-                if not self._in_bounds(r1, c1):
-                    continue
-                target = self.board[r1][c1]
-                if not target or self._piece_color(target) != color:
-                    moves.append((start, (r1, c1)))
-
-        elif piece_type == "B":
-            self._add_slide_moves(start, color, [(-1, -1), (-1, 1), (1, -1), (1, 1)], moves)
-
-        elif piece_type == "R":
-            self._add_slide_moves(start, color, [(-1, 0), (1, 0), (0, -1), (0, 1)], moves)
-
-        elif piece_type == "Q":
-            self._add_slide_moves(
-                start,
-                color,
-                [(-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)],
-                moves
-            )
+            pushes = PAWN_PUSHES[side][square]
+            if quiets and pushes and not board[pushes[0][0]][pushes[0][1]]:
+                append(square | (pushes[0][0] * 8 + pushes[0][1]) << TO_SHIFT)
+                if len(pushes) > 1 and not board[pushes[1][0]][pushes[1][1]]:
+                    append(square | (pushes[1][0] * 8 + pushes[1][1]) << TO_SHIFT)
+            if captures:
+                for tr, tc in PAWN_CAPTURES[side][square]:
+                    occupant = board[tr][tc]
+                    if occupant and occupant[0] != side:
+                        append(square | (tr * 8 + tc) << TO_SHIFT | CAPTURE)
 
-        elif piece_type == "K":
-            for dr in (-1, 0, 1):
-                for dc in (-1, 0, 1):
-                    if dr == 0 and dc == 0:
+        elif piece_type == "N" or piece_type == "K":
+            targets = KNIGHT_TARGETS if piece_type == "N" else KING_TARGETS
+            for tr, tc in targets[square]:
+                occupant = board[tr][tc]
+                if not occupant:
+                    if quiets:
+                        append(square | (tr * 8 + tc) << TO_SHIFT)
+                elif captures and occupant[0] != side:
+                    append(square | (tr * 8 + tc) << TO_SHIFT | CAPTURE)
+
+        else:
+            for ray in SLIDER_RAYS[piece_type][square]:
+                for tr, tc in ray:
+                    occupant = board[tr][tc]
+                    if not occupant:
+                        if quiets:
+                            append(square | (tr * 8 + tc) << TO_SHIFT)
                         continue
-                    r1, c1 = r + dr, c + dc
-                    if not self._in_bounds(r1, c1):
+                    if captures and occupant[0] != side:
+                        append(square | (tr * 8 + tc) << TO_SHIFT | CAPTURE)
+                    break
+
+        return moves
+
+    def _attackers(self, square, side):
+        """
+            Yield the squares of side's ("W" or "B") chess pieces attacking
+            square, found by looking outward from it through the move tables.
+        """
+        board = self.board
+        index = square[0] * 8 + square[1]
+        for kind, targets in (("N", KNIGHT_TARGETS), ("K", KING_TARGETS)):
+            piece = side + kind
+            for tr, tc in targets[index]:
+                if board[tr][tc] == piece:
+                    yield tr, tc
+        # a pawn attacks square from where the other side's pawn would capture
+        pawn = side + "P"
+        for tr, tc in PAWN_CAPTURES["B" if side == "W" else "W"][index]:
+            if board[tr][tc] == pawn:
+                yield tr, tc
+        for kind in ("B", "R"):
+            for ray in SLIDER_RAYS[kind][index]:
+                for tr, tc in ray:
+                    occupant = board[tr][tc]
+                    if occupant:
+                        if occupant[0] == side and occupant[1] in (kind, "Q"):
+                            yield tr, tc
+                        break
+
+    def _king_square(self, color):
+        king = "WK" if color == "white" else "BK"
+        board = self.board
+        for r, c in self.piece_squares[color]:
+            if board[r][c] == king:
+                return r, c
+        return None
+
+    def _in_check(self, color):
+        """Whether color's chess king is attacked."""
+        king = self._king_square(color)
+        if king is None:
+            return False
+        return next(self._attackers(king, "B" if color == "white" else "W"), None) is not None
+
+    def _pinned_pieces(self, king, side):
+        """
+            Map each of side's pieces pinned to its king to the squares it may
+            still move to: the pin ray up to and including the pinning piece.
+        """
+        board = self.board
+        pins = {}
+        for kind in ("B", "R"):
+            for ray in SLIDER_RAYS[kind][king[0] * 8 + king[1]]:
+                blocker = None
+                for step, (tr, tc) in enumerate(ray):
+                    occupant = board[tr][tc]
+                    if not occupant:
+                        continue
+                    if blocker is None and occupant[0] == side:
+                        blocker = (tr, tc)
                         continue
-                    target = self.board[r1][c1]
-                    if not target or self._piece_color(target) != color:
-                        moves.append((start, (r1, c1)))
+                    if blocker is not None and occupant[0] != side and occupant[1] in (kind, "Q"):
+                        pins[blocker] = {r * 8 + c for r, c in ray[:step + 1]}
+                    break
+        return pins
+
+    def _check_block_squares(self, king, checker):
+        """Squares that end a single check: taking the checker or blocking its ray."""
+        squares = {checker[0] * 8 + checker[1]}
+        for ray in SLIDER_RAYS["Q"][king[0] * 8 + king[1]]:
+            if checker in ray:
+                squares.update(r * 8 + c for r, c in ray[:ray.index(checker)])
+                break
+        return squares
+
+    def _add_legal_chess_moves(self, color, moves, stages=GEN_ALL):
+        """
+            Append color's legal chess moves (of the given stages) to moves,
+            in board-scan order.
+            psudo code:
+                - find the pieces giving check and the pieces pinned to the king
+                - king moves only to squares no enemy piece attacks
+                - in double check only the king may move
+                - in single check other pieces must take the checker or block it
+                - pinned pieces stay on their pin ray
+        """
+        board = self.board
+        side = "W" if color == "white" else "B"
+        enemy = "B" if side == "W" else "W"
+        squares = sorted(self.piece_squares[color])
+        king = self._king_square(color)
+        if king is None:
+            # a board set up without a king has nothing to keep safe
+            for square in squares:
+                self._add_chess_moves(square, board[square[0]][square[1]], moves, stages)
+            return moves
 
+        checkers = list(self._attackers(king, enemy))
+        block = None
+        if len(checkers) == 1:
+            block = self._check_block_squares(king, checkers[0])
+        elif checkers:
+            block = set()
+        pins = self._pinned_pieces(king, side)
+
+        buffer = new_move_list()
+        for square in squares:
+            piece = board[square[0]][square[1]]
+            if square == king:
+                self._add_chess_moves(square, piece, buffer, stages)
+                # look through the king's square so it cannot step back along a checking ray
+                board[king[0]][king[1]] = ""
+                for move in buffer:
+                    target = SQUARE_RC[move >> TO_SHIFT & SQUARE_MASK]
+                    if next(self._attackers(target, enemy), None) is None:
+                        moves.append(move)
+                board[king[0]][king[1]] = piece
+                del buffer[:]
+                continue
+            allowed = pins.get(square)
+            if block is not None:
+                allowed = block if allowed is None else allowed & block
+            if allowed is None:
+                self._add_chess_moves(square, piece, moves, stages)
+            elif allowed:
+                self._add_chess_moves(square, piece, buffer, stages)
+                moves.extend(move for move in buffer if move >> TO_SHIFT & SQUARE_MASK in allowed)
+                del buffer[:]
         return moves
 
-    def _legal_moves_for_piece(self, start):
-        r, c = start
-        if not self._in_bounds(r, c):
-            return []
-        piece = self.board[r][c]
-        if not piece:
-            return []
-        if self.game_type == "checkers":
-            return self._checkers_moves_for_piece(start, piece)
+    def _generate_moves(self, color, stages=GEN_ALL):
+        """
+            Generate encoded moves (a new array("H"), see utils.moves) for
+            color from the engine state: captures (GEN_CAPTURES), quiet moves
+            (GEN_QUIETS) or both.
+        """
+        moves = new_move_list()
+        if self.backend == "bitboard":
+            return checkers_bitboard.generate_encoded_moves(
+                self._white, self._black, self._kings, color, moves, stages
+            )
         if self.game_type == "chess":
-            return self._chess_moves_for_piece(start, piece)
-        return []
+            return self._add_legal_chess_moves(color, moves, stages)
+        board = self.board
+        # sorted so moves come out in board-scan order
+        for square in sorted(self.piece_squares[color]):
+            self._add_checkers_moves(square, board[square[0]][square[1]], moves, stages)
+        return moves
 
     def get_legal_moves(self, color=None):
+        """Legal moves for color (default: side to move) as ((r1, c1), (r2, c2)) tuples."""
         color = color or self.turn
-        moves = []
-        for r in range(8):
-            for c in range(8):
-                piece = self.board[r][c]
-                if not piece:
-                    continue
-                if self._piece_color(piece) != color:
-                    continue
-                moves.extend(self._legal_moves_for_piece((r, c)))
-        return moves
+        self._sync_if_replaced()
+        return [decode_move(move) for move in self._generate_moves(color)]
 
-    def _is_capture_move(self, board, start, end, piece):
-        r1, c1 = start
-        r2, c2 = end
-        color = self._piece_color(piece)
-        if self.game_type == "checkers":
-            if abs(r2 - r1) == 2 and abs(c2 - c1) == 2:
-                mid_r = (r1 + r2) // 2
-                mid_c = (c1 + c2) // 2
-                middle = board[mid_r][mid_c]
-                return middle and self._piece_color(middle) == self._opponent(color)
-            return False
-        target = board[r2][c2]
-        return bool(target) and self._piece_color(target) == self._opponent(color)
+    def _legal_move_keys(self, color):
+        """Set of encoded (from, to) keys of color's legal moves, cached until the position changes."""
+        cached = self._legal_cache
+        if cached is not None and cached[0] == self.hash_key and cached[1] == color:
+            return cached[2]
+        keys = {move & KEY_MASK for move in self._generate_moves(color)}
+        self._legal_cache = (self.hash_key, color, keys)
+        return keys
 
     def _evaluate_board(self, board, perspective):
-        if self.game_type == "checkers":
-            weights = {"P": 1, "K": 2}
-        else:
-            weights = {"P": 1, "N": 3, "B": 3, "R": 5, "Q": 9, "K": 200}
+        weights = PIECE_WEIGHTS[self.game_type]
 
         score = 0
         for row in board:
@@ -282,67 +604,782 @@ class GameLogic:
                 score += value if color == perspective else -value
         return score
 
-    def _minimax(self, depth, maximizing_color, alpha, beta):
-        INF = 10**9
+    def _evaluate(self, perspective):
+        """Score the current position from the running material totals."""
+        material = self.material
+        if perspective == "white":
+            return material["white"] - material["black"]
+        return material["black"] - material["white"]
+
+    def to_state(self):
+        """Plain, picklable snapshot of the position (for worker processes)."""
+        return {
+            "game_type": self.game_type,
+            "backend": self.backend,
+            "board": [row[:] for row in self.board],
+            "turn": self.turn,
+            "winner": self.winner,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a GameLogic from a to_state() snapshot."""
+        game = cls(state["game_type"], state.get("backend"))
+        game.board = [row[:] for row in state["board"]]
+        game.turn = state.get("turn", "white")
+        game.winner = state.get("winner")
+        game._sync_state()
+        return game
+
+    def _transposition_table(self):
+        # created on first search so plain PvP games don't pay for it
+        if self._tt is None:
+            self._tt = TranspositionTable()
+        return self._tt
+
+    def _count_node(self):
+        """Count a searched node and stop the search once its budget is spent."""
+        self._nodes += 1
+        if self._limits is None:
+            return
+        max_nodes, deadline = self._limits
+        if self._stop_requested or max_nodes is not None and self._nodes > max_nodes:
+            raise SearchAborted()
+        if deadline is not None and not self._nodes & 127 and time.perf_counter() > deadline:
+            raise SearchAborted()
+
+    def _order_moves(self, moves, tt_move, ply):
+        """
+            Return the encoded moves sorted so alpha-beta sees the likely best
+            ones first:
+            - the transposition table move
+            - captures, most valuable victim first, then least valuable attacker
+            - killer moves that caused a cutoff at this ply
+            - quiet moves by history score
+        """
+        board = self.board
+        weights = PIECE_WEIGHTS[self.game_type]
+        checkers = self.game_type == "checkers"
+        killers = self._killers[ply] if ply < MAX_PLY else ()
+        history = self._history
+
+        def score(move):
+            if move == tt_move:
+                return 1 << 40
+            if move & CAPTURE:
+                from_sq = move & SQUARE_MASK
+                to_sq = move >> TO_SHIFT & SQUARE_MASK
+                # a checkers jump takes the piece on the square between
+                victim_sq = (from_sq + to_sq) >> 1 if checkers else to_sq
+                victim = board[victim_sq >> 3][victim_sq & 7]
+                attacker = board[from_sq >> 3][from_sq & 7]
+                return (1 << 39) + weights[_piece_type(victim)] * 256 - weights[_piece_type(attacker)]
+            if move == killers[0]:
+                return 1 << 38
+            if move == killers[1]:
+                return (1 << 38) - 1
+            return history.get(move, 0)
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _staged_moves(self, tt_move, ply):
+        """
+            Yield the side to move's legal moves in _order_moves order, one
+            stage at a time:
+            - the transposition table move, if it is legal here
+            - captures, most valuable victim first
+            - killer moves that caused a cutoff at this ply
+            - the remaining quiet moves by history score
+            Each stage is generated only when the search gets to it, so a
+            cutoff early on skips the work for the stages after it.
+        """
+        color = self.turn
+        tried = []
+        if tt_move is not None:
+            move = self._legal_move(tt_move, color)
+            if move is not None:
+                tried.append(move)
+                yield move
+
+        captures = self._generate_moves(color, GEN_CAPTURES)
+        if captures:
+            for move in self._order_moves(captures, None, ply):
+                if move not in tried:
+                    yield move
+
+        for killer in tuple(self._killers[ply]) if ply < MAX_PLY else ():
+            if killer is None:
+                continue
+            move = self._legal_move(killer, color)
+            if move is not None and not move & CAPTURE and move not in tried:
+                tried.append(move)
+                yield move
+
+        history = self._history
+        quiets = self._generate_moves(color, GEN_QUIETS)
+        for move in sorted(quiets, key=lambda move: history.get(move, 0), reverse=True):
+            if move not in tried:
+                yield move
+
+    def _legal_move(self, move, color):
+        """
+            This position's encoding of move's from and to squares if that is
+            a legal move for color, else None. Checks a transposition table or
+            killer move without generating every move.
+        """
+        r, c = SQUARE_RC[move & SQUARE_MASK]
+        piece = self.board[r][c]
+        if not piece or self._piece_color(piece) != color:
+            return None
+        key = move & KEY_MASK
+        if self.game_type == "checkers":
+            candidates = self._add_checkers_moves((r, c), piece, new_move_list())
+        else:
+            candidates = self._add_chess_moves((r, c), piece, new_move_list())
+        for candidate in candidates:
+            if candidate & KEY_MASK != key:
+                continue
+            if self.game_type == "chess" and self._king_square(color) is not None:
+                # pseudo-legal: make sure it does not leave the king in check
+                undo = self._make_move(candidate)
+                in_check = self._in_check(color)
+                self.unmake_move(undo)
+                if in_check:
+                    return None
+            return candidate
+        return None
+
+    def _record_cutoff(self, move, depth, ply):
+        """Count a beta cutoff and remember the move if it was quiet."""
+        self._cutoffs += 1
+        if move & CAPTURE:
+            return
+        self._history[move] = self._history.get(move, 0) + depth * depth
+        if ply < MAX_PLY:
+            killers = self._killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+
+    def _reset_move_ordering(self):
+        """Clear killers and age the history table before a new AI move."""
+        self._killers = [[None, None] for _ in range(MAX_PLY)]
+        self._history = {move: score // 2 for move, score in self._history.items() if score > 1}
+
+    def _reset_search_stats(self):
+        self._nodes = 0
+        self._cutoffs = 0
+        self._tt_hits = 0
+        self._tablebase_hits = 0
+        self._depth_reached = 0
+        self._root_score = None
+
+    def _search_counters(self):
+        return (self._nodes, self._cutoffs, self._tt_hits, self._tablebase_hits)
+
+    def _add_search_counters(self, counters):
+        nodes, cutoffs, tt_hits, tablebase_hits = counters
+        self._nodes += nodes
+        self._cutoffs += cutoffs
+        self._tt_hits += tt_hits
+        self._tablebase_hits += tablebase_hits
+
+    def _prepare_search(self):
+        """Reset per-search state before the AI starts thinking about a move."""
+        self._transposition_table().new_search()
+        self._reset_move_ordering()
+        self._search_started = time.perf_counter()
+        self._tablebase = endgame_tablebase.get_tablebase() if self.game_type == "checkers" else None
+
+    def _probe_tablebase(self, maximizing_color, ply=0):
+        """
+            Return the exact tablebase score of the position, at ply from the
+            root, or None when it is not covered.
+        """
+        tablebase = self._tablebase
+        if self.piece_counts["white"] + self.piece_counts["black"] > tablebase.max_pieces:
+            return None
+        result = tablebase.probe(self.hash_key)
+        if result is None:
+            return None
+        self._tablebase_hits += 1
+        if result > 0:
+            score = TB_WIN - ply - endgame_tablebase.distance(result)
+        elif result < 0:
+            score = -(TB_WIN - ply - endgame_tablebase.distance(result))
+        else:
+            score = 0
+        return score if self.turn == maximizing_color else -score
+
+    def _tablebase_moves(self, legal_moves):
+        """
+            Pick root moves straight from the tablebase: the fastest win,
+            else a draw, else the slowest loss. Returns (best score, best
+            moves), or (None, None) when the position is not in the table.
+        """
+        color = self.turn
+        if self._probe_tablebase(color) is None:
+            return None, None
+        best_score = None
+        best_moves = []
+        for move in legal_moves:
+            undo = self._make_move(move)
+            try:
+                score = INF - 1 if self.winner else self._probe_tablebase(color, 1)
+            finally:
+                self.unmake_move(undo)
+            if best_score is None or score > best_score:
+                best_score, best_moves = score, [move]
+            elif score == best_score:
+                best_moves.append(move)
+        return best_score, best_moves
+
+    def _quiescence(self, maximizing_color, alpha, beta, ply):
+        """
+            Search captures only until the position is quiet, so leaf scores
+            are not taken in the middle of an exchange.
+            - stand pat: the side to move may decline to capture
+            - delta pruning: skip captures that cannot lift the score back
+              into the window even after winning the victim (and promoting)
+        """
+        self._count_node()
         if self.winner:
-            return INF if self.winner == maximizing_color else -INF
+            return INF - ply if self.winner == maximizing_color else -INF + ply
+        if self._tablebase is not None:
+            score = self._probe_tablebase(maximizing_color, ply)
+            if score is not None:
+                return score
+
+        stand_pat = self._evaluate(maximizing_color)
+        is_maximizing = self.turn == maximizing_color
+        if is_maximizing:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+
+        captures = self._generate_moves(self.turn, GEN_CAPTURES)
+        if not captures:
+            return stand_pat
+        captures = self._order_moves(captures, None, ply)
+
+        weights = PIECE_WEIGHTS[self.game_type]
+        margin = DELTA_MARGIN[self.game_type]
+        opponent_pieces = None
+        best = stand_pat
+        for move in captures:
+            gain = weights[_piece_type(self._captured_piece(move))] + margin
+            if (stand_pat + gain <= alpha) if is_maximizing else (stand_pat - gain >= beta):
+                # taking the opponent's last piece wins outright, never prune it
+                if opponent_pieces is None:
+                    opponent_pieces = self._piece_count(self._opponent(self.turn))
+                if opponent_pieces > 1:
+                    continue
+            undo = self._make_move(move)
+            try:
+                score = self._quiescence(maximizing_color, alpha, beta, ply + 1)
+            finally:
+                self.unmake_move(undo)
+            if is_maximizing:
+                if score > best:
+                    best = score
+                alpha = max(alpha, best)
+            else:
+                if score < best:
+                    best = score
+                beta = min(beta, best)
+            if beta <= alpha:
+                break
+        return best
+
+    def _captured_piece(self, move):
+        from_sq = move & SQUARE_MASK
+        to_sq = move >> TO_SHIFT & SQUARE_MASK
+        square = (from_sq + to_sq) >> 1 if self.game_type == "checkers" else to_sq
+        return self.board[square >> 3][square & 7]
+
+    def _piece_count(self, color):
+        return self.piece_counts[color]
+
+    def _minimax(self, depth, maximizing_color, alpha, beta, ply=1):
         if depth == 0:
-            return self._evaluate_board(self.board, maximizing_color)
+            return self._quiescence(maximizing_color, alpha, beta, ply)
+        self._count_node()
+        if self.winner:
+            return INF - ply if self.winner == maximizing_color else -INF + ply
+        if self._tablebase is not None:
+            # solved endgames are exact at any depth, cut the tree here
+            score = self._probe_tablebase(maximizing_color, ply)
+            if score is not None:
+                return score
 
-        legal_moves = self.get_legal_moves(self.turn)
-        if not legal_moves:
-            return -INF if self.turn == maximizing_color else INF
+        # Only reuse entries searched to exactly this depth: the score of a
+        # node then depends on nothing but (position, depth), which keeps the
+        # AI's choice independent of what happened to be searched before.
+        tt = self._tt
+        key = self.hash_key
+        sign = 1 if self.turn == maximizing_color else -1
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        entry = tt.probe(key)
+        if entry is not None:
+            self._tt_hits += 1
+            tt_move = entry[4]
+            if entry[1] == depth:
+                score = sign * _score_from_tt(entry[3], ply)
+                bound = entry[2]
+                if sign < 0 and bound != EXACT:
+                    bound = LOWER if bound == UPPER else UPPER
+                if bound == EXACT:
+                    return score
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
 
-        is_maximizing = self.turn == maximizing_color
+        # moves are generated stage by stage as the loop asks for them
+        moves = self._staged_moves(tt_move, ply)
+        is_maximizing = sign > 0
+        best_move = None
         if is_maximizing:
-            best = -INF
-            for start, end in legal_moves:
-                sim = self._clone()
-                sim.move_piece(start, end, enforce_turn=True)
-                best = max(best, sim._minimax(depth - 1, maximizing_color, alpha, beta))
+            best = -INF - 1
+            for move in moves:
+                undo = self._make_move(move)
+                try:
+                    score = self._minimax(depth - 1, maximizing_color, alpha, beta, ply + 1)
+                finally:
+                    self.unmake_move(undo)
+                if score > best:
+                    best, best_move = score, move
                 alpha = max(alpha, best)
                 if beta <= alpha:
+                    self._record_cutoff(move, depth, ply)
                     break
-            return best
-
-        best = INF
-        for start, end in legal_moves:
-            sim = self._clone()
-            sim.move_piece(start, end, enforce_turn=True)
-            best = min(best, sim._minimax(depth - 1, maximizing_color, alpha, beta))
-            beta = min(beta, best)
-            if beta <= alpha:
+        else:
+            best = INF + 1
+            for move in moves:
+                undo = self._make_move(move)
+                try:
+                    score = self._minimax(depth - 1, maximizing_color, alpha, beta, ply + 1)
+                finally:
+                    self.unmake_move(undo)
+                if score < best:
+                    best, best_move = score, move
+                beta = min(beta, best)
+                if beta <= alpha:
+                    self._record_cutoff(move, depth, ply)
+                    break
+        if best_move is None:
+            return self._no_moves_score(maximizing_color, ply)
+
+        if best <= alpha_orig:
+            bound = UPPER
+        elif best >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        if sign < 0 and bound != EXACT:
+            bound = LOWER if bound == UPPER else UPPER
+        tt.store(key, depth, bound, _score_to_tt(sign * best, ply), best_move)
+        return best
+
+    def _no_moves_score(self, maximizing_color, ply):
+        """Score for the side to move having no legal move at ply: a loss, or a draw on chess stalemate."""
+        if self.game_type == "chess" and not self._in_check(self.turn):
+            return 0
+        return -INF + ply if self.turn == maximizing_color else INF - ply
+
+    def _search_root(self, legal_moves, depth, workers=1):
+        """
+            Score every root move to depth and return (best_score, best_moves).
+            The previous best move is searched first, but ties are returned in
+            generation order so the random pick does not depend on ordering.
+            With workers > 1 the root moves are split across a process pool.
+        """
+        tt = self._transposition_table()
+        color = self.turn
+        entry = tt.probe(self.hash_key)
+        tt_move = entry[4] if entry is not None else None
+        ordered = self._order_root_moves(legal_moves, tt_move)
+
+        if workers > 1 and len(ordered) > 1:
+            scores, counters = parallel_search.search_root_parallel(self, ordered, depth, workers)
+            self._add_search_counters(counters)
+            best_score = max(scores.values())
+            best_moves = [move for move in legal_moves if scores[move] == best_score]
+            tt.store(self.hash_key, depth, EXACT, best_score, best_moves[0])
+            self._depth_reached, self._root_score = depth, best_score
+            return best_score, best_moves
+
+        best_score = -INF
+        best_moves = []
+        for move in ordered:
+            undo = self._make_move(move)
+            try:
+                # alpha one below the best score so ties still come back exact
+                score = self._minimax(depth - 1, color, best_score - 1, INF)
+            finally:
+                self.unmake_move(undo)
+            if score > best_score:
+                best_score = score
+                best_moves = [move]
+            elif score == best_score:
+                best_moves.append(move)
+        best_moves = best_moves or list(legal_moves)
+        best_moves.sort(key=legal_moves.index)
+        tt.store(self.hash_key, depth, EXACT, best_score, best_moves[0])
+        self._depth_reached, self._root_score = depth, best_score
+        return best_score, best_moves
+
+    def _order_root_moves(self, legal_moves, tt_move):
+        """
+            Order root moves by a one-ply look at every child position,
+            scored together in one batch_eval call (material plus
+            piece-square bonuses), after the transposition table move.
+            Ties keep the usual capture/killer/history order.
+        """
+        ordered = self._order_moves(legal_moves, tt_move, 0)
+        children = []
+        for move in ordered:
+            undo = self._make_move(move)
+            children.append(batch_eval.encode_board(self.board, self.game_type))
+            self.unmake_move(undo)
+        scores = batch_eval.evaluate_batch(children, self.game_type, self.turn)
+        rank = {move: (move == tt_move, score) for move, score in zip(ordered, scores)}
+        ordered.sort(key=rank.__getitem__, reverse=True)
+        return ordered
+
+    def _iterative_deepening(self, legal_moves, max_depth, time_ms=None, max_nodes=None):
+        """
+            Search depth 1, 2, ... until max_depth or the budget runs out and
+            return the best moves from the last iteration that finished.
+            Depth 1 always completes so there is a move to play.
+        """
+        best_moves = self._search_root(legal_moves, 1)[1]
+        deadline = None
+        if time_ms is not None:
+            deadline = self._search_started + time_ms / 1000.0
+        self._limits = (max_nodes, deadline)
+        try:
+            for depth in range(2, max_depth + 1):
+                best_moves = self._search_root(legal_moves, depth)[1]
+        except SearchAborted:
+            pass
+        finally:
+            self._limits = None
+        return best_moves
+
+    def _hard_search(self, legal_moves, max_depth, time_ms=None, max_nodes=None):
+        """
+            Iterative deepening principal variation search for the "hard" AI.
+            After depth 1 each iteration starts with an aspiration window
+            around the previous score and reopens the side that fails.
+            Returns the best move of the last iteration that finished; depth 1
+            always completes so there is a move to play.
+        """
+        deadline = None
+        if time_ms is not None:
+            deadline = self._search_started + time_ms / 1000.0
+        tt = self._transposition_table()
+        best_move = None
+        score = 0
+        try:
+            for depth in range(1, max_depth + 1):
+                if depth == 1:
+                    alpha, beta = -INF - 1, INF + 1
+                else:
+                    window = ASPIRATION_WINDOW[self.game_type]
+                    alpha, beta = score - window, score + window
+                while True:
+                    result, move = self._pvs_root(legal_moves, depth, alpha, beta)
+                    if result <= alpha:
+                        alpha = -INF - 1
+                    elif result >= beta:
+                        beta = INF + 1
+                    else:
+                        break
+                score, best_move = result, move
+                tt.store(self.hash_key, depth, EXACT, score, best_move)
+                self._depth_reached, self._root_score = depth, score
+                # later iterations run against the budget
+                self._limits = (max_nodes, deadline)
+        except SearchAborted:
+            pass
+        finally:
+            self._limits = None
+        return best_move
+
+    def _pvs_root(self, legal_moves, depth, alpha, beta):
+        """Search the root moves with PVS in the window and return (score, best move)."""
+        entry = self._tt.probe(self.hash_key)
+        tt_move = entry[4] if entry is not None else None
+        best, best_move = -INF - 1, None
+        for index, move in enumerate(self._order_root_moves(legal_moves, tt_move)):
+            undo = self._make_move(move)
+            try:
+                if index == 0:
+                    score = -self._pvs(depth - 1, -beta, -alpha, 1)
+                else:
+                    score = -self._pvs(depth - 1, -alpha - 1, -alpha, 1)
+                    if alpha < score < beta:
+                        score = -self._pvs(depth - 1, -beta, -alpha, 1)
+            finally:
+                self.unmake_move(undo)
+            if score > best:
+                best, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best, best_move
+
+    def _pvs(self, depth, alpha, beta, ply, null_ok=True):
+        """
+            Principal variation search in negamax form: scores are from the
+            side to move's point of view.
+            - the first move gets the full window, later ones a null window
+              and a re-search only if they beat alpha
+            - null-move pruning: if passing still fails high at reduced depth,
+              cut the node without searching its moves
+            - late move reductions: quiet moves late in the order are first
+              searched a ply shallower
+            Unlike _minimax, deeper transposition table entries are reused.
+        """
+        # a move that takes the last piece leaves the turn with the winner,
+        # so a finished game is scored for the side that just lost
+        if depth <= 0:
+            return self._quiescence(self._opponent(self.winner) if self.winner else self.turn, alpha, beta, ply)
+        self._count_node()
+        color = self.turn
+        if self.winner:
+            return -INF + ply
+        if self._tablebase is not None:
+            score = self._probe_tablebase(color, ply)
+            if score is not None:
+                return score
+
+        tt = self._tt
+        key = self.hash_key
+        alpha_orig = alpha
+        tt_move = None
+        entry = tt.probe(key)
+        if entry is not None:
+            self._tt_hits += 1
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                score, bound = _score_from_tt(entry[3], ply), entry[2]
+                if bound == EXACT:
+                    return score
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        in_check = self.game_type == "chess" and self._in_check(color)
+        if (null_ok and beta - alpha == 1 and not in_check and depth >= NULL_MOVE_MIN_DEPTH
+                and self._null_move_allowed(color) and self._evaluate(color) >= beta):
+            self._make_null_move()
+            try:
+                score = -self._pvs(depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply + 1, False)
+            finally:
+                self._make_null_move()
+            if score >= beta:
+                return beta
+
+        killers = self._killers[ply] if ply < MAX_PLY else ()
+        best, best_move = -INF - 1, None
+        for index, move in enumerate(self._staged_moves(tt_move, ply)):
+            undo = self._make_move(move)
+            try:
+                if index == 0:
+                    score = -self._pvs(depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    reduce = (
+                        index >= LMR_MIN_INDEX and depth >= LMR_MIN_DEPTH and not in_check
+                        and not move & (CAPTURE | PROMOTION) and move not in killers
+                        and not (self.game_type == "chess" and self._in_check(self.turn))
+                    )
+                    score = -self._pvs(depth - 2 if reduce else depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if reduce and score > alpha:
+                        score = -self._pvs(depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if alpha < score < beta:
+                        score = -self._pvs(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self.unmake_move(undo)
+            if score > best:
+                best, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self._record_cutoff(move, depth, ply)
                 break
+        if best_move is None:
+            return self._no_moves_score(color, ply)
+
+        if best <= alpha_orig:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        tt.store(key, depth, bound, _score_to_tt(best, ply), best_move)
         return best
 
-    def _select_ai_move(self, difficulty="random", depth=2):
-        legal_moves = self.get_legal_moves(self.turn)
-        if not legal_moves:
+    def _null_move_allowed(self, color):
+        """
+            Whether color may pass in a null-move search. Passing is only
+            safe where zugzwang is unlikely: a chess side needs a piece other
+            than pawns and its king, a checkers side enough pieces to move.
+        """
+        if self.game_type == "checkers":
+            return self.piece_counts[color] >= NULL_MOVE_MIN_CHECKERS_PIECES
+        board = self.board
+        return any(board[r][c][1] not in "PK" for r, c in self.piece_squares[color])
+
+    def _make_null_move(self):
+        """Pass the turn (a second call takes the pass back)."""
+        self.turn = "black" if self.turn == "white" else "white"
+        self.hash_key ^= ZOBRIST_BLACK_TO_MOVE
+
+    def stop_search(self):
+        """Ask a budgeted search running in another thread to stop at its next node."""
+        self._stop_requested = True
+
+    def _start_pondering(self, options, time_ms):
+        """Ponder the reply predicted by the last search's principal variation."""
+        pv = self.last_search["pv"] if self.last_search else []
+        if options["difficulty"] not in ponder.PONDER_DIFFICULTIES or len(pv) < 2:
+            return
+        task = ponder.PonderTask(self, tuple(tuple(square) for square in pv[1]), options, time_ms)
+        if task.start():
+            self._ponder = task
+
+    def _take_ponder_move(self, options):
+        """The pondered move if the game is now at the pondered position, else None."""
+        task, self._ponder = self._ponder, None
+        if task is None:
+            return None
+        hit = task.take(self.hash_key, options)
+        if hit is None:
+            return None
+        move, search = hit
+        self.last_search = dict(search, source="ponder")
+        return move
+
+    def stop_pondering(self):
+        """Stop this game's background pondering, if any."""
+        task, self._ponder = self._ponder, None
+        if task is not None:
+            task.stop()
+
+    def _cached_ai_move(self, options):
+        """The move utils.move_cache holds for this position and options, or None."""
+        started = time.perf_counter()
+        key = move_cache.cache_key(self.game_type, self.hash_key, options)
+        entry = move_cache.lookup(key)
+        if entry is None:
             return None
+        pv, score, depth = entry
+        move = (tuple(pv[0][0]), tuple(pv[0][1]))
+        if encode_move(*move) not in self._legal_move_keys(self.turn):
+            # another position with the same hash
+            move_cache.discard(key)
+            return None
+        self.last_search = {
+            "source": "cache",
+            "nodes": 0,
+            "depth": depth,
+            "score": score,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "nodes_per_sec": 0,
+            "cutoffs": 0,
+            "tt_hits": 0,
+            "tablebase_hits": 0,
+            "pv": pv,
+        }
+        return move
+
+    def _select_ai_move(self, difficulty="random", depth=2, time_ms=None, max_nodes=None, workers=1,
+                        use_book=True):
+        """Choose the AI move and keep its search statistics in self.last_search."""
+        self._reset_search_stats()
+        started = time.perf_counter()
+        move, source = self._choose_ai_move(difficulty, depth, time_ms, max_nodes, workers, use_book)
+        elapsed = time.perf_counter() - started
+        self.last_search = {
+            "source": source,
+            "nodes": self._nodes,
+            "depth": self._depth_reached,
+            "score": self._root_score,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "nodes_per_sec": round(self._nodes / elapsed) if elapsed > 0 else 0,
+            "cutoffs": self._cutoffs,
+            "tt_hits": self._tt_hits,
+            "tablebase_hits": self._tablebase_hits,
+            "pv": self._principal_variation(move) if move else [],
+        }
+        return move
+
+    def _choose_ai_move(self, difficulty, depth, time_ms, max_nodes, workers, use_book):
+        """Return (move, source), source being how the move was picked."""
+        legal_moves = self._generate_moves(self.turn)
+        if not legal_moves:
+            return None, None
 
         if difficulty == "greedy":
-            capture_moves = []
-            for start, end in legal_moves:
-                piece = self.board[start[0]][start[1]]
-                if self._is_capture_move(self.board, start, end, piece):
-                    capture_moves.append((start, end))
-            return random.choice(capture_moves or legal_moves)
-
-        if difficulty == "minimax":
-            best_score = -10**9
-            best_moves = []
-            for start, end in legal_moves:
-                sim = self._clone()
-                sim.move_piece(start, end, enforce_turn=True)
-                score = sim._minimax(depth - 1, self.turn, -10**9, 10**9)
-                if score > best_score:
-                    best_score = score
-                    best_moves = [(start, end)]
-                elif score == best_score:
-                    best_moves.append((start, end))
-            return random.choice(best_moves or legal_moves)
-
-        return random.choice(legal_moves)
+            capture_moves = [move for move in legal_moves if move & CAPTURE]
+            return decode_move(random.choice(capture_moves or legal_moves)), "greedy"
+
+        if difficulty in ("minimax", "hard"):
+            # book positions are answered without searching
+            book = opening_book.get_book(self.game_type) if use_book else None
+            if book is not None:
+                move = book.choose(self.hash_key, [decode_move(move) for move in legal_moves])
+                if move is not None:
+                    return move, "book"
+
+            self._prepare_search()
+            if self._tablebase is not None:
+                best_score, best_moves = self._tablebase_moves(legal_moves)
+                if best_moves:
+                    # every root move was probed one ply deep; the score is exact
+                    self._depth_reached, self._root_score = 1, best_score
+                    return decode_move(random.choice(best_moves)), "tablebase"
+            if difficulty == "hard":
+                return decode_move(self._hard_search(legal_moves, depth, time_ms, max_nodes)), "search"
+            if time_ms is None and max_nodes is None:
+                best_moves = self._search_root(legal_moves, depth, workers)[1]
+            else:
+                best_moves = self._iterative_deepening(legal_moves, depth, time_ms, max_nodes)
+            return decode_move(random.choice(best_moves)), "search"
+
+        return decode_move(random.choice(legal_moves)), "random"
+
+    def _principal_variation(self, move):
+        """
+            The expected line of play: the chosen move followed by the best
+            moves stored in the transposition table, up to the depth searched.
+            Root moves searched in worker processes leave no entries here, so
+            the line can be just the move itself.
+        """
+        pv = [move]
+        undos = [self.make_move(*move)]
+        try:
+            while len(pv) < self._depth_reached and not self.winner:
+                entry = self._tt.probe(self.hash_key) if self._tt is not None else None
+                if entry is None or entry[4] is None or entry[4] not in self._generate_moves(self.turn):
+                    break
+                pv.append(decode_move(entry[4]))
+                undos.append(self._make_move(entry[4]))
+        finally:
+            for undo in reversed(undos):
+                self.unmake_move(undo)
+        return [[list(start), list(end)] for start, end in pv]
 
     def move_piece(self, start, end, enforce_turn=True):
         """Move a piece and handle basic validation."""
@@ -362,34 +1399,19 @@ class GameLogic:
         if enforce_turn and color != self.turn:
             return {"error": f"It is {self.turn}'s turn"}
 
-        legal_moves = self._legal_moves_for_piece((r1, c1))
-        if (start, end) not in legal_moves:
-            return {"error": "Illegal move"}
-
-        captured = False
-        if self.game_type == "checkers" and abs(r2 - r1) == 2 and abs(c2 - c1) == 2:
-            mid_r = (r1 + r2) // 2
-            mid_c = (c1 + c2) // 2
-            if self.board[mid_r][mid_c]:
-                self.board[mid_r][mid_c] = ""
-                captured = True
-
-        self.board[r2][c2], self.board[r1][c1] = piece, ""
+        # the board may have been replaced since the last move
+        self._sync_if_replaced()
 
-        promoted = False
-        if self.game_type == "checkers":
-            moved_piece = self.board[r2][c2]
-            if moved_piece == "W" and r2 == 0:
-                self.board[r2][c2] = "WK"
-                promoted = True
-            elif moved_piece == "B" and r2 == 7:
-                self.board[r2][c2] = "BK"
-                promoted = True
+        if encode_move(start, end) not in self._legal_move_keys(color):
+            return {"error": "Illegal move"}
 
+        undo = self.make_move(start, end)
+        if self.game_type == "chess" and not self.winner:
+            self._update_chess_result()
         moved_piece = self.board[r2][c2]
-        winner = self.check_winner()
-        if not winner:
-            self.turn = "black" if self.turn == "white" else "white"
+        captured = bool(undo.captured_piece)
+        promoted = undo.promoted
+        winner = self.winner
 
         return {
             "message": "Move successful",
@@ -402,13 +1424,147 @@ class GameLogic:
             "winner": winner
         }
 
+    def make_move(self, start, end):
+        """
+            Apply an already validated move in place and return an undo record.
+            Updates the winner and the side to move like move_piece, but skips
+            validation so the AI search can walk the tree on one instance.
+            Pass the record to unmake_move to restore the previous position.
+        """
+        r1, c1 = start
+        r2, c2 = end
+        board = self.board
+        piece = board[r1][c1]
+        bitboard = self.backend == "bitboard"
+        undo_bitboards = (self._white, self._black, self._kings) if bitboard else None
+
+        captured_at = None
+        captured_piece = ""
+        if self.game_type == "checkers":
+            if abs(r2 - r1) == 2:
+                mid_r = (r1 + r2) // 2
+                mid_c = (c1 + c2) // 2
+                if board[mid_r][mid_c]:
+                    captured_at = (mid_r, mid_c)
+                    captured_piece = board[mid_r][mid_c]
+                    board[mid_r][mid_c] = ""
+                    if bitboard:
+                        clear = ~(1 << checkers_bitboard.RC_TO_SQUARE[captured_at])
+                        self._white &= clear
+                        self._black &= clear
+                        self._kings &= clear
+        elif board[r2][c2]:
+            captured_at = (r2, c2)
+            captured_piece = board[r2][c2]
+
+        board[r2][c2], board[r1][c1] = piece, ""
+
+        promoted = False
+        if self.game_type == "checkers":
+            if piece == "W" and r2 == 0:
+                board[r2][c2] = "WK"
+                promoted = True
+            elif piece == "B" and r2 == 7:
+                board[r2][c2] = "BK"
+                promoted = True
+
+        # keep piece lists, counts and material in step with the board
+        color = "white" if piece[0] == "W" else "black"
+        squares = self.piece_squares[color]
+        squares.remove((r1, c1))
+        squares.add((r2, c2))
+        weights = self._weights
+        if captured_piece:
+            opponent = "black" if color == "white" else "white"
+            self.piece_counts[opponent] -= 1
+            self.material[opponent] -= weights[_piece_type(captured_piece)]
+            self.piece_squares[opponent].remove(captured_at)
+        if promoted:
+            self.material[color] += weights["K"] - weights["P"]
+
+        if bitboard:
+            from_bit = 1 << checkers_bitboard.RC_TO_SQUARE[start]
+            to_bit = 1 << checkers_bitboard.RC_TO_SQUARE[end]
+            if piece[0] == "W":
+                self._white ^= from_bit | to_bit
+            else:
+                self._black ^= from_bit | to_bit
+            if self._kings & from_bit:
+                self._kings ^= from_bit | to_bit
+            elif promoted:
+                self._kings |= to_bit
+
+        undo = MoveUndo(
+            start, end, piece, captured_at, captured_piece, promoted,
+            self.turn, self.winner, undo_bitboards, self.hash_key
+        )
+
+        # update the Zobrist hash for the squares that changed
+        key = self.hash_key ^ ZOBRIST_PIECES[piece][r1 * 8 + c1] ^ ZOBRIST_PIECES[board[r2][c2]][r2 * 8 + c2]
+        if captured_at:
+            key ^= ZOBRIST_PIECES[captured_piece][captured_at[0] * 8 + captured_at[1]]
+
+        if not self._update_winner():
+            self.turn = "black" if self.turn == "white" else "white"
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        self.hash_key = key
+        return undo
+
+    def _make_move(self, move):
+        """make_move for an encoded move, as the search walks the tree."""
+        return self.make_move(SQUARE_RC[move & SQUARE_MASK], SQUARE_RC[move >> TO_SHIFT & SQUARE_MASK])
+
+    def unmake_move(self, undo):
+        """Restore the position from before the move recorded in undo."""
+        r1, c1 = undo.start
+        r2, c2 = undo.end
+        board = self.board
+        board[r2][c2] = ""
+        board[r1][c1] = undo.piece
+
+        color = "white" if undo.piece[0] == "W" else "black"
+        squares = self.piece_squares[color]
+        squares.remove((r2, c2))
+        squares.add((r1, c1))
+        weights = self._weights
+        if undo.captured_at:
+            cr, cc = undo.captured_at
+            board[cr][cc] = undo.captured_piece
+            opponent = "black" if color == "white" else "white"
+            self.piece_counts[opponent] += 1
+            self.material[opponent] += weights[_piece_type(undo.captured_piece)]
+            self.piece_squares[opponent].add(undo.captured_at)
+        if undo.promoted:
+            self.material[color] -= weights["K"] - weights["P"]
+        if undo.bitboards:
+            self._white, self._black, self._kings = undo.bitboards
+        self.turn = undo.turn
+        self.winner = undo.winner
+        self.hash_key = undo.hash_key
+
     def timeout_turn(self):
-        """Skip the current side's turn because its timer expired."""
+        """
+            Skip the current side's turn because its timer expired. In chess
+            a side whose time runs out while in check loses, since passing
+            would leave its king to be taken; after a skip the other side can
+            still be checkmated or stalemated.
+        """
         if self.winner:
             return {"error": "Game already over"}
 
         skipped_color = self.turn
+        if self.game_type == "chess" and self._in_check(skipped_color):
+            self.winner = self._opponent(skipped_color)
+            return {
+                "message": "Time ran out while in check",
+                "skipped_color": skipped_color,
+                "next_turn": None,
+                "winner": self.winner
+            }
         self.turn = self._opponent(self.turn)
+        self.hash_key ^= ZOBRIST_BLACK_TO_MOVE
+        if self.game_type == "chess":
+            self._update_chess_result()
 
         return {
             "message": "Turn skipped due to timeout",
@@ -417,32 +1573,100 @@ class GameLogic:
             "winner": self.winner
         }
 
-    def make_ai_move(self, difficulty="random", depth=2):
-        """Pick a legal move for the current side to move."""
+    def _ai_options(self, difficulty="random", depth=2, time_ms=None, max_nodes=None, use_book=True):
+        """
+            The settings make_ai_move searches with: depth at least 1 and
+            capped for the game type, the hard AI given its default budget.
+        """
+        depth = max(depth, 1)
+        if difficulty == "hard" and time_ms is None and max_nodes is None:
+            time_ms = HARD_TIME_MS[self.game_type]
+        if time_ms is None and max_nodes is None:
+            depth = min(depth, MAX_AI_DEPTH[self.game_type])
+        else:
+            depth = min(depth, MAX_BUDGET_DEPTH[self.game_type])
+        return {
+            "difficulty": difficulty, "depth": depth, "time_ms": time_ms, "max_nodes": max_nodes,
+            "use_book": use_book,
+        }
+
+    def make_ai_move(self, difficulty="random", depth=2, time_ms=None, max_nodes=None, workers=1,
+                     use_book=True, stats=False, ponder_ms=None, use_cache=True):
+        """
+            Pick a legal move for the current side to move.
+            With time_ms and/or max_nodes the minimax AI runs iterative
+            deepening up to depth (capped by MAX_BUDGET_DEPTH) and plays the
+            best move of the last iteration that fit the budget. Without a
+            budget it searches to a fixed depth capped by MAX_AI_DEPTH, split
+            across a process pool when workers > 1. The "hard" AI always runs
+            iterative deepening principal variation search, HARD_TIME_MS long
+            unless given a budget, in this process. Positions in a loaded
+            opening book are played from the book unless use_book is False.
+            Every move's search statistics go to the utils.search_stats
+            totals; with stats=True they are also returned under "search".
+            With ponder_ms the AI then searches the opponent's predicted reply
+            in a background thread for up to that long; if the opponent plays
+            it, the next call answers with the pondered move (source "ponder").
+            Searched moves are remembered in utils.move_cache, when the app
+            has turned it on, and replayed for the same position and
+            settings (source "cache") unless use_cache is False.
+        """
         if self.winner:
+            self.stop_pondering()
             return {"error": "Game already over"}
+        self._sync_if_replaced()
 
-        if depth < 1:
-            depth = 1
-        if self.game_type == "chess":
-            depth = min(depth, 2)
+        options = self._ai_options(difficulty, depth, time_ms, max_nodes, use_book)
+        move = self._cached_ai_move(options) if use_cache else None
+        if move is not None:
+            self.stop_pondering()
         else:
-            depth = min(depth, 4)
-
-        move = self._select_ai_move(difficulty=difficulty, depth=depth)
+            move = self._take_ponder_move(options)
+            if move is None:
+                move = self._select_ai_move(workers=workers or 1, **options)
+            if use_cache and move and self.last_search["source"] in ("search", "ponder"):
+                move_cache.store(
+                    move_cache.cache_key(self.game_type, self.hash_key, options),
+                    self.last_search["pv"], self.last_search["score"], self.last_search["depth"]
+                )
         if not move:
-            self.winner = self._opponent(self.turn)
+            if self.game_type == "chess":
+                self._update_chess_result()
+            else:
+                self.winner = self._opponent(self.turn)
             return {"error": "No legal moves", "winner": self.winner}
+        search_stats.record(self.game_type, self.last_search)
 
         start, end = move
         result = self.move_piece(start, end, enforce_turn=True)
         result["ai_difficulty"] = difficulty
+        if stats:
+            result["search"] = self.last_search
+        if ponder_ms and not self.winner:
+            self._start_pondering(options, ponder_ms)
         return result
 
     def check_winner(self):
-        """Basic win condition (simplified)."""
-        white_pieces = sum(piece.startswith("W") for row in self.board for piece in row if piece)
-        black_pieces = sum(piece.startswith("B") for row in self.board for piece in row if piece)
+        """Basic win condition (simplified), plus checkmate and stalemate in chess."""
+        self._sync_if_replaced()
+        if not self._update_winner() and self.game_type == "chess":
+            self._update_chess_result()
+        return self.winner
+
+    def _update_chess_result(self):
+        """
+            End the game when the side to move has no legal move: checkmate
+            if its king is attacked, otherwise stalemate, recorded as "draw".
+        """
+        if self._generate_moves(self.turn):
+            return None
+        self.winner = self._opponent(self.turn) if self._in_check(self.turn) else "draw"
+        return self.winner
+
+    def _update_winner(self):
+        """Set the winner when one side has no pieces left."""
+        white_pieces = self._piece_count("white")
+        black_pieces = self._piece_count("black")
         if white_pieces == 0:
             self.winner = "black"
         elif black_pieces == 0:
@@ -0,0 +1,177 @@
+"""
+Process-wide cache of AI moves.
+
+Every /game/ai game starts from the same position, so the same positions
+come up again and again. GameLogic.make_ai_move looks the position up here
+before searching and stores what a search chose afterwards, keyed by
+    (game type, position hash, difficulty, depth, time_ms, max_nodes, use_book)
+so a hit is only ever a move from a search with the same settings. Only
+searched moves are kept: random and greedy moves are meant to vary, and
+book and tablebase moves are already lookups.
+
+The cache holds at most max_entries moves, dropping the least recently used.
+It is off (max_entries 0) until configure() is called, which the app does at
+startup; with a path the entries are loaded from that file and written back
+at exit. Position hashes come from the seeded Zobrist keys, so they stay
+valid across restarts; a file written by an engine with different keys is
+ignored.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_VERSION = 2
+
+# AI difficulties whose moves are cached
+CACHED_DIFFICULTIES = ("minimax", "hard")
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+_max_entries = 0
+_path = None
+_counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def cache_key(game_type, position_hash, options):
+    """
+        The cache key for a make_ai_move call, or None when the move should
+        not be cached. options: difficulty, depth, time_ms, max_nodes and
+        use_book, since the cache is checked before the opening book.
+    """
+    if options["difficulty"] not in CACHED_DIFFICULTIES:
+        return None
+    return (
+        game_type, position_hash, options["difficulty"], options["depth"],
+        options["time_ms"], options["max_nodes"], options["use_book"],
+    )
+
+
+def lookup(key):
+    """Return the cached (pv, score, depth) for key, or None, counting hits and misses."""
+    if key is None or not _max_entries:
+        return None
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            _counters["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        _counters["hits"] += 1
+        return entry
+
+
+def store(key, pv, score, depth):
+    """
+        Remember what a search found: its principal variation as
+        [[[r1, c1], [r2, c2]], ...] (the move played first), score and depth.
+        The least recently used entries are evicted to make room.
+    """
+    if key is None or not _max_entries or not pv:
+        return
+    with _lock:
+        _entries[key] = (pv, score, depth)
+        _entries.move_to_end(key)
+        _counters["stores"] += 1
+        _evict()
+
+
+def discard(key):
+    """Forget an entry (a hash collision left it pointing at an illegal move)."""
+    with _lock:
+        _entries.pop(key, None)
+
+
+def _evict():
+    while len(_entries) > _max_entries:
+        _entries.popitem(last=False)
+        _counters["evictions"] += 1
+
+
+def _engine_hashes():
+    from utils.game_logic import GameLogic
+
+    return {game_type: GameLogic(game_type).hash_key for game_type in ("checkers", "chess")}
+
+
+def save(path=None):
+    """Write the entries, least recently used first, to path (default: the configured one)."""
+    path = path or _path
+    if not path:
+        return 0
+    with _lock:
+        entries = [list(key) + list(entry) for key, entry in _entries.items()]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # write a temporary file and swap it in, so a crash never leaves half a cache
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as handle:
+        json.dump({"version": CACHE_VERSION, "engine": _engine_hashes(), "entries": entries}, handle)
+    os.replace(temp_path, path)
+    return len(entries)
+
+
+def load(path):
+    """Add the entries saved at path; returns how many were loaded."""
+    try:
+        with open(path) as handle:
+            data = json.load(handle)
+    except (OSError, ValueError) as exc:
+        print(f"Skipping AI move cache {path}: {exc}")
+        return 0
+    if data.get("version") != CACHE_VERSION or data.get("engine") != _engine_hashes():
+        print(f"Skipping AI move cache {path}: written by a different engine")
+        return 0
+    with _lock:
+        for entry in data["entries"]:
+            key = tuple(entry[:7])
+            _entries[key] = tuple(entry[7:])
+            _entries.move_to_end(key)
+        _evict()
+        return len(_entries)
+
+
+def configure(max_entries, path=None):
+    """
+        Turn the cache on with room for max_entries moves (0 turns it off).
+        With a path, load the entries saved there and save them at exit.
+    """
+    global _max_entries, _path
+    with _lock:
+        _max_entries = max(0, max_entries)
+        _evict()
+    if path and path != _path:
+        if _path is None:
+            atexit.register(save)
+        _path = path
+        if os.path.exists(path):
+            load(path)
+    return _max_entries
+
+
+def stats():
+    """Size, capacity, hit/miss/store/eviction counts and the hit rate."""
+    with _lock:
+        lookups = _counters["hits"] + _counters["misses"]
+        return dict(
+            _counters,
+            size=len(_entries),
+            max_entries=_max_entries,
+            hit_rate=round(_counters["hits"] / lookups, 3) if lookups else 0.0,
+        )
+
+
+def reset_stats():
+    with _lock:
+        for name in _counters:
+            _counters[name] = 0
+
+
+def clear():
+    """Drop every entry and zero the counters."""
+    with _lock:
+        _entries.clear()
+    reset_stats()
@@ -0,0 +1,50 @@
+"""
+Compact integer moves for the GameLogic engine.
+
+A move fits in 14 bits, so move lists are array("H") arrays of plain ints
+instead of lists of ((r1, c1), (r2, c2)) tuples:
+    bits 0-5:   from square (row * 8 + col)
+    bits 6-11:  to square
+    bit 12:     CAPTURE
+    bit 13:     PROMOTION (a checkers man reaching the far row)
+Routes and other callers keep using (start, end) tuples; encode_move and
+decode_move convert at that boundary.
+"""
+
+from array import array
+
+SQUARE_MASK = 0x3F
+TO_SHIFT = 6
+# from and to squares only, the identity of a move without its flags
+KEY_MASK = 0xFFF
+
+CAPTURE = 1 << 12
+PROMOTION = 1 << 13
+
+MOVE_TYPECODE = "H"
+
+# Move generation stages, combined as bit flags
+GEN_CAPTURES = 1
+GEN_QUIETS = 2
+GEN_ALL = GEN_CAPTURES | GEN_QUIETS
+
+# (row, col) of every square index
+SQUARE_RC = tuple(divmod(square, 8) for square in range(64))
+
+
+def encode_move(start, end, flags=0):
+    """Encode a ((r1, c1), (r2, c2)) move as an int."""
+    return (start[0] * 8 + start[1]) | (end[0] * 8 + end[1]) << TO_SHIFT | flags
+
+
+def decode_move(move):
+    """Return the ((r1, c1), (r2, c2)) tuple form of an encoded move."""
+    return SQUARE_RC[move & SQUARE_MASK], SQUARE_RC[move >> TO_SHIFT & SQUARE_MASK]
+
+
+def new_move_list():
+    """
+        An empty move list. Each generation gets its own: the search keeps a
+        ply's moves while it searches the plies below.
+    """
+    return array(MOVE_TYPECODE)
@@ -0,0 +1,257 @@
+"""
+Opening book for the minimax AI.
+
+Book files are a small header followed by fixed-size records sorted by the
+Zobrist hash of the position (GameLogic.hash_key):
+    header: magic, version, game code, start position hash, record count
+    record: position hash (u64), from square (u8), to square (u8), weight (u16)
+Squares are row * 8 + col. Files are memory-mapped read-only, so every
+worker process shares the same pages and a lookup is a binary search.
+
+Build a book from a game collection (JSON lines, one list of
+[[r1, c1], [r2, c2]] moves per line) or from self-play:
+    python -m utils.opening_book build --game checkers --self-play 200 --out instance/books/checkers.bin
+    python -m utils.opening_book build --game chess --games games.jsonl --out instance/books/chess.bin
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+from collections import defaultdict
+
+BOOK_MAGIC = b"OCBK"
+BOOK_VERSION = 1
+GAME_CODES = {"checkers": 0, "chess": 1}
+
+BOOK_HEADER = struct.Struct("<4sHHQI")
+BOOK_RECORD = struct.Struct("<QBBH")
+_KEY = struct.Struct("<Q")
+
+# Books loaded at startup, by game type
+_books = {}
+
+
+class MappedRecords:
+    """
+        Read-only view of a file of fixed-size records sorted by a leading
+        u64 key, memory-mapped so lookups do not load the file.
+    """
+
+    def __init__(self, path, header, record):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = header.unpack_from(self._map, 0)
+        self._offset = header.size
+        self._record = record
+        self.count = (len(self._map) - header.size) // record.size
+
+    def _key_at(self, index):
+        return _KEY.unpack_from(self._map, self._offset + index * self._record.size)[0]
+
+    def find(self, key):
+        """Return every record whose key matches, in file order."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        records = []
+        while lo < self.count and self._key_at(lo) == key:
+            records.append(self._record.unpack_from(self._map, self._offset + lo * self._record.size))
+            lo += 1
+        return records
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class OpeningBook:
+    """A memory-mapped book file for one game type."""
+
+    def __init__(self, path):
+        self._records = MappedRecords(path, BOOK_HEADER, BOOK_RECORD)
+        magic, version, game_code, start_hash, _ = self._records.header
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self._records.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.game_type = {code: name for name, code in GAME_CODES.items()}.get(game_code)
+        self.start_hash = start_hash
+
+    def __len__(self):
+        return self._records.count
+
+    def moves(self, position_hash):
+        """Return [(move, weight), ...] stored for a position."""
+        return [
+            ((divmod(from_sq, 8), divmod(to_sq, 8)), weight)
+            for _, from_sq, to_sq, weight in self._records.find(position_hash)
+        ]
+
+    def choose(self, position_hash, legal_moves):
+        """Pick a legal book move at random by weight, or None when out of book."""
+        entries = [(move, weight) for move, weight in self.moves(position_hash) if move in legal_moves]
+        if not entries:
+            return None
+        moves, weights = zip(*entries)
+        return random.choices(moves, weights=weights)[0]
+
+    def close(self):
+        self._records.close()
+
+
+def load_books(directory):
+    """
+        Map <directory>/<game_type>.bin for each game type that has one.
+        Books built with different Zobrist keys are skipped.
+    """
+    from utils.game_logic import GameLogic
+
+    close_books()
+    for game_type in GAME_CODES:
+        path = os.path.join(directory, f"{game_type}.bin")
+        if not os.path.exists(path):
+            continue
+        try:
+            book = OpeningBook(path)
+        except (OSError, ValueError, struct.error) as exc:
+            print(f"Skipping opening book {path}: {exc}")
+            continue
+        if book.game_type != game_type or book.start_hash != GameLogic(game_type).hash_key:
+            print(f"Skipping opening book {path}: built for a different engine")
+            book.close()
+            continue
+        _books[game_type] = book
+    return dict(_books)
+
+
+def get_book(game_type):
+    return _books.get(game_type)
+
+
+def close_books():
+    for book in _books.values():
+        book.close()
+    _books.clear()
+
+
+def collect_book_moves(game_type, games, max_plies=16):
+    """
+        Replay each game from the start position and count how often each
+        move was played from each position in the first max_plies plies.
+        Returns {position_hash: {move: count}}; illegal moves end a game.
+    """
+    from utils.game_logic import GameLogic
+
+    counts = defaultdict(lambda: defaultdict(int))
+    for moves in games:
+        game = GameLogic(game_type)
+        for start, end in moves[:max_plies]:
+            move = (tuple(start), tuple(end))
+            position = game.hash_key
+            if game.winner or "error" in game.move_piece(*move):
+                break
+            counts[position][move] += 1
+    return counts
+
+
+def write_book(path, game_type, counts, min_count=1):
+    """Write counted book moves to path in the binary book format."""
+    from utils.game_logic import GameLogic
+
+    records = []
+    for position, moves in counts.items():
+        for ((r1, c1), (r2, c2)), count in moves.items():
+            if count >= min_count:
+                records.append((position, r1 * 8 + c1, r2 * 8 + c2, min(count, 0xFFFF)))
+    records.sort(key=lambda record: (record[0], -record[3]))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(BOOK_HEADER.pack(
+            BOOK_MAGIC, BOOK_VERSION, GAME_CODES[game_type],
+            GameLogic(game_type).hash_key, len(records)
+        ))
+        for record in records:
+            handle.write(BOOK_RECORD.pack(*record))
+    return len(records)
+
+
+def read_game_collection(path):
+    """Read a JSON lines game collection: a move list (or {"moves": [...]}) per line."""
+    games = []
+    with open(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            games.append(entry["moves"] if isinstance(entry, dict) else entry)
+    return games
+
+
+def self_play_games(game_type, count, plies=16, depth=2, seed=0):
+    """Play count minimax-vs-minimax openings; ties are broken by a seeded RNG."""
+    from utils.game_logic import GameLogic
+
+    games = []
+    for index in range(count):
+        random.seed(seed + index)
+        game = GameLogic(game_type)
+        moves = []
+        for _ in range(plies):
+            result = game.make_ai_move(difficulty="minimax", depth=depth, use_book=False, use_cache=False)
+            if "error" in result:
+                break
+            moves.append((tuple(result["start"]), tuple(result["end"])))
+            if game.winner:
+                break
+        games.append(moves)
+    return games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect opening books.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build a book file")
+    build.add_argument("--game", choices=sorted(GAME_CODES), required=True)
+    build.add_argument("--out", required=True)
+    build.add_argument("--games", help="JSON lines game collection")
+    build.add_argument("--self-play", type=int, default=0, help="number of self-play games to add")
+    build.add_argument("--depth", type=int, default=2, help="self-play search depth")
+    build.add_argument("--plies", type=int, default=16, help="plies per game kept in the book")
+    build.add_argument("--min-count", type=int, default=1, help="drop moves seen fewer times")
+    build.add_argument("--seed", type=int, default=0)
+
+    info = commands.add_parser("info", help="print a book's header")
+    info.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.command == "info":
+        book = OpeningBook(args.path)
+        print(f"{args.path}: {book.game_type} book, {len(book)} moves")
+        book.close()
+        return 0
+
+    games = read_game_collection(args.games) if args.games else []
+    if args.self_play:
+        games += self_play_games(args.game, args.self_play, args.plies, args.depth, args.seed)
+    if not games:
+        parser.error("give --games and/or --self-play")
+    counts = collect_book_moves(args.game, games, args.plies)
+    written = write_book(args.out, args.game, counts, args.min_count)
+    print(f"Wrote {written} book moves for {len(counts)} positions to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""
+Parallel root search for the GameLogic minimax AI.
+
+Each root move is searched in a process pool worker, so the search is not
+serialized by the GIL. Workers share the best root score found so far
+through a multiprocessing Value. Each root move is searched with alpha one
+below that score, the same window the serial root search uses, so every
+move that ties for best comes back with an exact score. The move choice is
+therefore identical to the serial search at the same depth.
+"""
+
+import atexit
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Pools are created once per worker count and reused across searches
+_pools = {}
+_pools_lock = threading.Lock()
+# Plain task pools shared by other modules (AI jobs, analysis), one per
+# name: (executor, workers)
+_task_pools = {}
+_search_ids = itertools.count(1)
+
+# Worker process state: the shared best score and an engine rebuilt once
+# per search so its transposition table is reused across root moves
+_shared_best = None
+_engine = None
+_engine_search_id = None
+
+
+def _init_worker(shared_best):
+    global _shared_best
+    _shared_best = shared_best
+
+
+def _get_pool(workers):
+    with _pools_lock:
+        if workers not in _pools:
+            shared_best = multiprocessing.Value("q", 0)
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(shared_best,)
+            )
+            _pools[workers] = (executor, shared_best, threading.Lock())
+        return _pools[workers]
+
+
+def get_task_pool(name, workers):
+    """The process pool registered as name, rebuilt when the worker count changes."""
+    with _pools_lock:
+        executor, pool_workers = _task_pools.get(name, (None, None))
+        if executor is None or pool_workers != workers:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=workers)
+            _task_pools[name] = (executor, workers)
+        return executor
+
+
+def shutdown_task_pool(name):
+    """Stop the process pool registered as name, waiting for its tasks."""
+    with _pools_lock:
+        executor, _ = _task_pools.pop(name, (None, None))
+    # wait outside the lock, so the other pools stay usable meanwhile
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def shutdown_pools():
+    """Stop every worker pool (registered for process exit, also used by tests)."""
+    with _pools_lock:
+        executors = [executor for executor, _, _ in _pools.values()]
+        executors += [executor for executor, _ in _task_pools.values()]
+        _pools.clear()
+        _task_pools.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+atexit.register(shutdown_pools)
+
+
+def _search_root_move(search_id, state, move, depth):
+    """Worker task: score one root move, returning (score, search counters used)."""
+    global _engine, _engine_search_id
+    from utils.game_logic import INF, GameLogic
+
+    if _engine_search_id != search_id:
+        _engine = GameLogic.from_state(state)
+        _engine._reset_search_stats()
+        _engine._prepare_search()
+        _engine_search_id = search_id
+
+    engine = _engine
+    color = engine.turn
+    counters_before = engine._search_counters()
+    alpha = _shared_best.value - 1
+    undo = engine._make_move(move)
+    try:
+        score = engine._minimax(depth - 1, color, alpha, INF)
+    finally:
+        engine.unmake_move(undo)
+
+    with _shared_best.get_lock():
+        if score > _shared_best.value:
+            _shared_best.value = score
+    counters = tuple(after - before for after, before in zip(engine._search_counters(), counters_before))
+    return score, counters
+
+
+def search_root_parallel(game, moves, depth, workers):
+    """
+        Score each root move of game to depth across a pool of workers.
+        Moves are submitted in order, so put the likely best ones first to
+        raise the shared alpha early. Returns ({move: score}, counters), the
+        counters being the summed (nodes, cutoffs, tt_hits, tablebase_hits)
+        of every worker.
+    """
+    from utils.game_logic import INF
+
+    executor, shared_best, search_lock = _get_pool(workers)
+    # one search per pool at a time, since they share the alpha bound
+    with search_lock:
+        shared_best.value = -INF
+        search_id = next(_search_ids)
+        state = game.to_state()
+        futures = [
+            executor.submit(_search_root_move, search_id, state, move, depth)
+            for move in moves
+        ]
+        results = [future.result() for future in futures]
+
+    scores = {move: score for move, (score, _) in zip(moves, results)}
+    counters = tuple(sum(column) for column in zip(*(counters for _, counters in results)))
+    return scores, counters
@@ -0,0 +1,183 @@
+"""
+Perft: count the leaf nodes of the move tree to a fixed depth.
+
+Perft numbers pin down move generation exactly, so any change to the engine
+that alters a count is a bug (or a rules change that needs new numbers).
+Timing the same walk gives a move generation speed baseline.
+
+Two walks are available:
+    - "make": the search path, _generate_moves + make_move/unmake_move
+    - "public": the route path, get_legal_moves + move_piece on copies
+
+    python -m utils.perft --position chess-start --depth 4
+    python -m utils.perft --all --mode public
+    python -m utils.perft --position checkers-start --depth 6 --divide
+"""
+
+import argparse
+import time
+
+from utils.game_logic import GameLogic
+
+# Reference positions with their expected counts by depth under this app's
+# rules (no forced captures or multi-jumps in checkers; legal chess moves
+# without castling, en passant or promotion). Boards are eight rows of
+# space separated squares, "." for an empty one; None is the start position.
+PERFT_POSITIONS = {
+    "checkers-start": {
+        "game_type": "checkers",
+        "turn": "white",
+        "board": None,
+        "expected": {1: 7, 2: 49, 3: 379, 4: 2872, 5: 23582, 6: 189143, 7: 1585096},
+    },
+    "checkers-kings": {
+        "game_type": "checkers",
+        "turn": "black",
+        "board": [
+            ". B . . . . . .",
+            ". . . . B . . .",
+            ". . . WK . . . .",
+            ". . . . B . BK .",
+            ". . . . . W . .",
+            ". . W . . . . .",
+            ". . . . . . . W",
+            "WK . . . . . . .",
+        ],
+        "expected": {1: 10, 2: 80, 3: 650, 4: 5217, 5: 38073, 6: 302948, 7: 2147470},
+    },
+    "chess-start": {
+        "game_type": "chess",
+        "turn": "white",
+        "board": None,
+        "expected": {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865351},
+    },
+    "chess-middlegame": {
+        "game_type": "chess",
+        "turn": "white",
+        "board": [
+            "BR . . BQ BK . . BR",
+            "BP BP BP . BB BP BP BP",
+            ". . BN . . BN . .",
+            ". . . BP BP . . .",
+            ". . WB . WP . BB .",
+            ". . WN WP . WN . .",
+            "WP WP WP . . WP WP WP",
+            "WR . WB WQ WK . . WR",
+        ],
+        "expected": {1: 37, 2: 1514, 3: 56015, 4: 2284453},
+    },
+}
+
+
+def position_game(name):
+    """Build a GameLogic set up at one of the PERFT_POSITIONS."""
+    position = PERFT_POSITIONS[name]
+    game = GameLogic(position["game_type"])
+    if position["board"] is not None:
+        game.board = [
+            ["" if square == "." else square for square in row.split()]
+            for row in position["board"]
+        ]
+    game.turn = position["turn"]
+    game.check_winner()
+    return game
+
+
+def perft(game, depth):
+    """Count leaf nodes depth plies below game's position with make/unmake."""
+    game._sync_state()
+    return _perft(game, depth)
+
+
+def _perft(game, depth):
+    if depth == 0:
+        return 1
+    if game.winner:
+        return 0
+    moves = game._generate_moves(game.turn)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = game._make_move(move)
+        nodes += _perft(game, depth - 1)
+        game.unmake_move(undo)
+    return nodes
+
+
+def perft_public(game, depth):
+    """Count leaf nodes through get_legal_moves/move_piece, copying the game per move."""
+    if depth == 0:
+        return 1
+    if game.winner:
+        return 0
+    state = game.to_state()
+    nodes = 0
+    for start, end in game.get_legal_moves():
+        child = GameLogic.from_state(state)
+        result = child.move_piece(start, end)
+        if "error" in result:
+            raise ValueError(f"generated move {start}->{end} was rejected: {result['error']}")
+        nodes += perft_public(child, depth - 1)
+    return nodes
+
+
+def divide(game, depth, mode="make"):
+    """Return {move: leaf count} for every root move, to find where two counts differ."""
+    counts = {}
+    state = game.to_state()
+    for move in game.get_legal_moves():
+        child = GameLogic.from_state(state)
+        child.move_piece(*move)
+        counts[move] = run_perft(child, depth - 1, mode)
+    return counts
+
+
+def run_perft(game, depth, mode="make"):
+    if mode == "public":
+        return perft_public(game, depth)
+    return perft(game, depth)
+
+
+def timed_perft(game, depth, mode="make"):
+    """Return (nodes, seconds, nodes per second) for one perft run."""
+    started = time.perf_counter()
+    nodes = run_perft(game, depth, mode)
+    elapsed = time.perf_counter() - started
+    return nodes, elapsed, nodes / elapsed if elapsed > 0 else float("inf")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count move tree leaves and time move generation.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--position", choices=sorted(PERFT_POSITIONS))
+    target.add_argument("--all", action="store_true", help="every reference position and depth")
+    parser.add_argument("--depth", type=int, help="default: deepest stored count")
+    parser.add_argument("--mode", choices=("make", "public"), default="make")
+    parser.add_argument("--divide", action="store_true", help="print counts per root move")
+    args = parser.parse_args(argv)
+
+    names = sorted(PERFT_POSITIONS) if args.all else [args.position]
+    failed = False
+    for name in names:
+        expected = PERFT_POSITIONS[name]["expected"]
+        depths = [args.depth] if args.depth else sorted(expected)
+        if not args.all:
+            depths = depths[-1:]
+        for depth in depths:
+            game = position_game(name)
+            if args.divide:
+                for (start, end), count in sorted(divide(game, depth, args.mode).items()):
+                    print(f"  {start}->{end}: {count}")
+            nodes, elapsed, speed = timed_perft(game, depth, args.mode)
+            status = ""
+            if depth in expected:
+                ok = nodes == expected[depth]
+                failed = failed or not ok
+                status = "ok" if ok else f"MISMATCH (expected {expected[depth]})"
+            print(f"{name} depth {depth}: {nodes} nodes in {elapsed:.3f}s ({speed:,.0f} nodes/s) {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+"""
+Pondering: searching on the opponent's time.
+
+After the AI moves, the second move of its principal variation is the reply
+it expects. A PonderTask plays that reply on a copy of the game and runs the
+same AI search from there in a background thread, sharing the live game's
+transposition table. When the opponent does play the predicted move, the
+next make_ai_move answers with the pondered move instead of searching again
+(a "ponder hit"). On a miss the task is stopped and the table entries it
+left behind are just a head start.
+
+Each game ponders at most one position at a time and for at most the task's
+time budget, so an idle game stops using CPU once that is spent. Threads
+share the interpreter with the request handlers, so keep the budget modest.
+"""
+
+import threading
+import time
+
+# AI difficulties worth pondering for
+PONDER_DIFFICULTIES = ("minimax", "hard")
+
+
+class PonderTask:
+    """
+        Background search of the position after a predicted reply.
+        - options: the make_ai_move settings the answer must match
+          (difficulty, depth, time_ms, max_nodes, use_book)
+        - time_ms: the most the task may search
+    """
+
+    def __init__(self, game, predicted, options, time_ms):
+        self.options = dict(options)
+        self.time_ms = time_ms
+        self.move = None
+        self.search = None
+        self.finished = False
+        self.started = None
+        self._thread = None
+
+        copy = type(game).from_state(game.to_state())
+        result = copy.move_piece(*predicted)
+        if "error" in result or copy.winner:
+            copy = None
+        else:
+            # entries found while pondering stay useful after a miss too
+            copy._tt = game._transposition_table()
+        self._game = copy
+        self.hash_key = copy.hash_key if copy is not None else None
+
+    def start(self):
+        """Start searching; returns False when there is nothing to ponder."""
+        if self._game is None:
+            return False
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="ponder", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        options = self.options
+        # a fixed-depth search also deepens iteratively here, so stop() can cut it short
+        time_ms = self.time_ms if options["time_ms"] is None else min(options["time_ms"], self.time_ms)
+        try:
+            self.move = self._game._select_ai_move(
+                difficulty=options["difficulty"], depth=options["depth"], time_ms=time_ms,
+                max_nodes=options["max_nodes"], workers=1, use_book=options["use_book"]
+            )
+            self.search = self._game.last_search
+        finally:
+            self.finished = not self._game._stop_requested
+
+    def stop(self):
+        """Stop the search and wait for the thread to let go of the game."""
+        if self._thread is None:
+            return
+        self._game.stop_search()
+        self._thread.join()
+
+    def running_ms(self):
+        return (time.perf_counter() - self.started) * 1000 if self.started is not None else 0.0
+
+    def take(self, hash_key, options):
+        """
+            Stop the task and return (move, search stats) if hash_key is the
+            pondered position, options match and the result is as good as a
+            fresh search would be; otherwise None.
+        """
+        ran_ms = self.running_ms()
+        self.stop()
+        if hash_key != self.hash_key or dict(options) != self.options or self.move is None:
+            return None
+        search = self.search
+        if search["source"] != "search" or search["depth"] >= options["depth"]:
+            # searched as deep as asked (or answered from the book or tablebase)
+            return self.move, search
+        time_ms = options["time_ms"]
+        if time_ms is None:
+            if options["max_nodes"] is not None and search["nodes"] >= options["max_nodes"]:
+                return self.move, search
+            return None
+        # a budgeted search: good enough once it had the time a fresh one would get
+        searched_ms = min(time_ms, self.time_ms) if self.finished else ran_ms
+        return (self.move, search) if searched_ms >= time_ms else None
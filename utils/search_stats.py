@@ -0,0 +1,61 @@
+"""
+Process-wide counters for AI moves.
+
+GameLogic.make_ai_move records the statistics of every move it plays here
+(background jobs record theirs when the result comes back), and the
+/game/ai-stats route serves snapshot() so depth and budget settings can be
+tuned per server.
+"""
+
+import threading
+
+_COUNTERS = ("moves", "nodes", "elapsed_ms", "cutoffs", "tt_hits", "tablebase_hits")
+
+_lock = threading.Lock()
+_totals = {}
+
+
+def _empty():
+    totals = {name: 0 for name in _COUNTERS}
+    totals["max_depth"] = 0
+    totals["sources"] = {}
+    return totals
+
+
+def record(game_type, stats):
+    """Add one AI move's search statistics to the totals."""
+    with _lock:
+        for key in ("all", game_type):
+            totals = _totals.setdefault(key, _empty())
+            totals["moves"] += 1
+            for name in _COUNTERS[1:]:
+                totals[name] += stats.get(name, 0)
+            totals["max_depth"] = max(totals["max_depth"], stats.get("depth", 0))
+            source = stats.get("source", "search")
+            totals["sources"][source] = totals["sources"].get(source, 0) + 1
+
+
+def snapshot():
+    """
+        Return the totals so far:
+            {"all": {...}, "checkers": {...}, "chess": {...}}
+        each with moves, nodes, elapsed_ms, cutoffs, tt_hits, tablebase_hits,
+        max_depth, moves per source, and the averages derived from them.
+    """
+    with _lock:
+        view = {}
+        for key, totals in _totals.items():
+            entry = dict(totals, sources=dict(totals["sources"]))
+            entry["elapsed_ms"] = round(entry["elapsed_ms"], 3)
+            entry["nodes_per_sec"] = (
+                round(entry["nodes"] * 1000 / entry["elapsed_ms"]) if entry["elapsed_ms"] else 0
+            )
+            entry["avg_nodes"] = round(entry["nodes"] / entry["moves"], 1)
+            entry["avg_elapsed_ms"] = round(entry["elapsed_ms"] / entry["moves"], 3)
+            view[key] = entry
+        return view
+
+
+def reset():
+    with _lock:
+        _totals.clear()
@@ -5,6 +5,11 @@ from utils.game_logic import GameLogic
 active_games = {}
 lobby_rooms = {}
 
+
+def ai_game_room(game_type):
+    """Socket.IO room that receives finished AI moves for a game."""
+    return f"ai-game-{game_type}"
+
 def register_socket_events(socketio):
     """Register socket event handlers."""
 
@@ -116,6 +121,18 @@ def register_socket_events(socketio):
     @socketio.on("get_rooms")
     def handle_get_rooms():
         emit("rooms_list", {"rooms": list(lobby_rooms.keys())})
+
+    # Subscribe to background AI move results for a game
+    @socketio.on("join_ai_game")
+    def handle_join_ai_game(data):
+        """"
+            Join the room that gets an "ai_move" event when a queued AI
+            move job for this game finishes.
+        """
+        game_type = (data or {}).get("game_type", "checkers")
+        room = ai_game_room(game_type)
+        join_room(room)
+        emit("ai_game_joined", {"game_type": game_type, "room": room})
     
     
     
@@ -0,0 +1,211 @@
+"""
+Self-play tournament between AI configurations.
+
+Every pair of configurations plays games_per_pair games (colors alternate)
+in a process pool. Each game is seeded from the tournament seed and its
+index, so a tournament replays identically whatever the worker count.
+Games longer than max_plies are adjudicated on material. Results are rated
+in schedule order with utils.ranking_system.calculate_elo, the same update
+the player rankings use, and reported with the average time and nodes per
+move so strength can be weighed against cost.
+
+Configurations are "random", "greedy", "minimax:<depth>",
+"minimax:t<ms>" (iterative deepening under a time budget) or "hard:t<ms>"
+(principal variation search under a time budget; plain "hard" uses
+HARD_TIME_MS):
+    python -m utils.tournament --game checkers --configs random greedy minimax:2 minimax:4 --games 200 --workers 4
+    python -m utils.tournament --game chess --configs minimax:t200 hard:t200 --games 20 --workers 4
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.game_logic import MAX_BUDGET_DEPTH, GameLogic
+from utils.ranking_system import DEFAULT_RATING, calculate_elo, k_factor_for
+
+DEFAULT_MAX_PLIES = 200
+
+# Material lead (in PIECE_WEIGHTS points) that wins an adjudicated game
+ADJUDICATION_MARGIN = {"checkers": 2, "chess": 3}
+
+
+def parse_config(name, game_type):
+    """Turn a configuration name into make_ai_move keyword arguments."""
+    difficulty, _, setting = name.partition(":")
+    if difficulty in ("random", "greedy", "hard") and not setting:
+        options = {"difficulty": difficulty}
+        if difficulty == "hard":
+            options["depth"] = MAX_BUDGET_DEPTH[game_type]
+        return options
+    if difficulty == "hard" and setting.startswith("t") and setting[1:].isdigit():
+        return {"difficulty": "hard", "depth": MAX_BUDGET_DEPTH[game_type], "time_ms": int(setting[1:])}
+    if difficulty == "minimax" and setting.startswith("t") and setting[1:].isdigit():
+        return {"difficulty": "minimax", "depth": MAX_BUDGET_DEPTH[game_type], "time_ms": int(setting[1:])}
+    if difficulty == "minimax" and setting.isdigit():
+        return {"difficulty": "minimax", "depth": int(setting)}
+    raise ValueError(f"unknown AI configuration: {name}")
+
+
+def schedule(configs, games_per_pair):
+    """Return [(white, black), ...] for a round robin, alternating colors within each pair."""
+    pairings = []
+    for first, second in itertools.combinations(configs, 2):
+        for index in range(games_per_pair):
+            pairings.append((first, second) if index % 2 == 0 else (second, first))
+    return pairings
+
+
+def play_game(task):
+    """
+        Play one game and return its result dict. task is
+        (game_type, white config, black config, seed, max_plies).
+        The result is "white", "black" or "draw", with how it ended:
+        "capture", "checkmate", "stalemate", "no_moves" or "adjudicated".
+    """
+    game_type, white, black, seed, max_plies = task
+    random.seed(seed)
+    game = GameLogic(game_type)
+    options = {"white": parse_config(white, game_type), "black": parse_config(black, game_type)}
+    usage = {color: {"moves": 0, "ms": 0.0, "nodes": 0} for color in ("white", "black")}
+    ending = "capture"
+
+    plies = 0
+    while not game.winner and plies < max_plies:
+        color = game.turn
+        started = time.perf_counter()
+        result = game.make_ai_move(workers=1, use_book=False, use_cache=False, **options[color])
+        usage[color]["ms"] += (time.perf_counter() - started) * 1000
+        if "error" in result:
+            ending = "no_moves"
+            break
+        usage[color]["moves"] += 1
+        usage[color]["nodes"] += game.last_search["nodes"]
+        plies += 1
+
+    winner = game.winner
+    if winner is None:
+        ending = "adjudicated"
+        lead = game._evaluate("white")
+        margin = ADJUDICATION_MARGIN[game_type]
+        winner = "white" if lead >= margin else "black" if lead <= -margin else "draw"
+    elif game_type == "chess" and ending == "capture":
+        ending = "stalemate" if winner == "draw" else "checkmate"
+    return {
+        "white": white,
+        "black": black,
+        "seed": seed,
+        "result": winner,
+        "ending": ending,
+        "plies": plies,
+        "usage": usage,
+    }
+
+
+def rate_results(configs, results):
+    """
+        Rate the games in order, every configuration starting at
+        DEFAULT_RATING, with the K-factor rule update_ranking_pair uses.
+    """
+    ratings = {config: DEFAULT_RATING for config in configs}
+    played = {config: 0 for config in configs}
+    for game in results:
+        white, black = game["white"], game["black"]
+        score = {"white": 1.0, "black": 0.0, "draw": 0.5}[game["result"]]
+        k_factor = max(k_factor_for(played[white]), k_factor_for(played[black]))
+        ratings[white], ratings[black] = calculate_elo(ratings[white], ratings[black], score, k_factor)
+        played[white] += 1
+        played[black] += 1
+    return ratings
+
+
+def summarize(configs, results):
+    """Per configuration: rating, record and average cost per move, strongest first."""
+    ratings = rate_results(configs, results)
+    table = {
+        config: {"rating": ratings[config], "games": 0, "wins": 0, "losses": 0, "draws": 0,
+                 "moves": 0, "ms": 0.0, "nodes": 0}
+        for config in configs
+    }
+    for game in results:
+        for color, opponent in (("white", "black"), ("black", "white")):
+            row = table[game[color]]
+            row["games"] += 1
+            if game["result"] == color:
+                row["wins"] += 1
+            elif game["result"] == opponent:
+                row["losses"] += 1
+            else:
+                row["draws"] += 1
+            for key in ("moves", "ms", "nodes"):
+                row[key] += game["usage"][color][key]
+
+    standings = []
+    for config, row in table.items():
+        moves = row.pop("moves")
+        ms = row.pop("ms")
+        nodes = row.pop("nodes")
+        row["avg_ms_per_move"] = round(ms / moves, 3) if moves else 0.0
+        row["avg_nodes_per_move"] = round(nodes / moves, 1) if moves else 0.0
+        standings.append(dict(config=config, **row))
+    standings.sort(key=lambda row: (-row["rating"], row["config"]))
+    return standings
+
+
+def run_tournament(game_type, configs, games_per_pair, workers=1, seed=0, max_plies=DEFAULT_MAX_PLIES):
+    """
+        Play the round robin and return {"standings": [...], "games": [...]}.
+        workers=1 plays in this process; more uses a process pool.
+    """
+    for config in configs:
+        parse_config(config, game_type)
+    tasks = [
+        (game_type, white, black, seed * 1000003 + index, max_plies)
+        for index, (white, black) in enumerate(schedule(configs, games_per_pair))
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(play_game, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+    else:
+        results = [play_game(task) for task in tasks]
+    return {
+        "game_type": game_type,
+        "seed": seed,
+        "max_plies": max_plies,
+        "standings": summarize(configs, results),
+        "games": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI configurations against each other and rate them.")
+    parser.add_argument("--game", choices=("checkers", "chess"), default="checkers")
+    parser.add_argument("--configs", nargs="+", default=["random", "greedy", "minimax:2", "minimax:4"])
+    parser.add_argument("--games", type=int, default=20, help="games per pair of configurations")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="adjudicate after this many plies")
+    parser.add_argument("--out", help="write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_tournament(args.game, args.configs, args.games, args.workers, args.seed, args.max_plies)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.out:
+        with open(args.out, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    print(f"{'config':<14}{'rating':>7}{'games':>7}{'W-L-D':>13}{'ms/move':>10}{'nodes/move':>12}")
+    for row in report["standings"]:
+        record = f"{row['wins']}-{row['losses']}-{row['draws']}"
+        print(f"{row['config']:<14}{row['rating']:>7}{row['games']:>7}{record:>13}"
+              f"{row['avg_ms_per_move']:>10.2f}{row['avg_nodes_per_move']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
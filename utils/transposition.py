@@ -0,0 +1,83 @@
+"""
+Zobrist hashing and a transposition table for the GameLogic AI search.
+
+Every (piece, square) pair gets a fixed random 64-bit key, plus one key for
+"black to move". A position hash is the XOR of the keys of everything on the
+board, so make_move/unmake_move can update it incrementally. The keys come
+from a seeded generator so hashes are stable across processes and restarts.
+"""
+
+import random
+
+ZOBRIST_SEED = 20251210
+
+PIECE_CODES = (
+    "W", "WK", "B", "BK",
+    "WP", "WN", "WB", "WR", "WQ",
+    "BP", "BN", "BB", "BR", "BQ",
+)
+
+
+def _build_keys():
+    rng = random.Random(ZOBRIST_SEED)
+    pieces = {piece: tuple(rng.getrandbits(64) for _ in range(64)) for piece in PIECE_CODES}
+    return pieces, rng.getrandbits(64)
+
+
+ZOBRIST_PIECES, ZOBRIST_BLACK_TO_MOVE = _build_keys()
+
+
+def hash_board(board, turn):
+    """Compute the Zobrist hash of a full board from scratch."""
+    key = 0
+    for r, row in enumerate(board):
+        for c, piece in enumerate(row):
+            if piece:
+                key ^= ZOBRIST_PIECES[piece][r * 8 + c]
+    if turn == "black":
+        key ^= ZOBRIST_BLACK_TO_MOVE
+    return key
+
+
+# Bound types stored with each entry
+EXACT, LOWER, UPPER = 0, 1, 2
+
+DEFAULT_TT_SIZE = 1 << 16
+
+
+class TranspositionTable:
+    """
+        Fixed-size hash table of search results.
+        - each slot holds (key, depth, bound, score, best_move, age)
+        - scores are stored from the side to move's point of view
+        - replacement keeps the deeper entry unless the slot is stale
+          (left over from an earlier search) or holds the same position
+    """
+
+    def __init__(self, size=DEFAULT_TT_SIZE):
+        if size < 1 or size & (size - 1):
+            raise ValueError("size must be a power of two")
+        self.size = size
+        self.mask = size - 1
+        self.slots = [None] * size
+        self.age = 0
+
+    def new_search(self):
+        """Mark existing entries as stale so new results can replace them."""
+        self.age += 1
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.age = 0
+
+    def probe(self, key):
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, bound, score, best_move):
+        index = key & self.mask
+        old = self.slots[index]
+        if old is None or old[0] == key or old[5] != self.age or depth >= old[1]:
+            self.slots[index] = (key, depth, bound, score, best_move, self.age)